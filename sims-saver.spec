@@ -8,6 +8,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('sims_saver/localization.py', 'sims_saver/'),
+           ('sims_saver/game_catalog.json', 'sims_saver/'),
            ('icon.ico', '.'),
            ('icon.png', '.'),
            ('icon.icns', '.'),
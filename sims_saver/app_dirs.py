@@ -0,0 +1,23 @@
+# sims_saver/app_dirs.py
+
+import os
+import sys
+from pathlib import Path
+
+APP_DIR_NAME = "SimsSaver"
+
+
+def user_data_dir():
+    """Return the per-user folder for data that must outlive the app.
+
+    Never the package folder: the one-file build unpacks it into a temporary
+    directory that is deleted every time the app exits.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA")
+        base = Path(base) if base else Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share")
+    return base / APP_DIR_NAME
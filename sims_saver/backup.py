@@ -0,0 +1,283 @@
+# sims_saver/backup.py
+
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from sims_saver.app_dirs import user_data_dir
+from sims_saver.post_save import lower_io_priority
+
+MB = 1024 * 1024
+
+
+def default_save_dir():
+    """Return where The Sims 4 keeps its save slots"""
+    return Path.home() / "Documents" / "Electronic Arts" / "The Sims 4" / "saves"
+
+
+def default_store_dir():
+    """Return the default backup store in the per-user data folder"""
+    return user_data_dir() / "backups"
+
+
+def open_shared(path):
+    """Open a file for reading without stopping other programs from replacing or deleting it.
+
+    On Windows, open() leaves out FILE_SHARE_DELETE, so a game that saves by replacing its
+    slot file would fail if the save landed while a backup was reading that slot.
+    """
+    if sys.platform != "win32":
+        return open(path, "rb")
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+    GENERIC_READ = 0x80000000
+    FILE_SHARE_ALL = 0x1 | 0x2 | 0x4  # read, write, delete
+    OPEN_EXISTING = 3
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    kernel32.CreateFileW.argtypes = (wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+                                     wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE)
+    handle = kernel32.CreateFileW(str(path), GENERIC_READ, FILE_SHARE_ALL, None, OPEN_EXISTING, 0, None)
+    if handle is None or handle == wintypes.HANDLE(-1).value:
+        raise ctypes.WinError(ctypes.get_last_error())
+    return os.fdopen(msvcrt.open_osfhandle(handle, os.O_RDONLY | os.O_BINARY), "rb")
+
+
+class BackupStage:
+    """Post-save stage that snapshots changed save files into a content-addressed store.
+
+    Files are read and hashed one fixed-size chunk at a time, so a large save is never
+    held in memory at once, and through a handle that lets the game replace the file
+    mid-read (the snapshot is then retried). Only chunks the store has not seen are compressed
+    (on a small worker pool; zlib releases the GIL) and written. Each snapshot is a JSON
+    manifest listing its chunk hashes under snapshots/<file name>/.
+    """
+
+    # The save counts as finished once its files stop changing for this long
+    SETTLE_SECONDS = 2.0
+    MAX_SETTLE_SECONDS = 120.0
+
+    def __init__(self, save_dir, store_dir, pattern="*.save", chunk_size=MB, keep_versions=10,
+                 max_age_days=30, workers=2, clock=time.time):
+        self.save_dir = Path(save_dir)
+        self.store_dir = Path(store_dir)
+        self.pattern = pattern
+        self.chunk_size = chunk_size
+        self.keep_versions = keep_versions
+        self.max_age_seconds = max_age_days * 86400
+        self.workers = workers
+        self.clock = clock
+        self.known_chunks = None  # loaded lazily from the store
+        self.file_state = {}  # name -> (size, mtime_ns) of the last snapshot taken
+
+    @property
+    def chunk_dir(self):
+        return self.store_dir / "chunks"
+
+    @property
+    def snapshot_dir(self):
+        return self.store_dir / "snapshots"
+
+    def run(self, trigger, stop_event):
+        listing = self.wait_until_settled(stop_event)
+        if listing is None:
+            return
+        changed = [name for name, state in listing.items() if self.file_state.get(name) != state]
+        if not changed:
+            return
+
+        self.load_known_chunks()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backup",
+                                initializer=lower_io_priority) as pool:
+            for name in changed:
+                if stop_event.is_set():
+                    return
+                if self.snapshot_file(name, listing[name], pool):
+                    self.file_state[name] = listing[name]
+        self.apply_retention()
+
+    def list_saves(self):
+        """Return {file name: (size, mtime_ns)} for the save files in save_dir"""
+        listing = {}
+        try:
+            with os.scandir(self.save_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and fnmatch.fnmatch(entry.name.lower(), self.pattern):
+                        stat = entry.stat()
+                        listing[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except OSError as e:
+            print(f"Error listing saves in {self.save_dir}: {e}")
+            return None
+        return listing
+
+    def wait_until_settled(self, stop_event):
+        """Wait until the game has finished writing, so the backup never reads a half-written slot"""
+        deadline = time.monotonic() + self.MAX_SETTLE_SECONDS
+        previous = self.list_saves()
+        while previous is not None and time.monotonic() < deadline:
+            if stop_event.wait(self.SETTLE_SECONDS):
+                return None
+            listing = self.list_saves()
+            if listing == previous:
+                return listing
+            previous = listing
+        return None
+
+    def snapshot_file(self, name, expected_state, pool):
+        """Chunk, store and record one save file. Returns False if it changed while being read."""
+        path = self.save_dir / name
+        chunk_hashes = []
+        file_hash = hashlib.sha256()
+        in_flight = set()
+        try:
+            # No mmap: a mapped view blocks replacing the file on Windows even with share-delete
+            with open_shared(path) as f:
+                stat = os.fstat(f.fileno())
+                if (stat.st_size, stat.st_mtime_ns) != expected_state:
+                    return False
+                while True:
+                    chunk = f.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    digest = hashlib.sha256(chunk).hexdigest()
+                    file_hash.update(chunk)
+                    chunk_hashes.append(digest)
+                    if digest in self.known_chunks:
+                        continue
+                    self.known_chunks.add(digest)
+                    # Bound the chunks waiting for the pool to a few
+                    if len(in_flight) >= 2 * self.workers:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            future.result()
+                    in_flight.add(pool.submit(self.write_chunk, digest, chunk))
+            for future in in_flight:
+                future.result()
+            stat = os.stat(path)
+            if (stat.st_size, stat.st_mtime_ns) != expected_state:
+                # The game wrote again while we were reading; the next run will retry
+                return False
+        except OSError as e:
+            print(f"Error backing up {path}: {e}")
+            # Chunks that failed to write may be missing; rescan the store next time
+            self.known_chunks = None
+            return False
+
+        digest = file_hash.hexdigest()
+        latest = self.latest_manifest(name)
+        if latest is not None and latest.get("sha256") == digest:
+            return True
+
+        created = self.clock()
+        manifest = {
+            "file": name,
+            "size": expected_state[0],
+            "mtime_ns": expected_state[1],
+            "sha256": digest,
+            "chunk_size": self.chunk_size,
+            "chunks": chunk_hashes,
+            "created": created,
+        }
+        manifest_path = self.snapshot_dir / name / f"{int(created * 1000):015d}-{digest[:12]}.json"
+        write_atomic(manifest_path, json.dumps(manifest).encode("utf-8"))
+        return True
+
+    def chunk_path(self, digest):
+        return self.chunk_dir / digest[:2] / (digest + ".z")
+
+    def write_chunk(self, digest, data):
+        write_atomic(self.chunk_path(digest), zlib.compress(data, 6))
+
+    def load_known_chunks(self):
+        if self.known_chunks is not None:
+            return
+        self.known_chunks = set()
+        if self.chunk_dir.is_dir():
+            for path in self.chunk_dir.glob("*/*.z"):
+                self.known_chunks.add(path.stem)
+
+    def manifests(self, name):
+        """Return manifest paths for one save file, oldest first"""
+        directory = self.snapshot_dir / name
+        if not directory.is_dir():
+            return []
+        return sorted(directory.glob("*.json"))
+
+    def latest_manifest(self, name):
+        paths = self.manifests(name)
+        return read_manifest(paths[-1]) if paths else None
+
+    def apply_retention(self):
+        """Keep the newest keep_versions snapshots per file, drop old ones, then collect unused chunks"""
+        if not self.snapshot_dir.is_dir():
+            return
+        cutoff_ms = int((self.clock() - self.max_age_seconds) * 1000)
+        removed = False
+        for directory in self.snapshot_dir.iterdir():
+            paths = self.manifests(directory.name)
+            # The newest snapshot is always kept, however old it is
+            for index, path in enumerate(paths[:-1]):
+                too_many = index < len(paths) - self.keep_versions
+                too_old = int(path.name.split("-", 1)[0]) < cutoff_ms
+                if too_many or too_old:
+                    path.unlink()
+                    removed = True
+        if removed:
+            self.collect_garbage()
+
+    def collect_garbage(self):
+        """Delete chunks no manifest refers to"""
+        referenced = set()
+        for path in self.snapshot_dir.glob("*/*.json"):
+            manifest = read_manifest(path)
+            if manifest is not None:
+                referenced.update(manifest["chunks"])
+        self.load_known_chunks()
+        for digest in self.known_chunks - referenced:
+            try:
+                self.chunk_path(digest).unlink()
+            except OSError as e:
+                print(f"Error removing backup chunk {digest}: {e}")
+        self.known_chunks &= referenced
+
+    def restore(self, manifest_path, destination):
+        """Rebuild a snapshot at destination and verify its checksum"""
+        manifest = read_manifest(manifest_path)
+        if manifest is None:
+            raise ValueError(f"Unreadable backup manifest: {manifest_path}")
+        file_hash = hashlib.sha256()
+        temp_path = Path(str(destination) + ".restoring")
+        with open(temp_path, "wb") as out:
+            for digest in manifest["chunks"]:
+                data = zlib.decompress(self.chunk_path(digest).read_bytes())
+                file_hash.update(data)
+                out.write(data)
+        if file_hash.hexdigest() != manifest["sha256"]:
+            temp_path.unlink()
+            raise ValueError(f"Backup of {manifest['file']} failed verification")
+        os.replace(temp_path, destination)
+
+
+def read_manifest(path):
+    try:
+        with open(path, "rb") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Error reading backup manifest {path}: {e}")
+        return None
+
+
+def write_atomic(path, data):
+    """Write data to path via a temp file so readers never see a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
@@ -0,0 +1,126 @@
+# sims_saver/diagnostics.py
+
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+
+
+class StallWatchdog:
+    """Measures Tk event-loop latency with a heartbeat and reports main-thread stalls.
+
+    The heartbeat is a `root.after` callback; a separate thread notices when it is
+    overdue and captures the main thread's stack while the stall is still happening.
+    """
+
+    def __init__(self, root, threshold=0.1, heartbeat_interval=0.05):
+        self.root = root
+        self.threshold = threshold
+        self.heartbeat_interval = heartbeat_interval
+        self.main_thread_id = threading.main_thread().ident
+        self.last_beat = time.monotonic()
+        self.max_latency = 0.0
+        self.stall_count = 0
+        self.stall_stack = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._after_id = None
+
+    def start(self):
+        """Start the heartbeat and the watcher thread"""
+        self.last_beat = time.monotonic()
+        self._after_id = self.root.after(int(self.heartbeat_interval * 1000), self._beat)
+        self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass  # root already destroyed
+            self._after_id = None
+
+    def _beat(self):
+        """Heartbeat callback on the Tk thread"""
+        now = time.monotonic()
+        latency = now - self.last_beat - self.heartbeat_interval
+        # Mark the loop alive before clearing the stack, or the watcher could capture the recovered stack
+        self.last_beat = now
+        self.max_latency = max(self.max_latency, latency)
+        stall_stack, self.stall_stack = self.stall_stack, None
+        if stall_stack is not None:
+            print(f"Main thread stalled for {latency * 1000:.0f} ms in:\n{stall_stack}")
+        if not self._stop_event.is_set():
+            self._after_id = self.root.after(int(self.heartbeat_interval * 1000), self._beat)
+
+    def _watch(self):
+        """Watcher thread: capture the main-thread stack once per stall"""
+        while not self._stop_event.wait(self.threshold / 2):
+            overdue = time.monotonic() - self.last_beat - self.heartbeat_interval
+            if overdue > self.threshold and self.stall_stack is None:
+                frame = sys._current_frames().get(self.main_thread_id)
+                if frame is not None:
+                    self.stall_count += 1
+                    self.stall_stack = "".join(traceback.format_stack(frame))
+
+
+class SamplingProfiler:
+    """Low-overhead sampling profiler for all threads.
+
+    Stacks are sampled with sys._current_frames() and written in the collapsed format
+    ("thread;outer;...;inner count") used by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, output_path, interval=0.005):
+        self.output_path = output_path
+        self.interval = interval
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and write the collapsed stacks"""
+        if not self._thread:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=2)
+        self._thread = None
+        self.write()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                thread_name = thread_names.get(thread_id, str(thread_id))
+                self.samples[thread_name + ";" + collapse_stack(frame)] += 1
+
+    def write(self):
+        try:
+            with open(self.output_path, "w") as f:
+                for stack, count in self.samples.most_common():
+                    f.write(f"{stack} {count}\n")
+            print(f"Wrote {sum(self.samples.values())} samples to {self.output_path}")
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+
+
+def collapse_stack(frame):
+    """Render a frame chain as 'outer;...;inner'"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        name = f"{code.co_name}@{os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+        names.append(name.replace(";", ":"))
+        frame = frame.f_back
+    return ";".join(reversed(names))
@@ -0,0 +1,389 @@
+# sims_saver/engine.py
+
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+
+from sims_saver.journal import (EVENT_GAME_DETECTED, EVENT_GAME_EXITED, EVENT_KEY_FIRED, EVENT_PRESS_FAILED,
+                                EVENT_PRESS_DEFERRED, EVENT_PRESS_SKIPPED, EVENT_SAVE_CONFIRMED, EVENT_RESUMED,
+                                EVENT_PROFILE_ACTIVATED)
+from sims_saver.game_activity import GameActivityMonitor, ACTIVITY_SAVING
+from sims_saver.process_source import create_process_source
+from sims_saver.process_tree import GameProcessTracker, is_alive
+from sims_saver.schedule import ScheduleRunner
+from sims_saver.key_delivery import GlobalKeyDelivery, create_window_key_delivery
+from sims_saver.risk import RiskMonitor, adapted_interval_factor
+from sims_saver.post_save import PostSaveTrigger
+from sims_saver.suspend import SuspendDetector
+from sims_saver.status_page import (StatusRecord, STATUS_KEY_STATES, STATE_STOPPED, HEARTBEAT_SECONDS,
+                                    RESULT_PRESSED, RESULT_FAILED, RESULT_SKIPPED, ERROR_PRESS_FAILED,
+                                    ERROR_GAME_NOT_RESPONDING, ERROR_LOOP_EXCEPTION)
+
+
+class EngineConfig(namedtuple("EngineConfig", [
+        "test_mode", "selected_key", "monitored_process_names", "max_defer_seconds", "schedule",
+        "targeted_key_delivery", "adaptive_interval", "adaptive_min_seconds", "backup_enabled",
+        "missed_fire_policy", "resume_grace_seconds", "key_hold_ms", "key_gap_ms", "auto_profile"])):
+    """Immutable snapshot of the settings the auto-save loop acts on"""
+
+    __slots__ = ()
+
+
+class AutoSaveEngine:
+    """Background auto-save loop that runs independently of the Tk widget tree.
+
+    The engine reads its settings from an immutable EngineConfig that the UI replaces
+    with `update_config`; each loop iteration and cycle takes one snapshot, so settings
+    change live without locks or half-applied edits. Progress is reported through
+    `owner.set_status(key)`, so the window can be destroyed and rebuilt while it runs.
+    A recognised game is handed to `owner.activate_profile(profile)`, and its exit to
+    `owner.deactivate_profile()`.
+    """
+
+    # Longest single sleep; waking up this often keeps wall-clock jumps from going unnoticed
+    MAX_IDLE_WAIT = 30.0
+    # How long after a press a write burst still counts as the save it triggered
+    SAVE_CONFIRM_WINDOW = 120.0
+    # While the game isn't running, look for it this often where launcher lookups are cheap
+    # (/proc children lists), and less often where each lookup walks the process table
+    DETECT_POLL_INTERVAL = 1.0
+    SLOW_DETECT_POLL_INTERVAL = 5.0
+    # While waiting, check the whole process table for any catalogued game every this many polls
+    CATALOG_SCAN_EVERY = 10
+
+    # The engine lives for the whole session; keep its per-instance state compact
+    __slots__ = ("owner", "config", "journal", "catalog", "catalog_polls", "post_save", "status_page", "status",
+                 "global_delivery", "window_delivery", "process_tracker", "game_activity", "risk_monitor",
+                 "suspend_detector",
+                 "game_process", "game_processes", "waiting_for_game", "journal_game_key",
+                 "save_confirmation_deadline", "is_running", "thread", "wake_event")
+
+    def __init__(self, owner, config, journal, post_save=None, status_page=None, catalog=None):
+        self.owner = owner
+        self.config = config
+        self.journal = journal
+        self.catalog = catalog  # GameCatalog used to pick a profile when a known game starts
+        self.catalog_polls = 0
+        self.post_save = post_save  # PostSavePipeline run after each confirmed save
+        self.status_page = status_page  # StatusPageWriter for overlays; only the loop thread writes it
+        self.status = StatusRecord()
+        self.global_delivery = GlobalKeyDelivery()
+        self.window_delivery = None  # created on first targeted fire
+        self.process_tracker = GameProcessTracker(create_process_source())
+        self.game_activity = GameActivityMonitor()
+        self.risk_monitor = RiskMonitor()
+        self.suspend_detector = SuspendDetector()
+        self.game_process = None
+        self.game_processes = []
+        self.waiting_for_game = False
+        self.journal_game_key = None
+        self.save_confirmation_deadline = 0.0
+        self.is_running = False
+        self.thread = None
+        self.wake_event = threading.Event()
+
+    def start(self):
+        """Start the auto-save thread"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self.wake_event.clear()
+        self.thread = threading.Thread(target=self.auto_save_loop, name="auto-save", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=2):
+        """Stop the auto-save thread and wait for it to finish"""
+        self.is_running = False
+        self.wake_event.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=timeout)
+        self.thread = None
+
+    def update_config(self, config):
+        """Swap in a new settings snapshot; the loop wakes and reschedules from it"""
+        self.config = config
+        self.wake_event.set()
+
+    def set_status(self, key):
+        """Report a status key to the app and mirror it on the status page"""
+        self.owner.set_status(key)
+        state = STATUS_KEY_STATES.get(key)
+        if state is not None:
+            self.status.state = state
+        self.publish_status()
+
+    def publish_status(self):
+        if self.status_page is not None:
+            self.status_page.write(self.status)
+
+    def publish_next_fire(self, remaining):
+        """Publish the next fire time when it moved by more than half a second.
+
+        Also refreshes an unchanged page every HEARTBEAT_SECONDS, so readers can tell a
+        live engine from one that died without publishing STOPPED.
+        """
+        status = self.status
+        next_fire_mono = 0.0 if remaining is None else time.monotonic() + remaining
+        if (abs(next_fire_mono - status.next_fire_mono) <= 0.5
+                and time.time() - status.updated_wall < HEARTBEAT_SECONDS):
+            return
+        status.next_fire_mono = next_fire_mono
+        status.next_fire_wall = 0.0 if remaining is None else time.time() + remaining
+        self.publish_status()
+
+    def is_process_running(self, process_names):
+        """Check if any of the specified processes are currently running"""
+        self.game_processes = self.process_tracker.find_all(process_names)
+        self.game_process = self.game_processes[0] if self.game_processes else None
+        return self.game_process is not None
+
+    def update_game_session(self):
+        """Journal game detected/exited transitions for the matched process"""
+        key = None
+        if self.game_process is not None:
+            try:
+                key = (self.game_process.pid, self.game_process.create_time())
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                key = (self.game_process.pid, None)
+
+        if key == self.journal_game_key:
+            return
+        self.risk_monitor.reset()
+        if self.journal_game_key is not None:
+            self.journal.record(EVENT_GAME_EXITED, *self.journal_game_key)
+        if key is not None:
+            self.journal.record(EVENT_GAME_DETECTED, *key)
+        elif self.journal_game_key is not None:
+            # A profile picked for that game only lasts while it runs
+            self.owner.deactivate_profile()
+        self.journal_game_key = key
+
+    def check_save_confirmation(self):
+        """Sample game activity and journal a confirmed save after a key press"""
+        if time.monotonic() > self.save_confirmation_deadline:
+            self.save_confirmation_deadline = 0.0
+        elif self.game_activity.sample() == ACTIVITY_SAVING:
+            self.save_confirmation_deadline = 0.0
+            pid, create_time = self.journal_game_key or (None, None)
+            self.journal.record(EVENT_SAVE_CONFIRMED, pid, create_time)
+            self.status.confirmed += 1
+            self.publish_status()
+            if self.post_save is not None and self.config.backup_enabled:
+                # The pipeline waits for the game's write to finish before touching the files
+                self.post_save.submit(PostSaveTrigger(time.time(), pid, create_time))
+
+    def wait(self, timeout):
+        """Sleep up to timeout seconds (None for as long as allowed), waking early on stop"""
+        timeout = self.MAX_IDLE_WAIT if timeout is None else min(timeout, self.MAX_IDLE_WAIT)
+        if self.save_confirmation_deadline:
+            # Watch for the game's write burst once a second until the save is confirmed
+            timeout = min(timeout, 1.0)
+        if self.game_process is not None:
+            timeout = min(timeout, max(0.0, self.risk_monitor.next_sample_time - time.monotonic()))
+        self.wake_event.wait(timeout)
+        if self.is_running:
+            # Woken by a config update rather than stop; arm the event for the next wait
+            self.wake_event.clear()
+        if self.game_process is not None and not self.check_game_alive():
+            return
+        if self.save_confirmation_deadline and self.game_activity.process is not None:
+            self.check_save_confirmation()
+        if self.game_process is not None and self.risk_monitor.sample_due(time.monotonic()):
+            self.sample_risk()
+
+    def check_game_alive(self):
+        """Drop exited game processes; when none is left, journal the exit and wait for the game"""
+        self.game_processes = [proc for proc in self.game_processes if is_alive(proc)]
+        if self.game_processes:
+            if self.game_processes[0] is not self.game_process:
+                self.game_process = self.game_processes[0]
+                self.update_game_session()
+                self.game_activity.attach(self.game_process)
+            return True
+        self.game_process = None
+        self.update_game_session()
+        self.game_activity.attach(None)
+        self.save_confirmation_deadline = 0.0
+        self.waiting_for_game = True
+        self.set_status("status_waiting_for_process")
+        return False
+
+    def sample_risk(self):
+        """Add a memory/responsiveness sample for the pinned game process"""
+        self.game_activity.sample()
+        self.risk_monitor.add_sample(self.game_process, time.monotonic(), self.game_activity.cpu)
+
+    def simulate_save_keybind(self, key, pids=(), targeted=False):
+        """Simulate pressing the selected key combination"""
+        if pids and targeted:
+            if self.window_delivery is None:
+                self.window_delivery = create_window_key_delivery(self.global_delivery) or self.global_delivery
+            return self.window_delivery.deliver(key, pids)
+        return self.global_delivery.deliver(key)
+
+    def auto_save_loop(self):
+        """Main auto-save loop running in background thread"""
+        # The runner's clock must stop during a suspend so the detector's gap is what it missed
+        runner = ScheduleRunner(self.config.schedule, monotonic=self.suspend_detector.awake_clock)
+        self.suspend_detector.reset()
+        while self.is_running:
+            try:
+                # One snapshot per decision; a new schedule reschedules from the last fire
+                config = self.config
+                runner.schedule = config.schedule
+                suspended = self.suspend_detector.check()
+                if suspended:
+                    self.handle_resume(runner, suspended, config)
+
+                if self.waiting_for_game and not config.test_mode:
+                    # Poll for the game so a launch is noticed right away, not at the next fire
+                    if self.is_process_running(config.monitored_process_names):
+                        self.waiting_for_game = False
+                        self.update_game_session()
+                        self.game_activity.attach(self.game_process)
+                        self.set_status("status_running_waiting")
+                        # The first press comes one full period after the game started
+                        runner.restart()
+                    else:
+                        self.publish_next_fire(None)
+                        if config.auto_profile and self.catalog is not None:
+                            self.catalog_polls += 1
+                            if self.catalog_polls >= self.CATALOG_SCAN_EVERY:
+                                self.catalog_polls = 0
+                                self.identify_game(config)
+                        self.wait(self.DETECT_POLL_INTERVAL if self.process_tracker.source.cheap_children
+                                  else self.SLOW_DETECT_POLL_INTERVAL)
+                    continue
+
+                if config.adaptive_interval and self.game_process is not None:
+                    # Save more often as the crash risk of a long session rises
+                    runner.interval_factor = adapted_interval_factor(self.risk_monitor.assess().risk)
+                    runner.min_interval = config.adaptive_min_seconds
+                else:
+                    runner.interval_factor = 1.0
+
+                remaining = runner.seconds_until_next()
+                self.publish_next_fire(remaining)
+                if remaining is None or remaining > 0:
+                    self.wait(remaining)
+                    continue
+                runner.mark_fired()
+                self.run_cycle(config)
+
+            except Exception as e:
+                print(f"Error in auto-save loop: {e}")
+                self.status.last_error = ERROR_LOOP_EXCEPTION
+                if self.is_running:  # Only update status if still running
+                    self.set_status("status_error_occurred")
+                    self.wake_event.wait(5)  # Brief pause before retry
+
+        self.status.state = STATE_STOPPED
+        self.status.next_fire_mono = self.status.next_fire_wall = 0.0
+        self.publish_status()
+
+    def handle_resume(self, runner, suspended, config):
+        """Apply the missed-fire policy after a suspend and look for the game afresh"""
+        missed = runner.handle_suspend(suspended, config.missed_fire_policy, config.resume_grace_seconds)
+        pid, create_time = self.journal_game_key or (None, None)
+        self.journal.record(EVENT_RESUMED, pid, create_time,
+                            f"suspended={suspended:.0f}s missed={missed} policy={config.missed_fire_policy}")
+        self.set_status("status_resumed_from_sleep")
+        if config.test_mode:
+            return
+
+        # The game may have exited or crashed while asleep; pinned handles can't be trusted
+        self.process_tracker.reset()
+        if self.is_process_running(config.monitored_process_names):
+            self.update_game_session()
+            self.game_activity.attach(self.game_process)
+        else:
+            self.update_game_session()
+            self.waiting_for_game = True
+            self.set_status("status_waiting_for_process")
+
+    def identify_game(self, config):
+        """Look for any catalogued game in one pass and ask the app to switch to its profile"""
+        for proc, name in self.process_tracker.source.find_indexed(self.catalog.index):
+            try:
+                exe_path = proc.exe()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, OSError):
+                exe_path = None
+            try:
+                parent = proc.parent()
+                parent_name = parent.name() if parent is not None else None
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                parent_name = None
+
+            profile = self.catalog.identify(name, exe_path, parent_name)
+            if profile is None or profile.process_names == config.monitored_process_names:
+                continue
+            self.journal.record(EVENT_PROFILE_ACTIVATED, proc.pid, None, profile.id)
+            # The app applies the profile and publishes a config naming the game's processes
+            self.owner.activate_profile(profile)
+            return profile
+        return None
+
+    def run_cycle(self, config):
+        """Detect the game and press the save key once, under the config the loop fired with"""
+        test_mode = config.test_mode
+        game_running = not test_mode and self.is_process_running(config.monitored_process_names)
+        if not test_mode:
+            self.update_game_session()
+            self.game_activity.attach(self.game_process)
+
+        if not (test_mode or game_running):
+            self.waiting_for_game = True
+            self.set_status("status_waiting_for_process")
+            return
+
+        self.set_status("status_test_mode_pressing" if test_mode else "status_game_detected_pressing")
+
+        pid, create_time = self.journal_game_key or (None, None)
+        self.status.pid = pid or 0
+        if not test_mode and self.risk_monitor.assess().hung:
+            # A press into a hung game is lost at best; wait for it to recover
+            self.journal.record(EVENT_PRESS_SKIPPED, pid, create_time, "not_responding")
+            self.status.skipped += 1
+            self.status.last_result = RESULT_SKIPPED
+            self.status.last_error = ERROR_GAME_NOT_RESPONDING
+            self.set_status("status_game_not_responding")
+            return
+
+        if not test_mode:
+            # Hold the press while the game is on a loading screen or mid-save
+            busy_state = self.game_activity.wait_until_quiet(
+                config.max_defer_seconds, lambda: self.is_running,
+                on_defer=lambda: self.set_status("status_game_busy_deferring"))
+            if busy_state:
+                self.journal.record(EVENT_PRESS_DEFERRED, pid, create_time, busy_state)
+                self.status.deferred += 1
+            if not self.is_running:
+                return
+
+        selected_key = config.selected_key
+        self.global_delivery.hold = config.key_hold_ms / 1000
+        self.global_delivery.gap = config.key_gap_ms / 1000
+        pids = [] if test_mode else [proc.pid for proc in self.game_processes]
+        if self.simulate_save_keybind(selected_key, pids, config.targeted_key_delivery):
+            self.journal.record(EVENT_KEY_FIRED, pid, create_time, selected_key)
+            self.status.presses += 1
+            self.status.last_result = RESULT_PRESSED
+            self.status.last_press_wall = time.time()
+            if not test_mode:
+                self.save_confirmation_deadline = time.monotonic() + self.SAVE_CONFIRM_WINDOW
+            self.set_status("status_key_pressed_success")
+        else:
+            self.journal.record(EVENT_PRESS_FAILED, pid, create_time, selected_key)
+            self.status.failures += 1
+            self.status.last_result = RESULT_FAILED
+            self.status.last_error = ERROR_PRESS_FAILED
+            self.set_status("status_key_press_failed")
+
+        # Brief pause after save
+        self.wake_event.wait(2)
+        if not self.is_running:  # Check if we should stop
+            return
+
+        self.set_status("status_test_mode_waiting" if test_mode else "status_running_waiting")
@@ -0,0 +1,132 @@
+# sims_saver/game_activity.py
+
+import time
+
+import psutil
+
+ACTIVITY_IDLE = "idle"
+ACTIVITY_LOADING = "loading"
+ACTIVITY_SAVING = "saving"
+ACTIVITY_UNKNOWN = "unknown"
+
+
+class GameActivityMonitor:
+    """Classify the matched game process as loading, saving or idle.
+
+    Each sample costs one io_counters() and one non-blocking cpu_percent() call on the
+    process handle found by the detector; nothing here scans the process table.
+    """
+
+    # Bytes per second above which the game is considered busy with disk I/O
+    READ_BUSY_RATE = 8 * 1024 * 1024
+    WRITE_BUSY_RATE = 2 * 1024 * 1024
+    # cpu_percent() is per core, so a loading screen pegging one core reads ~100
+    CPU_BUSY_PERCENT = 90.0
+    # Samples closer together than this give noisy rates; reuse the last state instead
+    MIN_SAMPLE_SPACING = 0.2
+
+    __slots__ = ("process", "state", "cpu", "deferred_presses", "last_saving_time", "_last_io", "_last_time")
+
+    def __init__(self):
+        self.process = None
+        self.state = ACTIVITY_UNKNOWN
+        self.cpu = None  # last cpu_percent() reading, shared so nobody else resets its baseline
+        self.deferred_presses = 0
+        self.last_saving_time = 0.0
+        self._last_io = None
+        self._last_time = 0.0
+
+    def attach(self, process):
+        """Follow a new process handle, resetting the rate baseline if it changed"""
+        if process is self.process:
+            return
+        self.process = process
+        self.state = ACTIVITY_UNKNOWN
+        self.cpu = None
+        self._last_io = None
+        # Without this the new handle's baseline-less first cpu_percent() counts as a real 0%
+        self._last_time = 0.0
+        if process is not None:
+            # Prime the baselines so the next sample yields real rates
+            self.sample()
+
+    def _read_io(self):
+        try:
+            io = self.process.io_counters()
+            return io.read_bytes, io.write_bytes
+        except (AttributeError, NotImplementedError, psutil.AccessDenied):
+            # io_counters() is not available on macOS or for protected processes
+            return None
+
+    def sample(self):
+        """Take one sample and return the classified activity state"""
+        if self.process is None:
+            self.state = ACTIVITY_UNKNOWN
+            return self.state
+
+        now = time.monotonic()
+        if self._last_io is not None and now - self._last_time < self.MIN_SAMPLE_SPACING:
+            return self.state
+
+        try:
+            io = self._read_io()
+            cpu = self.process.cpu_percent(interval=None)
+        except (psutil.NoSuchProcess, psutil.ZombieProcess):
+            self.process = None
+            self.state = ACTIVITY_UNKNOWN
+            self.cpu = None
+            return self.state
+
+        # The first cpu_percent() call on a handle has no baseline and always reads 0
+        self.cpu = cpu if self._last_time else None
+
+        previous_io, previous_time = self._last_io, self._last_time
+        self._last_io, self._last_time = io, now
+        if io is None or previous_io is None or now <= previous_time:
+            self.state = ACTIVITY_UNKNOWN
+            return self.state
+
+        elapsed = now - previous_time
+        read_rate = (io[0] - previous_io[0]) / elapsed
+        write_rate = (io[1] - previous_io[1]) / elapsed
+        self.state = classify_activity(read_rate, write_rate, cpu,
+                                       self.READ_BUSY_RATE, self.WRITE_BUSY_RATE, self.CPU_BUSY_PERCENT)
+        if self.state == ACTIVITY_SAVING:
+            self.last_saving_time = now
+        return self.state
+
+    def wait_until_quiet(self, max_delay, should_continue, poll_interval=0.25, on_defer=None):
+        """Hold until the game's I/O is quiet or max_delay passes.
+
+        Returns the busy state that caused a deferral, or None if the game was already quiet.
+        """
+        if self.process is None:
+            return None
+        # The last sample may be up to 15 s old (risk sampling), and rates over that span average a
+        # burst that just started down to nothing; decide on a fresh poll_interval instead
+        self.sample()
+        time.sleep(poll_interval)
+        state = self.sample()
+        if state in (ACTIVITY_IDLE, ACTIVITY_UNKNOWN):
+            return None
+
+        busy_state = state
+        self.deferred_presses += 1
+        if on_defer:
+            on_defer()
+        deadline = time.monotonic() + max_delay
+        while should_continue() and time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            if self.sample() in (ACTIVITY_IDLE, ACTIVITY_UNKNOWN):
+                break
+        return busy_state
+
+
+def classify_activity(read_rate, write_rate, cpu_percent, read_busy, write_busy, cpu_busy):
+    """Map I/O rates and CPU usage to an activity state"""
+    if write_rate >= write_busy:
+        return ACTIVITY_SAVING
+    # Loading screens stream assets from disk; heavy reads with a busy CPU confirm it
+    if read_rate >= read_busy or (read_rate >= read_busy / 4 and cpu_percent >= cpu_busy):
+        return ACTIVITY_LOADING
+    return ACTIVITY_IDLE
@@ -0,0 +1,82 @@
+# sims_saver/game_catalog.py
+
+import json
+import os
+from pathlib import Path
+
+DEFAULT_PROFILE_ID = "the-sims-4"
+
+
+def default_catalog_path():
+    """Return the catalog bundled with the package"""
+    return Path(os.path.dirname(os.path.abspath(__file__))) / "game_catalog.json"
+
+
+class GameProfile:
+    """One catalogued game: how to recognise it and how to save it"""
+
+    __slots__ = ("id", "title", "process_names", "path_fragments", "launchers", "key", "interval_seconds")
+
+    def __init__(self, id, title, process_names, path_fragments=(), launchers=(), key="escape",
+                 interval_seconds=600):
+        self.id = id
+        self.title = title
+        self.process_names = tuple(name.lower() for name in process_names)
+        self.path_fragments = tuple(fragment.lower() for fragment in path_fragments)
+        self.launchers = tuple(name.lower() for name in launchers)
+        self.key = key
+        self.interval_seconds = interval_seconds
+
+    def matches_path(self, exe_path):
+        """True unless the executable path is known and contains none of the fragments"""
+        if not exe_path or not self.path_fragments:
+            return True
+        path = exe_path.replace("\\", "/").lower()
+        return any(fragment in path for fragment in self.path_fragments)
+
+
+class GameCatalog:
+    """Versioned set of game profiles, compiled into a single name -> profiles index.
+
+    A process scan looks each process name up once in the index, so every catalogued
+    game is recognised in the same pass however many titles the catalog holds.
+    """
+
+    def __init__(self, version, profiles):
+        self.version = version
+        self.profiles = list(profiles)
+        self.index = {}
+        for profile in self.profiles:
+            for name in profile.process_names:
+                self.index.setdefault(name, []).append(profile)
+
+    @classmethod
+    def load(cls, path=None):
+        """Load the catalog; an unreadable file gives an empty catalog"""
+        path = path or default_catalog_path()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return cls(data["version"], [GameProfile(**game) for game in data["games"]])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Error loading game catalog {path}: {e}")
+            return cls(0, [])
+
+    def get(self, profile_id):
+        for profile in self.profiles:
+            if profile.id == profile_id:
+                return profile
+        return None
+
+    def identify(self, name, exe_path=None, parent_name=None):
+        """Return the profile for a process, or None.
+
+        The executable path rules out same-named executables of other games; when
+        several profiles still fit, one whose launcher started the process wins.
+        """
+        candidates = [profile for profile in self.index.get(name.lower(), ())
+                      if profile.matches_path(exe_path)]
+        if len(candidates) > 1 and parent_name:
+            launched = [profile for profile in candidates if parent_name.lower() in profile.launchers]
+            candidates = launched or candidates
+        return candidates[0] if candidates else None
@@ -0,0 +1,239 @@
+# sims_saver/journal.py
+
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from sims_saver.app_dirs import user_data_dir
+
+# Event types stored in the journal
+EVENT_GAME_DETECTED = "game_detected"
+EVENT_GAME_EXITED = "game_exited"
+EVENT_KEY_FIRED = "key_fired"
+EVENT_PRESS_FAILED = "press_failed"
+EVENT_PRESS_DEFERRED = "press_deferred"
+EVENT_PRESS_SKIPPED = "press_skipped"
+EVENT_SAVE_CONFIRMED = "save_confirmed"
+EVENT_RESUMED = "resumed"
+EVENT_PROFILE_ACTIVATED = "profile_activated"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    event TEXT NOT NULL,
+    pid INTEGER,
+    create_time REAL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS idx_events_event_ts ON events (event, ts);
+"""
+
+INSERT_EVENT = "INSERT INTO events (ts, event, pid, create_time, detail) VALUES (?, ?, ?, ?, ?)"
+
+COUNTED_EVENTS = (EVENT_KEY_FIRED, EVENT_PRESS_FAILED, EVENT_PRESS_DEFERRED, EVENT_SAVE_CONFIRMED)
+
+# Per-event counts in a window
+SELECT_COUNTS = "SELECT event, COUNT(*) FROM events WHERE ts BETWEEN :since AND :until GROUP BY event"
+# First and last event in a window
+SELECT_SPAN = "SELECT MIN(ts), MAX(ts) FROM events WHERE ts BETWEEN :since AND :until"
+# One row per game instance detected in the window: its first detection and first exit after it.
+# A restarted helper re-detects the same instance, so only the first detection starts the session.
+SELECT_SESSIONS = """
+SELECT d.start, (SELECT MIN(x.ts) FROM events x
+                 WHERE x.event = 'game_exited' AND x.pid IS d.pid AND x.create_time IS d.create_time
+                   AND x.ts >= d.start AND x.ts <= :until)
+FROM (SELECT pid, create_time, MIN(ts) AS start FROM events
+      WHERE event = 'game_detected' AND ts BETWEEN :since AND :until
+      GROUP BY pid, create_time) d
+"""
+
+# Retention pruning deletes at most this many rows per step so the writer never stalls
+PRUNE_BATCH_SIZE = 500
+PRUNE_EVERY_SECONDS = 300
+
+_STOP = object()
+
+
+def default_journal_path():
+    """Return the default journal location in the per-user data folder"""
+    return user_data_dir() / "journal.sqlite3"
+
+
+class SaveJournal:
+    """Append-only event journal with a background batching writer.
+
+    `record` only enqueues, so callers on the auto-save thread never wait on disk I/O.
+    """
+
+    def __init__(self, db_path=None, retention_days=90, batch_size=64, flush_interval=1.0, max_pending=10000):
+        self.db_path = str(db_path or default_journal_path())
+        self.retention_seconds = retention_days * 86400
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped_events = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self._last_prune = 0.0
+
+    def _connect(self):
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def start(self):
+        """Start the background writer thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._writer_loop, name="journal-writer", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout=2):
+        """Flush pending events and stop the writer thread"""
+        if not self._thread:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def record(self, event, pid=None, create_time=None, detail=None):
+        """Queue an event for writing; never blocks the caller"""
+        try:
+            self._queue.put_nowait((time.time(), event, pid, create_time, detail))
+        except queue.Full:
+            self.dropped_events += 1
+
+    def _writer_loop(self):
+        """Drain the queue in batches and prune old rows while idle"""
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            print(f"Error opening save journal: {e}")
+            return
+
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._prune_step(conn)
+                continue
+
+            batch = []
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    conn.executemany(INSERT_EVENT, batch)
+                    conn.commit()
+                except sqlite3.Error as e:
+                    print(f"Error writing save journal: {e}")
+
+        conn.close()
+
+    def _prune_step(self, conn):
+        """Delete one small batch of expired rows, at most every PRUNE_EVERY_SECONDS"""
+        if self.retention_seconds <= 0:
+            return
+        now = time.time()
+        if now - self._last_prune < PRUNE_EVERY_SECONDS:
+            return
+        try:
+            cursor = conn.execute(
+                "DELETE FROM events WHERE id IN (SELECT id FROM events WHERE ts < ? ORDER BY ts LIMIT ?)",
+                (now - self.retention_seconds, PRUNE_BATCH_SIZE))
+            conn.commit()
+            # Keep pruning on the next idle tick until a partial batch says we're caught up
+            if cursor.rowcount < PRUNE_BATCH_SIZE:
+                self._last_prune = now
+        except sqlite3.Error as e:
+            print(f"Error pruning save journal: {e}")
+            self._last_prune = now
+
+    def get_stats(self, since=None, until=None):
+        """Compute session statistics for events in [since, until].
+
+        The aggregation runs in SQLite, so only a handful of rows per game session are read.
+        """
+        window = {"since": since if since is not None else 0.0,
+                  "until": until if until is not None else time.time()}
+
+        try:
+            conn = self._connect()
+            try:
+                counts = dict(conn.execute(SELECT_COUNTS, window).fetchall())
+                first_ts, last_ts = conn.execute(SELECT_SPAN, window).fetchone()
+                sessions = conn.execute(SELECT_SESSIONS, window).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Error reading save journal: {e}")
+            counts, first_ts, last_ts, sessions = {}, None, None, []
+
+        # Sessions without an exit event end at the last event in the window
+        session_lengths = [(end if end is not None else last_ts) - start for start, end in sessions]
+        span = last_ts - first_ts if first_ts is not None else 0.0
+        return compute_stats(counts, session_lengths, span)
+
+
+def compute_stats(counts, session_lengths, span_seconds=0.0):
+    """Summarize per-event counts and game session lengths; span is the journal window covered"""
+    counts = {event: counts.get(event, 0) for event in COUNTED_EVENTS}
+    fired = counts[EVENT_KEY_FIRED]
+    failed = counts[EVENT_PRESS_FAILED]
+    session_seconds = sum(session_lengths)
+    if session_seconds <= 0:
+        # Test Mode fires without a game session; fall back to the journal span
+        session_seconds = span_seconds
+
+    return {
+        "sessions": len(session_lengths),
+        "key_fired": fired,
+        "press_failed": failed,
+        "press_deferred": counts[EVENT_PRESS_DEFERRED],
+        "save_confirmed": counts[EVENT_SAVE_CONFIRMED],
+        "saves_per_hour": fired / (session_seconds / 3600) if session_seconds > 0 else 0.0,
+        "failure_rate": failed / (fired + failed) if fired + failed else 0.0,
+        "session_lengths": session_lengths,
+        "avg_session_seconds": session_seconds / len(session_lengths) if session_lengths else 0.0,
+        "longest_session_seconds": max(session_lengths) if session_lengths else 0.0,
+    }
+
+
+def format_duration(seconds):
+    """Format seconds as H:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+def format_stats(stats, loc):
+    """Render a stats dict as localized multi-line text"""
+    return loc.get("stats_text",
+                   sessions=stats["sessions"],
+                   key_fired=stats["key_fired"],
+                   press_failed=stats["press_failed"],
+                   press_deferred=stats["press_deferred"],
+                   save_confirmed=stats["save_confirmed"],
+                   saves_per_hour=stats["saves_per_hour"],
+                   failure_rate=stats["failure_rate"] * 100,
+                   avg_session=format_duration(stats["avg_session_seconds"]),
+                   longest_session=format_duration(stats["longest_session_seconds"]))
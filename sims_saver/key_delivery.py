@@ -0,0 +1,278 @@
+# sims_saver/key_delivery.py
+
+import sys
+import time
+
+from pynput.keyboard import Controller, Key
+
+# Key options from the dropdown as (modifiers, key) pairs
+KEY_COMBOS = {
+    "escape": ((), "escape"),
+    "f5": ((), "f5"),
+    "f9": ((), "f9"),
+    "ctrl+s": (("ctrl",), "s"),
+    "ctrl+shift+s": (("ctrl", "shift"), "s"),
+}
+
+
+def get_key_combo(key):
+    """Return (modifiers, key) for a dropdown key, defaulting to escape if unknown"""
+    return KEY_COMBOS.get(key, KEY_COMBOS["escape"])
+
+
+class KeyDelivery:
+    """Backend that delivers a save key combination"""
+
+    def deliver(self, key, pids=()):
+        """Deliver the key combination; return True on success"""
+        raise NotImplementedError
+
+
+class GlobalKeyDelivery(KeyDelivery):
+    """Sends keys through pynput to whichever window has focus.
+
+    `hold` keeps the main key down and `gap` waits after the modifiers go down (both in
+    seconds); some games drop chords sent with no delay. The self-test measures what a seat needs.
+    """
+
+    PYNPUT_KEYS = {"escape": Key.esc, "f5": Key.f5, "f9": Key.f9, "ctrl": Key.ctrl, "shift": Key.shift}
+
+    def __init__(self, hold=0.0, gap=0.0):
+        self.keyboard = Controller()
+        self.hold = hold
+        self.gap = gap
+
+    def deliver(self, key, pids=()):
+        modifiers, main_key = get_key_combo(key)
+        main_key = self.PYNPUT_KEYS.get(main_key, main_key)
+        try:
+            for modifier in modifiers:
+                self.keyboard.press(self.PYNPUT_KEYS[modifier])
+            try:
+                if modifiers and self.gap:
+                    time.sleep(self.gap)
+                self.keyboard.press(main_key)
+                if self.hold:
+                    time.sleep(self.hold)
+                self.keyboard.release(main_key)
+            finally:
+                for modifier in reversed(modifiers):
+                    self.keyboard.release(self.PYNPUT_KEYS[modifier])
+            return True
+        except Exception as e:
+            print(f"Error simulating key press: {e}")
+            return False
+
+
+class WindowKeyDelivery(KeyDelivery):
+    """Posts keys straight to the game's windows without needing focus.
+
+    Window handles are resolved once per game PID and cached, so a normal fire is a
+    direct post with no window enumeration. PIDs without a window yet (still loading)
+    are looked up again on the next fire. Anything that can't be targeted goes through
+    the global fallback.
+    """
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self.window_cache = {}  # pid -> list of window handles
+
+    def find_windows(self, pids):
+        """Return {pid: [window handle, ...]} for the given PIDs"""
+        raise NotImplementedError
+
+    def post_key(self, window, modifiers, key):
+        """Post one key combination to a window; raise if the window is gone"""
+        raise NotImplementedError
+
+    def get_windows(self, pids):
+        """Return cached window handles for pids, enumerating only for unresolved PIDs"""
+        for pid in list(self.window_cache):
+            if pid not in pids:
+                del self.window_cache[pid]
+
+        missing = {pid for pid in pids if not self.window_cache.get(pid)}
+        if missing:
+            found = self.find_windows(missing)
+            for pid in missing:
+                self.window_cache[pid] = found.get(pid, [])
+
+        return [window for pid in pids for window in self.window_cache[pid]]
+
+    def deliver(self, key, pids=()):
+        if not pids:
+            return self.fallback.deliver(key, pids)
+
+        modifiers, main_key = get_key_combo(key)
+        try:
+            if not self.get_windows(pids):
+                return self.fallback.deliver(key, pids)
+        except Exception as e:
+            print(f"Error looking up game windows: {e}")
+            return self.fallback.deliver(key, pids)
+
+        # Only PIDs none of whose windows took the key go through the fallback, so a game
+        # that already got the press doesn't get a second one
+        delivered, failed = False, []
+        for pid in pids:
+            windows = self.window_cache.get(pid)
+            if not windows:
+                # No window yet (still loading); it is looked up again next fire
+                failed.append(pid)
+                continue
+            posted = stale = False
+            for window in windows:
+                try:
+                    self.post_key(window, modifiers, main_key)
+                    posted = True
+                except Exception as e:
+                    print(f"Error posting key to game window: {e}")
+                    stale = True
+            if stale:
+                # Handles may be stale after the game recreated its window; look them up next fire
+                del self.window_cache[pid]
+            if posted:
+                delivered = True
+            else:
+                failed.append(pid)
+        if failed:
+            return self.fallback.deliver(key, failed) or delivered
+        return True
+
+
+class X11KeyDelivery(WindowKeyDelivery):
+    """Targets X11 windows by _NET_WM_PID and delivers keys with XSendEvent"""
+
+    KEYSYMS = {"escape": "Escape", "f5": "F5", "f9": "F9", "s": "s"}
+
+    def __init__(self, fallback):
+        super().__init__(fallback)
+        # python-xlib is installed with pynput on Linux
+        from Xlib import X, XK, display, error, protocol
+        self.X, self.XK, self.error, self.protocol = X, XK, error, protocol
+        self.display = display.Display()
+        self.root = self.display.screen().root
+        self.client_list_atom = self.display.intern_atom("_NET_CLIENT_LIST")
+        self.pid_atom = self.display.intern_atom("_NET_WM_PID")
+        self.modifier_masks = {"ctrl": X.ControlMask, "shift": X.ShiftMask}
+
+    def find_windows(self, pids):
+        found = {}
+        clients = self.root.get_full_property(self.client_list_atom, self.X.AnyPropertyType)
+        for window_id in (clients.value if clients else []):
+            window = self.display.create_resource_object("window", window_id)
+            try:
+                pid_property = window.get_full_property(self.pid_atom, self.X.AnyPropertyType)
+            except Exception:
+                continue
+            if pid_property and pid_property.value[0] in pids:
+                found.setdefault(pid_property.value[0], []).append(window)
+        return found
+
+    def post_key(self, window, modifiers, key):
+        keysym = self.XK.string_to_keysym(self.KEYSYMS.get(key, key))
+        keycode = self.display.keysym_to_keycode(keysym)
+        state = 0
+        for modifier in modifiers:
+            state |= self.modifier_masks[modifier]
+
+        # X errors arrive asynchronously; catch them so a destroyed window raises here
+        catch = self.error.CatchError(self.error.BadWindow)
+        for event_class, mask in ((self.protocol.event.KeyPress, self.X.KeyPressMask),
+                                  (self.protocol.event.KeyRelease, self.X.KeyReleaseMask)):
+            event = event_class(time=self.X.CurrentTime, root=self.root, window=window,
+                                same_screen=1, child=self.X.NONE, root_x=0, root_y=0,
+                                event_x=0, event_y=0, state=state, detail=keycode)
+            window.send_event(event, event_mask=mask, propagate=True, onerror=catch)
+        self.display.sync()
+        if catch.get_error():
+            raise OSError(f"Window {window.id:#x} no longer exists")
+
+
+class Win32KeyDelivery(WindowKeyDelivery):
+    """Targets top-level windows owned by the game PIDs with PostMessage"""
+
+    VIRTUAL_KEYS = {"escape": 0x1B, "f5": 0x74, "f9": 0x78, "s": 0x53, "ctrl": 0x11, "shift": 0x10}
+    WM_KEYDOWN = 0x0100
+    WM_KEYUP = 0x0101
+
+    def __init__(self, fallback):
+        super().__init__(fallback)
+        import ctypes
+        from ctypes import wintypes
+        self.ctypes, self.wintypes = ctypes, wintypes
+        self.user32 = ctypes.windll.user32
+        self.enum_proc_type = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+
+    def find_windows(self, pids):
+        found = {}
+        pid = self.wintypes.DWORD()
+
+        def on_window(hwnd, lparam):
+            if self.user32.IsWindowVisible(hwnd):
+                self.user32.GetWindowThreadProcessId(hwnd, self.ctypes.byref(pid))
+                if pid.value in pids:
+                    found.setdefault(pid.value, []).append(hwnd)
+            return True
+
+        self.user32.EnumWindows(self.enum_proc_type(on_window), 0)
+        return found
+
+    def post_virtual_key(self, hwnd, virtual_key, down):
+        scan_code = self.user32.MapVirtualKeyW(virtual_key, 0)
+        lparam = 1 | (scan_code << 16)
+        if not down:
+            # Previous key state and transition state bits for WM_KEYUP
+            lparam |= (1 << 30) | (1 << 31)
+        message = self.WM_KEYDOWN if down else self.WM_KEYUP
+        if not self.user32.PostMessageW(hwnd, message, virtual_key, lparam):
+            raise OSError(f"PostMessage to window {hwnd} failed")
+
+    def post_key(self, window, modifiers, key):
+        if not self.user32.IsWindow(window):
+            raise OSError(f"Window {window} no longer exists")
+        for modifier in modifiers:
+            self.post_virtual_key(window, self.VIRTUAL_KEYS[modifier], True)
+        self.post_virtual_key(window, self.VIRTUAL_KEYS[key], True)
+        self.post_virtual_key(window, self.VIRTUAL_KEYS[key], False)
+        for modifier in reversed(modifiers):
+            self.post_virtual_key(window, self.VIRTUAL_KEYS[modifier], False)
+
+
+class MacKeyDelivery(WindowKeyDelivery):
+    """Posts keyboard events to the game process with CGEventPostToPid"""
+
+    KEY_CODES = {"escape": 53, "f5": 96, "f9": 101, "s": 1}
+
+    def __init__(self, fallback):
+        super().__init__(fallback)
+        # pyobjc's Quartz bindings are installed with pynput on macOS
+        import Quartz
+        self.Quartz = Quartz
+        self.modifier_flags = {"ctrl": Quartz.kCGEventFlagMaskControl, "shift": Quartz.kCGEventFlagMaskShift}
+
+    def find_windows(self, pids):
+        # Events are addressed to the process itself, so the PID is the handle
+        return {pid: [pid] for pid in pids}
+
+    def post_key(self, window, modifiers, key):
+        flags = 0
+        for modifier in modifiers:
+            flags |= self.modifier_flags[modifier]
+        for down in (True, False):
+            event = self.Quartz.CGEventCreateKeyboardEvent(None, self.KEY_CODES[key], down)
+            self.Quartz.CGEventSetFlags(event, flags)
+            self.Quartz.CGEventPostToPid(window, event)
+
+
+def create_window_key_delivery(fallback):
+    """Return the targeted backend for this platform, or None if it isn't available"""
+    try:
+        if sys.platform == "win32":
+            return Win32KeyDelivery(fallback)
+        if sys.platform == "darwin":
+            return MacKeyDelivery(fallback)
+        return X11KeyDelivery(fallback)
+    except Exception as e:
+        print(f"Targeted key delivery unavailable: {e}")
+        return None
@@ -20,6 +20,7 @@ class Localization:
             "minutes_plural": "minutes",
             "one_sec": "1 sec",
             "thirty_min": "30 min",
+            "custom_schedule_active": "Custom schedule: {rules}",
             "key_to_press_title": "Key to Press",
             "key_escape": "Escape (opens menu)",
             "key_f5": "F5 (common save key)",
@@ -27,11 +28,16 @@ class Localization:
             "key_ctrl_s": "Ctrl+S (standard save)",
             "key_ctrl_shift_s": "Ctrl+Shift+S (custom save)",
             "test_mode_checkbox": "Test Mode - Press keys regardless of game status",
+            "targeted_delivery_checkbox": "Send keys directly to the game window (no focus needed)",
+            "adaptive_interval_checkbox": "Save more often as the game's crash risk rises",
+            "backup_checkbox": "Back up save files after each save",
+            "auto_profile_checkbox": "Switch to supported games automatically when they start",
             "monitored_process_title": "Monitored Process",
             "currently_monitoring": "Currently monitoring: {process_names}",
             "select_custom_process_button": "Select Custom Process",
             "status_title": "Status",
             "status_ready": "Ready to start",
+            "status_running": "Running - Auto-save active",
             "status_test_mode_pressing": "Test Mode - Pressing key...",
             "status_game_detected_pressing": "Game detected - Pressing key...",
             "status_key_pressed_success": "✅ Key pressed successfully",
@@ -40,6 +46,10 @@ class Localization:
             "status_running_waiting": "Running - Waiting for next interval",
             "status_waiting_for_process": "🔍 Waiting for monitored process...",
             "status_error_occurred": "⚠️ Error occurred",
+            "status_game_busy_deferring": "⏳ Game is loading or saving - holding key press...",
+            "status_game_not_responding": "⚠️ Game is not responding - skipping key press",
+            "status_resumed_from_sleep": "💤 Resumed from sleep - checking on the game...",
+            "status_profile_activated": "🎮 Recognised a supported game - using its save settings",
             "start_helper_button": "Start Helper",
             "stop_helper_button": "Stop Helper",
             "revert_to_defaults_button": "Revert to Defaults",
@@ -48,7 +58,12 @@ class Localization:
             "select_process_dialog_header": "Select a process from the list:",
             "select_button": "Select",
             "cancel_button": "Cancel",
+            "show_window_button": "Show Window",
+            "quit_button": "Quit",
             "settings_reverted": "Settings reverted to defaults",
+            "statistics_button": "Statistics",
+            "stats_dialog_title": "Save Statistics",
+            "stats_text": "Game sessions: {sessions}\nKeys pressed: {key_fired}\nFailed presses: {press_failed}\nDeferred presses: {press_deferred}\nConfirmed saves: {save_confirmed}\nSaves per hour: {saves_per_hour:.1f}\nFailure rate: {failure_rate:.1f}%\nAverage session: {avg_session}\nLongest session: {longest_session}",
             # "play_sound_cue_title": "Sound Cue", # Audio feature scrapped
             # "play_sound_cue_checkbox": "Play a sound cue when key is pressed"
         }
@@ -64,6 +79,7 @@ class Localization:
             "minutes_plural": "minutter",
             "one_sec": "1 sek",
             "thirty_min": "30 min",
+            "custom_schedule_active": "Brugerdefineret plan: {rules}",
             "key_to_press_title": "Tast til at trykke på",
             "key_escape": "Escape (åbner menu)",
             "key_f5": "F5 (almindelig gemmetast)",
@@ -71,11 +87,16 @@ class Localization:
             "key_ctrl_s": "Ctrl+S (standard gem)",
             "key_ctrl_shift_s": "Ctrl+Shift+S (brugerdefineret gem)",
             "test_mode_checkbox": "Testtilstand - Tryk på taster uanset spilstatus",
+            "targeted_delivery_checkbox": "Send taster direkte til spilvinduet (kræver ikke fokus)",
+            "adaptive_interval_checkbox": "Gem oftere når risikoen for nedbrud stiger",
+            "backup_checkbox": "Tag backup af gemte spil efter hver gemning",
+            "auto_profile_checkbox": "Skift automatisk til understøttede spil når de startes",
             "monitored_process_title": "Overvåget proces",
             "currently_monitoring": "Overvåger i øjeblikket: {process_names}",
             "select_custom_process_button": "Vælg brugerdefineret proces",
             "status_title": "Status",
             "status_ready": "Klar til at starte",
+            "status_running": "Kører - Automatisk gemning aktiv",
             "status_test_mode_pressing": "Testtilstand - Trykker på tast...",
             "status_game_detected_pressing": "Spil fundet - Trykker på tast...",
             "status_key_pressed_success": "✅ Tast trykket korrekt",
@@ -84,6 +105,10 @@ class Localization:
             "status_running_waiting": "Kører - Venter på næste interval",
             "status_waiting_for_process": "🔍 Venter på overvåget proces...",
             "status_error_occurred": "⚠️ Fejl opstod",
+            "status_game_busy_deferring": "⏳ Spillet indlæser eller gemmer - venter med tastetryk...",
+            "status_game_not_responding": "⚠️ Spillet svarer ikke - springer tastetryk over",
+            "status_resumed_from_sleep": "💤 Vågnet fra dvale - tjekker spillet...",
+            "status_profile_activated": "🎮 Genkendte et understøttet spil - bruger dets gemmeindstillinger",
             "start_helper_button": "Start hjælper",
             "stop_helper_button": "Stop hjælper",
             "revert_to_defaults_button": "Nulstil Indstillinger",
@@ -92,7 +117,12 @@ class Localization:
             "select_process_dialog_header": "Vælg en proces fra listen:",
             "select_button": "Vælg",
             "cancel_button": "Annuller",
+            "show_window_button": "Vis vindue",
+            "quit_button": "Afslut",
             "settings_reverted": "Indstillinger nulstillet til standard",
+            "statistics_button": "Statistik",
+            "stats_dialog_title": "Gemmestatistik",
+            "stats_text": "Spilsessioner: {sessions}\nTastetryk: {key_fired}\nMislykkede tastetryk: {press_failed}\nUdsatte tastetryk: {press_deferred}\nBekræftede gemninger: {save_confirmed}\nGemninger i timen: {saves_per_hour:.1f}\nFejlrate: {failure_rate:.1f}%\nGennemsnitlig session: {avg_session}\nLængste session: {longest_session}",
             # "play_sound_cue_title": "Lydsignal", # Audio feature scrapped
             # "play_sound_cue_checkbox": "Afspil lydsignal når tasten trykkes"
         }
@@ -4,7 +4,9 @@ Auto-save utility for The Sims 4
 Automatically presses Ctrl+Shift+S at configurable intervals when The Sims 4 is running.
 """
 
+import argparse
 import json
+import multiprocessing
 import os
 import sys
 import tempfile
@@ -20,21 +22,56 @@ from PIL import Image
 from pystray import Icon as TrayIcon, Menu as TrayMenu, MenuItem as TrayMenuItem
 
 import psutil
-from pynput.keyboard import Controller, Key
 # import winsound  # Windows-specific sound module
 
 from sims_saver.localization import Localization
+from sims_saver.journal import SaveJournal, format_stats
+from sims_saver.engine import AutoSaveEngine, EngineConfig
+from sims_saver.schedule import Schedule
+from sims_saver.diagnostics import StallWatchdog, SamplingProfiler
+from sims_saver.post_save import PostSavePipeline
+from sims_saver.backup import BackupStage, default_save_dir, default_store_dir
+from sims_saver.status_page import StatusPageWriter
+from sims_saver.suspend import MISSED_FIRE_POLICIES
+from sims_saver.process_trace import TraceRecorder
+from sims_saver.self_test import run_self_test, sweep_timings, format_result, countdown
+from sims_saver.game_catalog import GameCatalog, DEFAULT_PROFILE_ID
 
 
 class SimsSaverApp:
+    # ttk styles configured by setup_modern_style and cleared when the window is hidden
+    MODERN_STYLES = ("Modern.TButton", "Secondary.TButton", "Card.TFrame", "Title.TLabel", "Heading.TLabel",
+                     "Body.TLabel", "BodyOnCard.TLabel", "Status.TLabel", "Modern.TCombobox",
+                     "Modern.TCheckbutton")
+
     def __init__(self, root):
+        # Bundled catalog of supported games; the default profile is The Sims 4
+        self.catalog = GameCatalog.load()
+        default_profile = self.catalog.get(DEFAULT_PROFILE_ID)
+        default_process_names = list(default_profile.process_names) if default_profile else []
+
         # Default settings
         self.DEFAULT_SETTINGS = {
             "interval_slider_value": 70,
             "test_mode": False,
             "selected_key": "escape",
-            "monitored_process_name": ["ts4.exe", "the sims 4.exe", "ts4_x64.exe", "the sims 4"],
+            "monitored_process_name": default_process_names,
             "lang_code": "en",
+            "max_defer_seconds": 30,
+            "close_to_tray": True,
+            "targeted_key_delivery": False,
+            "adaptive_interval": False,
+            "adaptive_min_seconds": 60,
+            "backup_enabled": False,
+            "backup_save_dir": "",
+            "backup_store_dir": "",
+            "backup_keep_versions": 10,
+            "backup_max_age_days": 30,
+            "missed_fire_policy": "fire_once",
+            "resume_grace_seconds": 30,
+            "key_hold_ms": 0,
+            "key_gap_ms": 0,
+            "auto_profile": True,
         }
 
         # Load settings
@@ -42,8 +79,15 @@ class SimsSaverApp:
         self.settings = self.load_settings()
         self.test_mode = self.settings.get("test_mode", False)
         self.selected_key = self.settings.get("selected_key", "escape")
-        self.monitored_process_name = self.settings.get("monitored_process_name", ["ts4.exe", "the sims 4.exe", "ts4_x64.exe", "the sims 4"])
+        self.monitored_process_name = self.settings.get("monitored_process_name", default_process_names)
         self.lang_code = self.settings.get("lang_code", "en")
+        self.max_defer_seconds = self.settings.get("max_defer_seconds", 30)
+        self.close_to_tray = self.settings.get("close_to_tray", True)
+        self.targeted_key_delivery = self.settings.get("targeted_key_delivery", False)
+        self.adaptive_interval = self.settings.get("adaptive_interval", False)
+        self.adaptive_min_seconds = self.settings.get("adaptive_min_seconds", 60)
+        self.backup_enabled = self.settings.get("backup_enabled", False)
+        self.auto_profile = self.settings.get("auto_profile", True)
         self.loc = Localization(self.lang_code)
         
         self.root = root
@@ -76,10 +120,29 @@ class SimsSaverApp:
         except Exception as e:
             print(f"Error setting window icon: {e}")
 
-        # Auto-save state
-        self.is_running = False
-        self.auto_save_thread = None
-        self.keyboard = Controller()
+        # Save journal; writes happen on its own thread
+        self.journal = SaveJournal()
+        self.journal.start()
+
+        # Post-save stages (save file backups) run on their own thread after each confirmed save
+        self.post_save = PostSavePipeline([BackupStage(
+            self.settings.get("backup_save_dir") or default_save_dir(),
+            self.settings.get("backup_store_dir") or default_store_dir(),
+            keep_versions=self.settings.get("backup_keep_versions", 10),
+            max_age_days=self.settings.get("backup_max_age_days", 30))])
+        self.post_save.start()
+
+        # Auto-save state lives in the engine so it survives the widget tree being destroyed
+        # Status page for overlays and monitors; see sims_saver.status_page
+        self.status_page = StatusPageWriter()
+        self.status_page.open()
+        self.engine = AutoSaveEngine(self, None, self.journal, self.post_save, self.status_page, self.catalog)
+        self.status_key = "status_ready"
+        self.status_update_pending = False
+        self.gui_built = False
+        self.gui_attributes = ()
+        # Catalogued game profile in use for this session; never written to settings.json
+        self.active_profile = None
 
         # Load interval setting with new non-linear mapping
         if "interval_slider_value" in self.settings:
@@ -87,6 +150,7 @@ class SimsSaverApp:
         else:
             # Default to 5 minutes (position 70 in new mapping)
             self.interval_slider_value = 70
+        self.update_schedule()
 
         # Available keys for dropdown
         self.available_keys = {
@@ -97,12 +161,73 @@ class SimsSaverApp:
             "ctrl+shift+s": self.loc.get("key_ctrl_shift_s")
         }
 
+        self.build_gui()
+
+        # Initialize tray icon
+        self.tray_icon = None
+
+    @property
+    def is_running(self):
+        return self.engine.is_running
+
+    def build_gui(self):
+        """Create the widget tree from the current settings"""
+        # Remember which attributes belong to the widget tree so they can be released later
+        before = set(vars(self))
         self.setup_modern_style()
         self.create_gui()
+        self.gui_attributes = tuple(set(vars(self)) - before)
+        self.gui_built = True
         self.update_gui_language()
-        
-        # Initialize tray icon
-        self.tray_icon = None
+        self.update_running_controls()
+        self.apply_status()
+
+    def destroy_gui(self):
+        """Destroy the widget tree and drop every reference to it"""
+        for child in self.root.winfo_children():
+            child.destroy()
+        for name in self.gui_attributes:
+            delattr(self, name)
+        self.gui_attributes = ()
+        self.gui_built = False
+        self.release_modern_style()
+
+    def hide_to_tray(self):
+        """Withdraw the window and release its widgets while the engine keeps running"""
+        if not self.gui_built:
+            return
+        self.root.withdraw()
+        self.destroy_gui()
+
+    def show_window(self):
+        """Rebuild the widget tree on demand and show the window"""
+        if not self.gui_built:
+            self.build_gui()
+        self.root.deiconify()
+        self.root.lift()
+
+    def set_status(self, key):
+        """Set the status message; safe to call from any thread, with or without a window"""
+        self.status_key = key
+        if self.gui_built and not self.status_update_pending:
+            self.status_update_pending = True
+            self.root.after(0, self.apply_status)
+
+    def apply_status(self):
+        """Push the latest status message to the status label"""
+        self.status_update_pending = False
+        if self.gui_built:
+            self.status_var.set(self.loc.get(self.status_key))
+
+    def update_running_controls(self):
+        """Enable or disable controls to match the engine state"""
+        if not self.gui_built:
+            return
+        running = self.is_running
+        self.start_button.config(state=tk.DISABLED if running else tk.NORMAL)
+        self.stop_button.config(state=tk.NORMAL if running else tk.DISABLED)
+        # Settings apply live through publish_config, so only a custom schedule locks the slider
+        self.interval_slider.config(state=tk.DISABLED if self.custom_schedule else tk.NORMAL)
 
     def setup_modern_style(self):
         """Setup modern Material Design-inspired styling"""
@@ -204,23 +329,92 @@ class SimsSaverApp:
                        focuscolor='none',
                        font=('Segoe UI', 10))
 
+    def release_modern_style(self):
+        """Clear the custom ttk styles so their fonts and colours aren't held while hidden"""
+        # Tk has no command to delete a style; emptying its options frees the values it holds
+        style = ttk.Style()
+        for name in self.MODERN_STYLES:
+            options = style.configure(name) or {}
+            style.configure(name, **{option: "" for option in options})
+            style.map(name, **{option: [] for option in style.map(name)})
+
     def toggle_test_mode(self):
         """Handle test mode toggle"""
         self.test_mode = self.test_mode_var.get()
         self.settings["test_mode"] = self.test_mode
         self.save_settings()
+        self.publish_config()
+
+    def toggle_targeted_delivery(self):
+        """Handle targeted key delivery toggle"""
+        self.targeted_key_delivery = self.targeted_delivery_var.get()
+        self.settings["targeted_key_delivery"] = self.targeted_key_delivery
+        self.save_settings()
+        self.publish_config()
+
+    def toggle_backup(self):
+        """Handle save backup toggle"""
+        self.backup_enabled = self.backup_var.get()
+        self.settings["backup_enabled"] = self.backup_enabled
+        self.save_settings()
+        self.publish_config()
+
+    def toggle_auto_profile(self):
+        """Handle automatic game profile toggle"""
+        self.auto_profile = self.auto_profile_var.get()
+        self.settings["auto_profile"] = self.auto_profile
+        self.save_settings()
+        self.publish_config()
+
+    def activate_profile(self, profile):
+        """Switch to a catalogued game's profile; called from the engine thread"""
+        self.root.after(0, self.apply_profile, profile)
+
+    def deactivate_profile(self):
+        """Go back to the user's own settings; called from the engine thread when the game exits"""
+        self.root.after(0, self.clear_profile)
+
+    def apply_profile(self, profile):
+        """Monitor the profile's game with its recommended key and interval for this session only"""
+        self.active_profile = profile
+        self.publish_config()
+        self.set_status("status_profile_activated")
+        if self.gui_built:
+            self.update_monitored_process_display()
+
+    def clear_profile(self):
+        """Drop the session profile so the saved settings apply again"""
+        if self.active_profile is None:
+            return
+        self.active_profile = None
+        self.publish_config()
+        if self.gui_built:
+            self.update_monitored_process_display()
+
+    def toggle_adaptive_interval(self):
+        """Handle adaptive interval toggle"""
+        self.adaptive_interval = self.adaptive_interval_var.get()
+        self.settings["adaptive_interval"] = self.adaptive_interval
+        self.save_settings()
+        self.publish_config()
 
     def on_key_selected(self, event=None):
         """Handle key selection change"""
         selected_key = self.key_var.get()
         self.selected_key = selected_key
+        # A choice made by the user replaces the profile's settings
+        self.active_profile = None
         self.key_description_var.set(self.available_keys[selected_key])
         self.settings["selected_key"] = selected_key
         self.save_settings()
+        self.publish_config()
 
     def on_interval_changed(self, value):
         """Handle interval slider change with non-linear mapping"""
         value = int(float(value))
+        if value != self.interval_slider_value:
+            # Moved by the user rather than restored on a rebuild; their choice replaces the profile's
+            self.active_profile = None
         self.interval_slider_value = value
         
         # Non-linear mapping: 0-30 = seconds 1-59, 31-100 = minutes 1-30
@@ -232,23 +426,64 @@ class SimsSaverApp:
             # Map 31-100 to minutes 1-30
             minutes = max(1, int(1 + ((value - 30) * 29 / 70)))
             display_text = f"{minutes} {self.loc.get('minutes_plural') if minutes != 1 else self.loc.get('minutes_singular')}"
-            
-        self.interval_display_var.set(display_text)
+
         self.settings["interval_slider_value"] = value
+        self.update_schedule()
+        if self.custom_schedule:
+            display_text = self.loc.get("custom_schedule_active", rules=self.schedule.describe())
+        self.interval_display_var.set(display_text)
         self.save_settings()
 
+    def update_schedule(self):
+        """Rebuild the firing schedule; the slider is the preset used when no custom rules are set"""
+        rules = self.settings.get("schedule")
+        self.schedule = None
+        if rules:
+            try:
+                self.schedule = Schedule.parse(rules)
+            except ValueError as e:
+                print(f"Error in schedule settings: {e}")
+        self.custom_schedule = self.schedule is not None
+        if not self.custom_schedule:
+            self.schedule = Schedule.every(self.get_interval_seconds_from_slider())
+        self.publish_config()
+
+    def publish_config(self):
+        """Hand the engine a fresh settings snapshot; it applies it at its next decision point"""
+        selected_key, process_names, schedule = self.selected_key, self.monitored_process_name, self.schedule
+        profile = self.active_profile
+        if profile is not None:
+            process_names = profile.process_names
+            if profile.key in self.available_keys:
+                selected_key = profile.key
+            if not self.custom_schedule:
+                schedule = Schedule.every(profile.interval_seconds)
+        self.engine.update_config(EngineConfig(
+            test_mode=self.test_mode,
+            selected_key=selected_key,
+            monitored_process_names=tuple(process_names),
+            max_defer_seconds=self.max_defer_seconds,
+            schedule=schedule,
+            targeted_key_delivery=self.targeted_key_delivery,
+            adaptive_interval=self.adaptive_interval,
+            adaptive_min_seconds=self.adaptive_min_seconds,
+            backup_enabled=self.backup_enabled,
+            missed_fire_policy=self.get_missed_fire_policy(),
+            resume_grace_seconds=self.settings.get("resume_grace_seconds", 30),
+            key_hold_ms=self.settings.get("key_hold_ms", 0),
+            key_gap_ms=self.settings.get("key_gap_ms", 0),
+            auto_profile=self.auto_profile))
+
+    def get_missed_fire_policy(self):
+        policy = self.settings.get("missed_fire_policy", "fire_once")
+        if policy not in MISSED_FIRE_POLICIES:
+            print(f"Error in settings: unknown missed_fire_policy {policy!r}, using 'fire_once'")
+            return "fire_once"
+        return policy
+
     def get_interval_seconds_from_slider(self):
         """Get interval in seconds from slider value with non-linear mapping"""
-        value = self.interval_slider_value
-        
-        # Non-linear mapping: 0-30 = seconds 1-59, 31-100 = minutes 1-30
-        if value <= 30:
-            # Map 0-30 to seconds 1-59
-            return max(1, int(1 + (value * 58 / 30)))
-        else:
-            # Map 31-100 to minutes 1-30, convert to seconds
-            minutes = max(1, int(1 + ((value - 30) * 29 / 70)))
-            return minutes * 60
+        return slider_to_seconds(self.interval_slider_value)
 
     def create_gui(self):
         """Create the modern GUI components"""
@@ -360,18 +595,22 @@ class SimsSaverApp:
         self.key_description_var.set(self.available_keys[self.selected_key])
 
         self.test_mode_check.config(text=self.loc.get("test_mode_checkbox"))
+        self.targeted_delivery_check.config(text=self.loc.get("targeted_delivery_checkbox"))
+        self.adaptive_interval_check.config(text=self.loc.get("adaptive_interval_checkbox"))
+        self.auto_profile_check.config(text=self.loc.get("auto_profile_checkbox"))
+        self.backup_check.config(text=self.loc.get("backup_checkbox"))
 
         self.process_header_label.config(text=self.loc.get("monitored_process_title"))
         self.update_monitored_process_display()
         self.select_process_button.config(text=self.loc.get("select_custom_process_button"))
 
         self.status_title_label.config(text=self.loc.get("status_title"))
-        if not self.is_running: # Only update if not actively running
-            self.status_var.set(self.loc.get("status_ready"))
+        self.status_var.set(self.loc.get(self.status_key))
 
         self.start_button.config(text=self.loc.get("start_helper_button"))
         self.stop_button.config(text=self.loc.get("stop_helper_button"))
         self.revert_button.config(text=self.loc.get("revert_to_defaults_button"))
+        self.stats_button.config(text=self.loc.get("statistics_button"))
         self.info_label.config(text=self.loc.get("info_text"))
 
 
@@ -473,7 +712,39 @@ class SimsSaverApp:
                                               variable=self.test_mode_var,
                                               command=self.toggle_test_mode,
                                               style='Modern.TCheckbutton')
-        self.test_mode_check.pack()
+        self.test_mode_check.pack(anchor=tk.W)
+
+        self.targeted_delivery_var = tk.BooleanVar(value=self.targeted_key_delivery)
+        self.targeted_delivery_check = ttk.Checkbutton(checkbox_container,
+                                                      text=self.loc.get("targeted_delivery_checkbox"),
+                                                      variable=self.targeted_delivery_var,
+                                                      command=self.toggle_targeted_delivery,
+                                                      style='Modern.TCheckbutton')
+        self.targeted_delivery_check.pack(anchor=tk.W, pady=(8, 0))
+
+        self.adaptive_interval_var = tk.BooleanVar(value=self.adaptive_interval)
+        self.adaptive_interval_check = ttk.Checkbutton(checkbox_container,
+                                                      text=self.loc.get("adaptive_interval_checkbox"),
+                                                      variable=self.adaptive_interval_var,
+                                                      command=self.toggle_adaptive_interval,
+                                                      style='Modern.TCheckbutton')
+        self.adaptive_interval_check.pack(anchor=tk.W, pady=(8, 0))
+
+        self.backup_var = tk.BooleanVar(value=self.backup_enabled)
+        self.backup_check = ttk.Checkbutton(checkbox_container,
+                                            text=self.loc.get("backup_checkbox"),
+                                            variable=self.backup_var,
+                                            command=self.toggle_backup,
+                                            style='Modern.TCheckbutton')
+        self.backup_check.pack(anchor=tk.W, pady=(8, 0))
+
+        self.auto_profile_var = tk.BooleanVar(value=self.auto_profile)
+        self.auto_profile_check = ttk.Checkbutton(checkbox_container,
+                                                  text=self.loc.get("auto_profile_checkbox"),
+                                                  variable=self.auto_profile_var,
+                                                  command=self.toggle_auto_profile,
+                                                  style='Modern.TCheckbutton')
+        self.auto_profile_check.pack(anchor=tk.W, pady=(8, 0))
 
     def create_process_selection_section(self):
         """Create the process selection section"""
@@ -494,7 +765,8 @@ class SimsSaverApp:
     def update_monitored_process_display(self):
         """Update the display for the currently monitored process names"""
         # Remove .exe for display purposes if on Windows, otherwise keep as is
-        display_names = [name.replace('.exe', '') if platform.system() == "Windows" and name.lower().endswith('.exe') else name for name in self.monitored_process_name]
+        process_names = self.active_profile.process_names if self.active_profile else self.monitored_process_name
+        display_names = [name.replace('.exe', '') if platform.system() == "Windows" and name.lower().endswith('.exe') else name for name in process_names]
         self.monitored_process_var.set(self.loc.get("currently_monitoring", process_names=', '.join(display_names)))
 
     def open_process_selection_dialog(self):
@@ -581,9 +853,11 @@ class SimsSaverApp:
             selected_indices = process_listbox.curselection()
             if selected_indices:
                 selected_processes = [process_listbox.get(i).lower() for i in selected_indices]
+                self.active_profile = None
                 self.monitored_process_name = selected_processes
                 self.settings["monitored_process_name"] = self.monitored_process_name
                 self.save_settings()
+                self.publish_config()
                 self.update_monitored_process_display()
             dialog.destroy()
 
@@ -611,7 +885,7 @@ class SimsSaverApp:
         self.status_title_label = ttk.Label(status_inner, text=self.loc.get("status_title"), style='Body.TLabel')
         self.status_title_label.pack(anchor=tk.W)
 
-        self.status_var = tk.StringVar(value=self.loc.get("status_ready"))
+        self.status_var = tk.StringVar(value=self.loc.get(self.status_key))
         self.status_label = ttk.Label(status_inner, textvariable=self.status_var,
                                      style='Status.TLabel')
         self.status_label.pack(anchor=tk.W, pady=(4, 0))
@@ -637,6 +911,24 @@ class SimsSaverApp:
                                       command=self.revert_to_default_settings, style='Secondary.TButton')
         self.revert_button.pack(side=tk.LEFT, padx=(12, 0))
 
+        self.stats_button = ttk.Button(button_frame, text=self.loc.get("statistics_button"),
+                                       command=self.show_statistics, style='Secondary.TButton')
+        self.stats_button.pack(side=tk.LEFT, padx=(12, 0))
+
+    def show_statistics(self):
+        """Show save statistics from the journal; the query runs off the Tk thread"""
+        self.stats_button.config(state='disabled')
+        threading.Thread(target=self.load_statistics, name="statistics", daemon=True).start()
+
+    def load_statistics(self):
+        stats = self.journal.get_stats()
+        self.root.after(0, self.display_statistics, stats)
+
+    def display_statistics(self, stats):
+        if self.gui_built:
+            self.stats_button.config(state='normal')
+        messagebox.showinfo(self.loc.get("stats_dialog_title"), format_stats(stats, self.loc), parent=self.root)
+
     def create_info_footer(self, parent):
         """Create the information footer"""
         footer_frame = tk.Frame(parent, bg=self.colors['background'])
@@ -651,106 +943,6 @@ class SimsSaverApp:
                                   style='Body.TLabel')
         self.info_label.pack(anchor=tk.W)
 
-    def is_process_running(self, process_names):
-        """Check if any of the specified processes are currently running"""
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                process_full_name = proc.info['name'].lower() if proc.info['name'] else ""
-                for name in process_names:
-                    if platform.system() == "Windows" and name.lower().endswith('.exe'):
-                        if name.lower() in process_full_name:
-                            return True
-                    elif platform.system() == "Darwin" or platform.system() == "Linux": # MacOS or Linux
-                        # On macOS/Linux, process names might not have .exe. Match directly.
-                        # Some macOS apps might have .app extension or no extension.
-                        # We check if the monitored name is part of the full process name.
-                        if name.lower() in process_full_name:
-                            return True
-                    else:
-                        # Fallback for other systems, just use direct name matching
-                        if name.lower() in process_full_name:
-                            return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        return False
-
-    def simulate_save_keybind(self):
-        """Simulate pressing the selected key combination"""
-        try:
-            key = self.selected_key
-
-            if key == "escape":
-                self.keyboard.press(Key.esc)
-                self.keyboard.release(Key.esc)
-            elif key == "f5":
-                self.keyboard.press(Key.f5)
-                self.keyboard.release(Key.f5)
-            elif key == "f9":
-                self.keyboard.press(Key.f9)
-                self.keyboard.release(Key.f9)
-            elif key == "ctrl+s":
-                with self.keyboard.pressed(Key.ctrl):
-                    self.keyboard.press('s')
-                    self.keyboard.release('s')
-            elif key == "ctrl+shift+s":
-                with self.keyboard.pressed(Key.ctrl):
-                    with self.keyboard.pressed(Key.shift):
-                        self.keyboard.press('s')
-                        self.keyboard.release('s')
-            else:
-                # Default to escape if unknown key
-                self.keyboard.press(Key.esc)
-                self.keyboard.release(Key.esc)
-
-            return True
-        except Exception as e:
-            print(f"Error simulating key press: {e}")
-            return False
-
-    def auto_save_loop(self):
-        """Main auto-save loop running in background thread"""
-        while self.is_running:
-            try:
-                if not self.is_running:  # Check again in case we were stopped
-                    break
-
-                if self.test_mode or self.is_process_running(self.monitored_process_name):
-                    if self.test_mode:
-                        self.root.after(0, lambda: self.status_var.set(self.loc.get("status_test_mode_pressing")))
-                    else:
-                        self.root.after(0, lambda: self.status_var.set(self.loc.get("status_game_detected_pressing")))
-
-                    if self.simulate_save_keybind():
-                        self.root.after(0, lambda: self.status_var.set(self.loc.get("status_key_pressed_success")))
-                    else:
-                        self.root.after(0, lambda: self.status_var.set(self.loc.get("status_key_press_failed")))
-
-                    # Brief pause after save
-                    time.sleep(2)
-                    if not self.is_running:  # Check if we should stop
-                        break
-
-                    if self.test_mode:
-                        self.root.after(0, lambda: self.status_var.set(self.loc.get("status_test_mode_waiting")))
-                    else:
-                        self.root.after(0, lambda: self.status_var.set(self.loc.get("status_running_waiting")))
-                else:
-                    self.root.after(0, lambda: self.status_var.set(self.loc.get("status_waiting_for_process")))
-
-                # Wait for next interval with periodic checks
-                interval_seconds = self.get_interval_seconds()
-                elapsed = 0
-                while elapsed < interval_seconds and self.is_running:
-                    sleep_time = min(1.0, interval_seconds - elapsed)  # Sleep max 1 second at a time
-                    time.sleep(sleep_time)
-                    elapsed += sleep_time
-
-            except Exception as e:
-                print(f"Error in auto-save loop: {e}")
-                if self.is_running:  # Only update status if still running
-                    self.root.after(0, lambda: self.status_var.set(self.loc.get("status_error_occurred")))
-                    time.sleep(5)  # Brief pause before retry
-
     def get_interval_seconds(self):
         """Get the current interval in seconds"""
         return self.get_interval_seconds_from_slider()
@@ -761,8 +953,8 @@ class SimsSaverApp:
             return
 
         # Ensure any previous thread is fully stopped
-        if self.auto_save_thread and self.auto_save_thread.is_alive():
-            self.stop_auto_save()
+        if self.engine.thread and self.engine.thread.is_alive():
+            self.engine.stop()
             time.sleep(0.5)  # Brief pause to ensure cleanup
 
         # Save settings
@@ -774,16 +966,11 @@ class SimsSaverApp:
         self.save_settings()
 
         # Start auto-save
-        self.is_running = True
-        self.auto_save_thread = threading.Thread(target=self.auto_save_loop, daemon=True)
-        self.auto_save_thread.start()
+        self.engine.start()
 
         # Update UI
-        self.start_button.config(state=tk.DISABLED)
-        self.stop_button.config(state=tk.NORMAL)
-        self.interval_slider.config(state=tk.DISABLED)
-        self.key_dropdown.config(state=tk.DISABLED)
-        self.status_var.set("Running - Auto-save active")
+        self.update_running_controls()
+        self.set_status("status_running")
         if self.tray_icon:
             self.tray_icon.update_menu() # Update tray icon menu to reflect state change
 
@@ -792,45 +979,50 @@ class SimsSaverApp:
         if not self.is_running:
             return
 
-        self.is_running = False
-
         # Wait for thread to finish
-        if self.auto_save_thread and self.auto_save_thread.is_alive():
-            self.auto_save_thread.join(timeout=2)
-
-        # Clear thread reference
-        self.auto_save_thread = None
+        self.engine.stop()
 
         # Update UI
-        self.start_button.config(state=tk.NORMAL)
-        self.stop_button.config(state=tk.DISABLED)
-        self.interval_slider.config(state=tk.NORMAL)
-        self.key_dropdown.config(state=tk.NORMAL)
-        self.status_var.set(self.loc.get("status_ready"))
+        self.update_running_controls()
+        self.set_status("status_ready")
         if self.tray_icon:
             self.tray_icon.update_menu() # Update tray icon menu to reflect state change
 
     def revert_to_default_settings(self):
         """Revert all settings to their default values."""
         self.settings = self.DEFAULT_SETTINGS.copy() # Use a copy of default settings
+        self.active_profile = None
         self.test_mode = self.settings["test_mode"]
         self.selected_key = self.settings["selected_key"]
         self.interval_slider_value = self.settings["interval_slider_value"]
         self.monitored_process_name = self.settings["monitored_process_name"]
         self.lang_code = self.settings["lang_code"]
+        self.targeted_key_delivery = self.settings["targeted_key_delivery"]
+        self.adaptive_interval = self.settings["adaptive_interval"]
+        self.adaptive_min_seconds = self.settings["adaptive_min_seconds"]
+        self.backup_enabled = self.settings["backup_enabled"]
+        self.auto_profile = self.settings["auto_profile"]
         self.loc = Localization(self.lang_code)
-        
+        self.update_schedule()
+        self.save_settings()
+        self.set_status("settings_reverted")
+        if not self.gui_built:
+            return
+
         # Update UI elements
+        self.update_running_controls()
         self.update_monitored_process_display()
         self.key_var.set(self.selected_key)
         self.on_key_selected() 
         self.interval_slider.set(self.interval_slider_value)
         self.on_interval_changed(self.interval_slider_value) 
         self.test_mode_var.set(self.test_mode) 
+        self.targeted_delivery_var.set(self.targeted_key_delivery)
+        self.adaptive_interval_var.set(self.adaptive_interval)
+        self.backup_var.set(self.backup_enabled)
+        self.auto_profile_var.set(self.auto_profile)
         self.lang_var.set(self.language_options.get(self.lang_code, "English"))
         self.update_gui_language()
-        self.save_settings() 
-        self.root.after(0, lambda: self.status_var.set(self.loc.get("settings_reverted")))
 
     def load_settings(self):
         """Load settings from file"""
@@ -850,13 +1042,23 @@ class SimsSaverApp:
         except Exception as e:
             print(f"Error saving settings: {e}")
             
+    def on_window_close(self):
+        """Hide to the tray when available, otherwise quit."""
+        if self.close_to_tray and self.tray_icon:
+            self.hide_to_tray()
+        else:
+            self.on_closing()
+
     def on_closing(self):
-        """Handles the window closing event."""
+        """Handles the application quitting."""
         if self.is_running:
             self.stop_auto_save()
         if self.tray_icon:
             # Schedule tray icon stop on the main thread
             self.root.after(0, self.tray_icon.stop)
+        self.post_save.close()
+        self.journal.close()
+        self.status_page.close()
         self.root.destroy()
 
     def create_tray_icon(self):
@@ -872,6 +1074,8 @@ class SimsSaverApp:
         try:
             if icon_path.exists():
                 image = Image.open(icon_path)
+                # Tray icons are tiny; don't keep the full-size decoded bitmap resident
+                image.thumbnail((64, 64))
             else:
                 print(f"Warning: Tray icon not found at {icon_path}")
                 return
@@ -881,8 +1085,9 @@ class SimsSaverApp:
 
         # Create the menu items
         menu_items = [
-            TrayMenuItem(self.loc.get("start_helper_button"), self.start_auto_save, default=True, visible=not self.is_running),
-            TrayMenuItem(self.loc.get("stop_helper_button"), self.stop_auto_save, visible=self.is_running),
+            TrayMenuItem(self.loc.get("show_window_button"), lambda: self.root.after(0, self.show_window), default=True),
+            TrayMenuItem(self.loc.get("start_helper_button"), self.start_auto_save, visible=lambda item: not self.is_running),
+            TrayMenuItem(self.loc.get("stop_helper_button"), self.stop_auto_save, visible=lambda item: self.is_running),
             TrayMenuItem(self.loc.get("revert_to_defaults_button"), self.revert_to_default_settings),
             TrayMenuItem(self.loc.get("quit_button"), self.on_closing)
         ]
@@ -894,22 +1099,118 @@ class SimsSaverApp:
             menu=TrayMenu(*menu_items)
         )
         # Run the icon in a separate thread to not block the main Tkinter thread
-        threading.Thread(target=self.tray_icon.run, daemon=True).start()
+        threading.Thread(target=self.tray_icon.run, name="tray", daemon=True).start()
+
+
+def slider_to_seconds(value):
+    """Map an interval slider position to seconds: 0-30 = seconds 1-59, 31-100 = minutes 1-30"""
+    if value <= 30:
+        # Map 0-30 to seconds 1-59
+        return max(1, int(1 + (value * 58 / 30)))
+    # Map 31-100 to minutes 1-30, convert to seconds
+    minutes = max(1, int(1 + ((value - 30) * 29 / 70)))
+    return minutes * 60
+
+
+def print_statistics(days=None):
+    """Print save statistics from the journal to stdout"""
+    journal = SaveJournal()
+    since = time.time() - days * 86400 if days else None
+    print(format_stats(journal.get_stats(since=since), Localization("en")))
+
+
+def self_test(args):
+    """Measure whether injected chords actually arrive, and with which timings"""
+    settings = {}
+    settings_file = Path(os.path.dirname(__file__)) / "settings.json"
+    try:
+        if settings_file.exists():
+            with open(settings_file, 'r') as f:
+                settings = json.load(f)
+    except Exception as e:
+        print(f"Error loading settings: {e}")
+    key = args.key or settings.get("selected_key", "escape")
+
+    countdown()
+    if args.sweep:
+        results, timings = sweep_timings(key, args.count, args.load)
+        for result in results:
+            print(format_result(result))
+        if timings:
+            print(f"Recommended: \"key_hold_ms\": {timings[0]}, \"key_gap_ms\": {timings[1]}")
+        else:
+            print("No timing delivered every chord cleanly; try targeted key delivery")
+        return
+
+    hold_ms = settings.get("key_hold_ms", 0) if args.hold is None else args.hold
+    gap_ms = settings.get("key_gap_ms", 0) if args.gap is None else args.gap
+    print(format_result(run_self_test(key, args.count, hold_ms, gap_ms, load_processes=args.load)))
 
 
 def main():
     """Main entry point"""
+    # The self-test's load processes re-run this entry point in frozen Windows builds
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="Auto-save utility for The Sims 4")
+    parser.add_argument("--stats", action="store_true", help="print save statistics from the journal and exit")
+    parser.add_argument("--days", type=float, default=None, help="limit --stats to the last N days")
+    parser.add_argument("--profile", metavar="PATH", help="sample all threads and write collapsed stacks to PATH on exit")
+    parser.add_argument("--watchdog", action="store_true", help="report Tk main-thread stalls while running")
+    parser.add_argument("--stall-threshold", type=float, default=100, metavar="MS",
+                        help="--watchdog: report stalls longer than this (default: 100)")
+    parser.add_argument("--capture-trace", metavar="PATH",
+                        help="record the process table once a second to PATH for offline replay")
+    parser.add_argument("--self-test", action="store_true",
+                        help="send test chords to the focused window, check they arrive, and exit")
+    parser.add_argument("--key", help="--self-test: key to send (default: the selected key)")
+    parser.add_argument("--count", type=int, default=50, help="--self-test: chords to send (default: 50)")
+    parser.add_argument("--load", type=int, default=0, metavar="N", help="--self-test: keep N cores busy meanwhile")
+    parser.add_argument("--hold", type=int, metavar="MS", help="--self-test: key hold time (default: from settings)")
+    parser.add_argument("--gap", type=int, metavar="MS", help="--self-test: modifier gap (default: from settings)")
+    parser.add_argument("--sweep", action="store_true", help="--self-test: find the gentlest timing that works")
+    args = parser.parse_args()
+
+    if args.stats:
+        print_statistics(args.days)
+        return
+    if args.self_test:
+        self_test(args)
+        return
+
+    profiler = None
+    if args.profile:
+        profiler = SamplingProfiler(args.profile)
+        profiler.start()
+
+    recorder = None
+    if args.capture_trace:
+        recorder = TraceRecorder(args.capture_trace, interval=AutoSaveEngine.DETECT_POLL_INTERVAL)
+        recorder.start()
+
     root = tk.Tk()
     app = SimsSaverApp(root)
 
     # Handle window close
-    root.protocol("WM_DELETE_WINDOW", app.on_closing)
+    root.protocol("WM_DELETE_WINDOW", app.on_window_close)
     # Schedule tray icon creation after the mainloop starts to avoid blocking UI
     app.tray_icon = None # Initialize to None before scheduling creation
     root.after(0, app.create_tray_icon)
+
+    # Report anything that blocks the Tk event loop for longer than the threshold. Opt-in: its
+    # heartbeat wakes the app dozens of times a second, even while hidden in the tray.
+    watchdog = None
+    if args.watchdog:
+        watchdog = StallWatchdog(root, threshold=args.stall_threshold / 1000)
+        watchdog.start()
     try:
         root.mainloop()
     finally:
+        if watchdog:
+            watchdog.stop()
+        if profiler:
+            profiler.stop()
+        if recorder:
+            recorder.stop()
         # Ensure tray icon is stopped even if mainloop exits unexpectedly
         if app.tray_icon:
             app.root.after(0, app.tray_icon.stop)  # Schedule on the main thread
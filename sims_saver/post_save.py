@@ -0,0 +1,97 @@
+# sims_saver/post_save.py
+
+import ctypes
+import queue
+import sys
+import threading
+
+import psutil
+
+_STOP = object()
+
+
+def lower_io_priority():
+    """Put the calling thread's disk I/O in the background class, best effort"""
+    try:
+        if sys.platform.startswith("linux"):
+            # ioprio_set works per thread on Linux, and /proc/<tid> resolves for any thread
+            psutil.Process(threading.get_native_id()).ionice(psutil.IOPRIO_CLASS_IDLE)
+        elif sys.platform == "win32":
+            THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+        elif sys.platform == "darwin":
+            IOPOL_TYPE_DISK, IOPOL_SCOPE_THREAD, IOPOL_THROTTLE = 0, 1, 3
+            libc = ctypes.CDLL("libc.dylib")
+            libc.setiopolicy_np(IOPOL_TYPE_DISK, IOPOL_SCOPE_THREAD, IOPOL_THROTTLE)
+    except Exception as e:
+        print(f"Error lowering I/O priority: {e}")
+
+
+class PostSaveTrigger:
+    """What the engine knew when it confirmed a save"""
+
+    __slots__ = ("time", "pid", "create_time")
+
+    def __init__(self, time, pid=None, create_time=None):
+        self.time = time
+        self.pid = pid
+        self.create_time = create_time
+
+
+class PostSavePipeline:
+    """Runs post-save stages in order on one background thread at low I/O priority.
+
+    A stage is any object with `run(trigger, stop_event)`. Triggers that arrive while
+    a run is already queued are coalesced, since the queued run will see their changes.
+    """
+
+    def __init__(self, stages=()):
+        self.stages = list(stages)
+        self.stop_event = threading.Event()
+        self._queue = queue.Queue(maxsize=1)
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self.stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="post-save", daemon=True)
+        self._thread.start()
+
+    def close(self, timeout=2):
+        """Abandon any running stage at its next check and stop the thread"""
+        if not self._thread:
+            return
+        self.stop_event.set()
+        try:
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            pass  # the thread checks stop_event after its current item
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def submit(self, trigger):
+        """Queue a run; never blocks the caller"""
+        try:
+            self._queue.put_nowait(trigger)
+        except queue.Full:
+            pass
+
+    def run_once(self, trigger):
+        """Run every stage for one trigger on the calling thread"""
+        for stage in self.stages:
+            if self.stop_event.is_set():
+                return
+            try:
+                stage.run(trigger, self.stop_event)
+            except Exception as e:
+                print(f"Error in post-save stage {type(stage).__name__}: {e}")
+
+    def _run(self):
+        lower_io_priority()
+        while not self.stop_event.is_set():
+            trigger = self._queue.get()
+            if trigger is _STOP:
+                break
+            self.run_once(trigger)
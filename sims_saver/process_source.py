@@ -0,0 +1,271 @@
+# sims_saver/process_source.py
+
+import os
+import platform
+import sys
+
+import psutil
+
+
+class ProcessSource:
+    """Backend that finds monitored processes in the process table"""
+
+    # True when listing a process's descendants doesn't scan the whole process table
+    cheap_children = False
+
+    def find_all(self, process_names):
+        """Return psutil.Process handles for every running process matching any name"""
+        raise NotImplementedError
+
+    def find(self, process_names):
+        """Return a psutil.Process for the first running process matching any name, or None"""
+        matches = self.find_all(process_names)
+        return matches[0] if matches else None
+
+    def find_indexed(self, index):
+        """Return [(handle, lowercase name)] for processes whose exact name is a key of index"""
+        matches = []
+        for proc in psutil.process_iter(['name']):
+            name = (proc.info['name'] or "").lower()
+            if name in index:
+                matches.append((proc, name))
+        return matches
+
+    def children(self, pid):
+        """Return [(pid, lowercase name), ...] for all descendants of pid"""
+        return self.children_of([pid])
+
+    def children_of(self, pids):
+        """Return [(pid, lowercase name), ...] for all descendants of any of pids.
+
+        psutil's Process.children() snapshots the whole table (on Windows,
+        CreateToolhelp32Snapshot) per call, so build one ppid map for all parents instead.
+        """
+        if not pids:
+            return []
+        by_parent = {}
+        for proc in psutil.process_iter(['ppid', 'name']):
+            by_parent.setdefault(proc.info['ppid'], []).append((proc.pid, (proc.info['name'] or "").lower()))
+        result = []
+        seen = set(pids)
+        pending = list(pids)
+        while pending:
+            for child_pid, name in by_parent.get(pending.pop(), ()):
+                if child_pid not in seen:
+                    seen.add(child_pid)
+                    result.append((child_pid, name))
+                    pending.append(child_pid)
+        return result
+
+    def get_handle(self, pid):
+        """Return a psutil handle for pid, or None if it is gone"""
+        try:
+            return psutil.Process(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+
+class PsutilProcessSource(ProcessSource):
+    """Portable backend built on psutil.process_iter"""
+
+    def find(self, process_names):
+        for proc in self.iter_matches(process_names):
+            return proc
+        return None
+
+    def find_all(self, process_names):
+        return list(self.iter_matches(process_names))
+
+    def iter_matches(self, process_names):
+        for proc in psutil.process_iter(['pid', 'name']):
+            try:
+                process_full_name = proc.info['name'].lower() if proc.info['name'] else ""
+                for name in process_names:
+                    if platform.system() == "Windows" and name.lower().endswith('.exe'):
+                        if name.lower() in process_full_name:
+                            yield proc
+                            break
+                    elif platform.system() == "Darwin" or platform.system() == "Linux": # MacOS or Linux
+                        # On macOS/Linux, process names might not have .exe. Match directly.
+                        # Some macOS apps might have .app extension or no extension.
+                        # We check if the monitored name is part of the full process name.
+                        if name.lower() in process_full_name:
+                            yield proc
+                            break
+                    else:
+                        # Fallback for other systems, just use direct name matching
+                        if name.lower() in process_full_name:
+                            yield proc
+                            break
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+
+class ProcFsProcessSource(ProcessSource):
+    """Linux fast path that reads /proc directly.
+
+    Only /proc/<pid>/comm is read on each scan (cmdline only when comm is truncated and
+    has changed). PIDs owned by other users are rejected once per PID directory inode
+    and skipped on later scans. comm itself is never cached: exec and PR_SET_NAME
+    rename a process without changing its inode, which is how Wine and Proton start games.
+    """
+
+    # The kernel truncates comm to TASK_COMM_LEN - 1 characters
+    COMM_MAX_LENGTH = 15
+
+    def __init__(self, proc_root="/proc", uid=None):
+        self.proc_root = proc_root
+        self.uid = os.getuid() if uid is None else uid
+        # pid -> (directory inode, raw comm, lowercase name); comm is None for other users' PIDs
+        self.known_pids = {}
+        self.handles = {}
+        # task/<tid>/children needs CONFIG_PROC_CHILDREN; probe it on our own main thread
+        own_pid = str(os.getpid())
+        self.supports_children = os.path.exists(os.path.join(proc_root, own_pid, "task", own_pid, "children"))
+        self.cheap_children = self.supports_children
+
+    def find_all(self, process_names):
+        names = [name.lower() for name in process_names]
+        match_pids = [pid for pid, name in self.scan() if any(n in name for n in names)]
+        matches = [self.get_handle(pid) for pid in match_pids]
+        return [handle for handle in matches if handle is not None]
+
+    def find_indexed(self, index):
+        matches = [(self.get_handle(pid), name) for pid, name in self.scan() if name in index]
+        return [(handle, name) for handle, name in matches if handle is not None]
+
+    def scan(self):
+        """Return [(pid, lowercase name)] for this user's processes, refreshing the caches"""
+        seen = {}
+        result = []
+
+        try:
+            entries = os.scandir(self.proc_root)
+        except OSError as e:
+            print(f"Error scanning {self.proc_root}: {e}")
+            return []
+
+        with entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                pid = int(entry.name)
+                try:
+                    inode = entry.inode()
+                except OSError:
+                    continue
+
+                known = self.known_pids.get(pid)
+                if known is not None and known[0] != inode:
+                    known = None  # PID reused by a new process
+                if known is not None and known[1] is None:
+                    seen[pid] = known  # owned by another user
+                    continue
+                if known is None and not self.is_owned(entry.path):
+                    seen[pid] = (inode, None, None)
+                    continue
+
+                comm = self.read_comm(entry.path)
+                if comm is None:
+                    continue  # exited mid-scan
+                if known is not None and known[1] == comm:
+                    name = known[2]
+                else:
+                    name = self.full_name(entry.path, comm)
+                seen[pid] = (inode, comm, name)
+                if name:
+                    result.append((pid, name))
+
+        # Vanished PIDs fall out of the caches here
+        self.known_pids = seen
+        self.handles = {pid: handle for pid, handle in self.handles.items() if pid in seen}
+        return result
+
+    def children_of(self, pids):
+        if not self.supports_children:
+            return super().children_of(pids)
+        result = []
+        for pid in pids:
+            result.extend(self.children(pid))
+        return result
+
+    def children(self, pid):
+        if not self.supports_children:
+            return super().children(pid)
+
+        # /proc/<pid>/task/<tid>/children lists direct children without a table scan
+        result = []
+        pending = [pid]
+        while pending:
+            parent = pending.pop()
+            task_dir = os.path.join(self.proc_root, str(parent), "task")
+            try:
+                tids = os.listdir(task_dir)
+            except OSError:
+                continue
+            for tid in tids:
+                try:
+                    with open(os.path.join(task_dir, tid, "children"), "rb") as f:
+                        child_pids = [int(child) for child in f.read().split()]
+                except OSError:
+                    continue
+                for child_pid in child_pids:
+                    name = self.read_name(os.path.join(self.proc_root, str(child_pid)))
+                    if name is not None:
+                        result.append((child_pid, name))
+                    pending.append(child_pid)
+        return result
+
+    def is_owned(self, path):
+        try:
+            return os.stat(path).st_uid == self.uid
+        except OSError:
+            return False
+
+    def read_comm(self, path):
+        """Read /proc/<pid>/comm, or None if the process is gone"""
+        try:
+            with open(os.path.join(path, "comm"), "rb") as f:
+                return f.read().rstrip(b"\n").decode("utf-8", "surrogateescape")
+        except OSError:
+            return None
+
+    def full_name(self, path, comm):
+        """Return the lowercase process name, taking it from argv[0] when comm is truncated"""
+        name = comm
+        if len(comm) >= self.COMM_MAX_LENGTH:
+            # comm was cut short; the executable name in argv[0] is the full one
+            try:
+                with open(os.path.join(path, "cmdline"), "rb") as f:
+                    argv0 = f.read().split(b"\0", 1)[0].decode("utf-8", "surrogateescape")
+            except OSError:
+                argv0 = ""
+            if argv0:
+                name = argv0.replace("\\", "/").rsplit("/", 1)[-1]
+        return name.lower()
+
+    def read_name(self, path):
+        """Read the lowercase process name for a /proc/<pid> directory, or None to skip it"""
+        if not self.is_owned(path):
+            return None
+        comm = self.read_comm(path)
+        return self.full_name(path, comm) if comm is not None else None
+
+    def get_handle(self, pid):
+        """Return a psutil handle for pid, reusing the previous one for the same process"""
+        handle = self.handles.get(pid)
+        if handle is not None and handle.is_running():
+            return handle
+        try:
+            handle = self.handles[pid] = psutil.Process(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self.handles.pop(pid, None)
+            handle = None
+        return handle
+
+
+def create_process_source():
+    """Pick the fastest available process backend for this platform"""
+    if sys.platform.startswith("linux") and os.path.isdir("/proc/self"):
+        return ProcFsProcessSource()
+    return PsutilProcessSource()
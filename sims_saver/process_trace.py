@@ -0,0 +1,359 @@
+# sims_saver/process_trace.py
+"""Capture process-table timelines from real machines and replay them offline.
+
+A trace is a gzip stream: a header, then one frame per scan holding only what changed
+since the previous frame (PIDs that went away and processes that appeared).
+"""
+
+import argparse
+import gzip
+import struct
+import threading
+import time
+import zlib
+
+import psutil
+
+from sims_saver.process_source import ProcessSource
+from sims_saver.process_tree import GameProcessTracker, is_game_name, filter_by_lineage
+from sims_saver.schedule import Schedule, ScheduleRunner
+
+TRACE_MAGIC = b"SSTR"
+TRACE_VERSION = 1
+
+# magic, version, wall time at the start of the capture
+TRACE_HEADER = struct.Struct("<4sHd")
+# seconds since the start, removed count, added count
+FRAME_HEADER = struct.Struct("<dII")
+REMOVED_PID = struct.Struct("<I")
+# pid, ppid, create_time, name length (utf-8 name follows)
+ADDED_PROCESS = struct.Struct("<IIdH")
+
+# Sync-flush the compressor this often, so a capture cut off by a crash or power loss replays
+# up to its last flush instead of not at all
+FLUSH_EVERY_FRAMES = 10
+
+
+def snapshot_processes():
+    """Return {pid: (name, create_time, ppid)} for the whole process table"""
+    snapshot = {}
+    for proc in psutil.process_iter(["pid", "name", "create_time", "ppid"]):
+        info = proc.info
+        snapshot[info["pid"]] = (info["name"] or "", info["create_time"] or 0.0, info["ppid"] or 0)
+    return snapshot
+
+
+class TraceWriter:
+    """Appends delta-encoded frames to a compressed trace file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.previous = {}
+        self.start_mono = None
+        self.frames = 0
+        self._file = None
+
+    def open(self):
+        self._file = gzip.open(self.path, "wb")
+        self.start_mono = time.monotonic()
+        self._file.write(TRACE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, time.time()))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write_frame(self, snapshot):
+        previous = self.previous
+        # A PID whose process was replaced, renamed by exec or reparented (its launcher exited)
+        # counts as removed and added in the same frame
+        removed = [pid for pid, entry in previous.items() if snapshot.get(pid, entry) != entry]
+        removed.extend(pid for pid in previous if pid not in snapshot)
+        added = [pid for pid, entry in snapshot.items() if previous.get(pid) != entry]
+
+        parts = [FRAME_HEADER.pack(time.monotonic() - self.start_mono, len(removed), len(added))]
+        parts.extend(REMOVED_PID.pack(pid) for pid in removed)
+        for pid in added:
+            name, create_time, ppid = snapshot[pid]
+            encoded = name.encode("utf-8", "surrogateescape")[:0xFFFF]
+            parts.append(ADDED_PROCESS.pack(pid, ppid, create_time, len(encoded)))
+            parts.append(encoded)
+        self._file.write(b"".join(parts))
+        self.previous = snapshot
+        self.frames += 1
+        if self.frames % FLUSH_EVERY_FRAMES == 0:
+            self._file.flush(zlib.Z_SYNC_FLUSH)
+
+
+class TraceRecorder:
+    """Records the process table every `interval` seconds on a background thread"""
+
+    def __init__(self, path, interval=1.0):
+        self.writer = TraceWriter(path)
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.writer.open()
+        self._thread = threading.Thread(target=self._run, name="trace-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=2)
+        self._thread = None
+        self.writer.close()
+        print(f"Wrote {self.writer.frames} frames to {self.writer.path}")
+
+    def _run(self):
+        while True:
+            try:
+                self.writer.write_frame(snapshot_processes())
+            except Exception as e:
+                print(f"Error recording process trace: {e}")
+            if self._stop_event.wait(self.interval):
+                break
+
+
+def read_trace(path):
+    """Return (start wall time, iterator of (offset, removed pids, added entries))"""
+    f = gzip.open(path, "rb")
+    try:
+        header = f.read(TRACE_HEADER.size)
+    except (EOFError, OSError):
+        header = b""
+    if len(header) < TRACE_HEADER.size:
+        f.close()
+        raise ValueError(f"Not a process trace: {path}")
+    magic, version, start_wall = TRACE_HEADER.unpack(header)
+    if magic != TRACE_MAGIC or version != TRACE_VERSION:
+        f.close()
+        raise ValueError(f"Not a process trace: {path}")
+
+    def frames():
+        with f:
+            while True:
+                try:
+                    data = f.read(FRAME_HEADER.size)
+                    if len(data) < FRAME_HEADER.size:
+                        return  # end of trace
+                    offset, removed_count, added_count = FRAME_HEADER.unpack(data)
+                    removed = [REMOVED_PID.unpack(f.read(REMOVED_PID.size))[0] for _ in range(removed_count)]
+                    added = []
+                    for _ in range(added_count):
+                        pid, ppid, create_time, name_length = ADDED_PROCESS.unpack(f.read(ADDED_PROCESS.size))
+                        name = f.read(name_length).decode("utf-8", "surrogateescape")
+                        added.append((pid, name, create_time, ppid))
+                except (EOFError, struct.error):
+                    # A capture that was never closed (app killed, power lost) ends mid-stream
+                    # or mid-frame; replay what was flushed
+                    return
+                yield offset, removed, added
+
+    return start_wall, frames()
+
+
+class ReplayProcess:
+    """Stand-in for psutil.Process backed by the replayed process table"""
+
+    __slots__ = ("source", "pid", "_create_time")
+
+    def __init__(self, source, pid, create_time):
+        self.source = source
+        self.pid = pid
+        self._create_time = create_time
+
+    def _entry(self):
+        entry = self.source.processes.get(self.pid)
+        if entry is None or entry[1] != self._create_time:
+            raise psutil.NoSuchProcess(self.pid)
+        return entry
+
+    def is_running(self):
+        entry = self.source.processes.get(self.pid)
+        return entry is not None and entry[1] == self._create_time
+
+    def status(self):
+        self._entry()
+        return psutil.STATUS_RUNNING
+
+    def name(self):
+        return self._entry()[0]
+
+    def create_time(self):
+        return self._create_time
+
+    def ppid(self):
+        return self._entry()[2]
+
+    def __getattr__(self, attribute):
+        # The trace has no I/O, memory or CPU data; callers already cope with denied access
+        raise psutil.AccessDenied(self.pid)
+
+
+class ReplayProcessSource(ProcessSource):
+    """ProcessSource that serves a recorded trace one frame at a time.
+
+    `step()` applies the next frame and advances the virtual clocks, which can be
+    handed to ScheduleRunner so the scheduler runs on trace time.
+    """
+
+    def __init__(self, path):
+        self.start_wall, self._frames = read_trace(path)
+        self.processes = {}  # pid -> (name, create_time, ppid)
+        self.offset = 0.0
+        self._children = None
+
+    def step(self):
+        """Apply the next frame; returns False at the end of the trace"""
+        frame = next(self._frames, None)
+        if frame is None:
+            return False
+        self.offset, removed, added = frame
+        for pid in removed:
+            self.processes.pop(pid, None)
+        for pid, name, create_time, ppid in added:
+            self.processes[pid] = (name, create_time, ppid)
+        self._children = None
+        return True
+
+    def clock(self):
+        return self.start_wall + self.offset
+
+    def monotonic(self):
+        return self.offset
+
+    def find_all(self, process_names):
+        names = [name.lower() for name in process_names]
+        return [ReplayProcess(self, pid, entry[1]) for pid, entry in self.processes.items()
+                if any(name in entry[0].lower() for name in names)]
+
+    def find_indexed(self, index):
+        return [(ReplayProcess(self, pid, entry[1]), entry[0].lower()) for pid, entry in self.processes.items()
+                if entry[0].lower() in index]
+
+    cheap_children = True
+
+    def children_of(self, pids):
+        result = []
+        for pid in pids:
+            result.extend(self.children(pid))
+        return result
+
+    def children(self, pid):
+        if self._children is None:
+            self._children = {}
+            for child_pid, entry in self.processes.items():
+                self._children.setdefault(entry[2], []).append(child_pid)
+        result = []
+        pending = [pid]
+        while pending:
+            for child_pid in self._children.get(pending.pop(), ()):
+                if child_pid != pid:
+                    result.append((child_pid, self.processes[child_pid][0].lower()))
+                    pending.append(child_pid)
+        return result
+
+    def get_handle(self, pid):
+        entry = self.processes.get(pid)
+        return ReplayProcess(self, pid, entry[1]) if entry is not None else None
+
+
+def expected_games(source, names):
+    """Brute-force answer for the current frame: every matching non-helper, by lineage"""
+    candidates = [ReplayProcess(source, pid, entry[1]) for pid, entry in source.processes.items()
+                  if is_game_name(entry[0].lower(), names)]
+    return {proc.pid for proc in filter_by_lineage(candidates)}
+
+
+def benchmark(path, process_names, speed=0.0, interval=300):
+    """Replay a trace through the tracker and scheduler, checking each answer against a full scan"""
+    source = ReplayProcessSource(path)
+    tracker = GameProcessTracker(source)
+    # The scheduler runs on trace time; like the engine, it starts a period after the game appears
+    runner = ScheduleRunner(Schedule.every(interval), clock=source.clock, monotonic=source.monotonic)
+    names = [name.lower() for name in process_names]
+    costs = []
+    wrong = missed = frames = presses = 0
+    game_seen = False
+    previous_offset = 0.0
+    while source.step():
+        if speed:
+            time.sleep(max(0.0, source.offset - previous_offset) / speed)
+        previous_offset = source.offset
+        started = time.perf_counter()
+        found = {proc.pid for proc in tracker.find_all(names)}
+        costs.append(time.perf_counter() - started)
+        expected = expected_games(source, names)
+        frames += 1
+        if found and not game_seen:
+            runner.restart()
+        elif found and runner.seconds_until_next() == 0:
+            runner.mark_fired()
+            presses += 1
+        game_seen = bool(found)
+        if found != expected:
+            wrong += 1
+            if expected and not found:
+                missed += 1
+
+    costs.sort()
+    return {
+        "frames": frames,
+        "trace_seconds": source.offset,
+        "processes": len(source.processes),
+        "mean_us": sum(costs) / len(costs) * 1e6 if costs else 0.0,
+        "p50_us": costs[len(costs) // 2] * 1e6 if costs else 0.0,
+        "p99_us": costs[int(len(costs) * 0.99)] * 1e6 if costs else 0.0,
+        "wrong_frames": wrong,
+        "missed_frames": missed,
+        "presses": presses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay process-table traces")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="record the process table to a trace file")
+    record.add_argument("path")
+    record.add_argument("--interval", type=float, default=1.0, help="seconds between scans (default: 1)")
+    record.add_argument("--duration", type=float, help="stop after this many seconds (default: Ctrl+C)")
+    bench = commands.add_parser("bench", help="replay a trace through the game detector")
+    bench.add_argument("path")
+    bench.add_argument("--names", nargs="+", default=["ts4.exe", "the sims 4.exe", "ts4_x64.exe", "the sims 4"],
+                       help="process names to detect")
+    bench.add_argument("--speed", type=float, default=0.0,
+                       help="replay speed-up relative to real time (default: as fast as possible)")
+    bench.add_argument("--interval", type=int, default=300, help="save interval in seconds (default: 300)")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        recorder = TraceRecorder(args.path, args.interval)
+        recorder.start()
+        try:
+            if args.duration:
+                time.sleep(args.duration)
+            else:
+                threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            recorder.stop()
+        return 0
+
+    result = benchmark(args.path, args.names, args.speed, args.interval)
+    print(f"Frames: {result['frames']} over {result['trace_seconds']:.0f} s of trace "
+          f"({result['processes']} processes at the end)")
+    print(f"Lookup cost: mean {result['mean_us']:.1f} us, p50 {result['p50_us']:.1f} us, "
+          f"p99 {result['p99_us']:.1f} us")
+    print(f"Frames that disagree with a full scan: {result['wrong_frames']} "
+          f"({result['missed_frames']} with the game missed)")
+    print(f"Save presses at a {args.interval} s interval: {result['presses']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,107 @@
+# sims_saver/process_tree.py
+
+import psutil
+
+# Launchers the game is normally started from
+KNOWN_LAUNCHERS = ["eadesktop.exe", "ea desktop", "eabackgroundservice.exe", "origin.exe", "steam.exe", "steam"]
+
+# Same-named helpers that must never count as the game itself
+HELPER_KEYWORDS = ["crash", "reporter", "updater", "installer", "touchup", "cleanup"]
+
+
+class GameProcessTracker:
+    """Finds the game through launcher process trees instead of rescanning the whole table.
+
+    Once found, the game's handles are pinned and only checked for liveness. While
+    waiting, only the cached launchers' children are inspected; the full process table
+    is scanned every FULL_SCAN_EVERY lookups to pick up launchers and games started
+    outside a launcher. Helpers are ignored by name and by parent lineage.
+    """
+
+    FULL_SCAN_EVERY = 10
+
+    def __init__(self, process_source, launcher_names=None):
+        self.source = process_source
+        self.launcher_names = [name.lower() for name in (launcher_names or KNOWN_LAUNCHERS)]
+        self.launchers = []
+        self.games = []
+        self.monitored_names = []
+        self.lookups_since_full_scan = self.FULL_SCAN_EVERY
+
+    def reset(self):
+        """Forget cached handles so the next lookup does a full scan"""
+        self.launchers = []
+        self.games = []
+        self.lookups_since_full_scan = self.FULL_SCAN_EVERY
+
+    def find_all(self, process_names):
+        """Return handles for running game processes, cheapest source first"""
+        names = [name.lower() for name in process_names]
+        if names != self.monitored_names:
+            # A different game was selected; pinned handles no longer apply
+            self.reset()
+            self.monitored_names = names
+
+        # Steady state: the pinned game is still running
+        self.games = [proc for proc in self.games if is_alive(proc)]
+        if self.games:
+            return self.games
+
+        self.lookups_since_full_scan += 1
+        if self.lookups_since_full_scan < self.FULL_SCAN_EVERY:
+            self.launchers = [proc for proc in self.launchers if is_alive(proc)]
+            candidates = []
+            # One lookup for all launchers; without /proc that is a single process-table pass
+            for pid, name in self.source.children_of([launcher.pid for launcher in self.launchers]):
+                if is_game_name(name, names):
+                    handle = self.source.get_handle(pid)
+                    if handle is not None:
+                        candidates.append(handle)
+        else:
+            self.lookups_since_full_scan = 0
+            candidates = []
+            self.launchers = []
+            for proc in self.source.find_all(names + self.launcher_names):
+                proc_name = process_name(proc)
+                if proc_name in self.launcher_names:
+                    self.launchers.append(proc)
+                elif is_game_name(proc_name, names):
+                    candidates.append(proc)
+
+        self.games = filter_by_lineage(candidates)
+        return self.games
+
+
+def is_alive(proc):
+    try:
+        return proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+
+
+def process_name(proc):
+    try:
+        return proc.name().lower()
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return ""
+
+
+def is_game_name(name, monitored_names):
+    """Match a monitored name while rejecting crash reporters, updaters and similar helpers"""
+    if not any(monitored in name for monitored in monitored_names):
+        return False
+    return not any(keyword in name for keyword in HELPER_KEYWORDS)
+
+
+def filter_by_lineage(candidates):
+    """Drop candidates spawned by another candidate; the game's own helpers share its name"""
+    pids = {proc.pid for proc in candidates}
+    games = []
+    for proc in candidates:
+        try:
+            if proc.ppid() in pids:
+                continue
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        games.append(proc)
+    return games
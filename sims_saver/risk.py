@@ -0,0 +1,176 @@
+# sims_saver/risk.py
+
+import sys
+from collections import deque
+
+import psutil
+
+MB = 1024 * 1024
+
+
+class RiskSample:
+    """One cheap observation of the game process"""
+
+    __slots__ = ("time", "rss", "cpu", "responding")
+
+    def __init__(self, time, rss, cpu, responding):
+        self.time = time
+        self.rss = rss
+        self.cpu = cpu
+        self.responding = responding
+
+
+class RiskAssessment:
+    __slots__ = ("risk", "hung")
+
+    def __init__(self, risk, hung):
+        self.risk = risk
+        self.hung = hung
+
+
+class RiskMonitor:
+    """Keeps recent samples of the game's memory and responsiveness in a fixed-size ring buffer.
+
+    The game's windows are looked up here, once per PID and again only when a handle goes
+    stale, so hang detection works whichever key delivery backend is in use.
+    """
+
+    SAMPLE_EVERY = 15.0
+    # An unresponsive sample with the CPU at 0% throughout also counts toward a hang
+    ZERO_CPU_EVIDENCE = True
+
+    def __init__(self, capacity=240, find_windows=None, window_exists=None):
+        # 240 samples at 15 s is the last hour of play
+        self.samples = deque(maxlen=capacity)
+        self.next_sample_time = 0.0
+        # Assessment of the current samples; the loop asks far more often than samples arrive
+        self.assessment = None
+        if find_windows is None and sys.platform == "win32":
+            find_windows, window_exists = find_top_level_windows, win32_window_exists
+        self.find_windows = find_windows
+        self.window_exists = window_exists
+        self.window_pid = None
+        self.windows = []
+
+    def reset(self):
+        self.samples.clear()
+        self.next_sample_time = 0.0
+        self.assessment = None
+        self.window_pid = None
+        self.windows = []
+
+    def sample_due(self, now):
+        return now >= self.next_sample_time
+
+    def windows_for(self, pid):
+        """Cached window handles for pid, looked up again while it has none or one has closed"""
+        if self.find_windows is None:
+            return ()
+        if (pid != self.window_pid or not self.windows
+                or (self.window_exists and not all(self.window_exists(window) for window in self.windows))):
+            self.window_pid = pid
+            try:
+                self.windows = self.find_windows(pid)
+            except Exception as e:
+                print(f"Error looking up game windows: {e}")
+                self.windows = []
+        return self.windows
+
+    def add_sample(self, process, now, cpu):
+        """Record a sample from the cached process handle; cpu comes from the activity monitor"""
+        self.next_sample_time = now + self.SAMPLE_EVERY
+        try:
+            rss = process.memory_info().rss
+            responding = is_responding(process, self.windows_for(process.pid))
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return
+        self.samples.append(RiskSample(now, rss, cpu, responding))
+        self.assessment = None
+
+    def assess(self):
+        """Assess the buffered samples, reusing the result until the next sample arrives"""
+        if self.assessment is None:
+            self.assessment = assess_risk(list(self.samples), zero_cpu_evidence=self.ZERO_CPU_EVIDENCE)
+        return self.assessment
+
+
+def find_top_level_windows(pid):
+    """Visible top-level window handles owned by pid (Windows only)"""
+    import ctypes
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+    found = []
+    owner = wintypes.DWORD()
+
+    def on_window(hwnd, lparam):
+        if user32.IsWindowVisible(hwnd):
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+            if owner.value == pid:
+                found.append(hwnd)
+        return True
+
+    user32.EnumWindows(ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)(on_window), 0)
+    return found
+
+
+def win32_window_exists(hwnd):
+    import ctypes
+    return bool(ctypes.windll.user32.IsWindow(hwnd))
+
+
+def is_responding(process, windows=()):
+    """Best-effort check that the game isn't stopped or showing 'Not Responding'"""
+    if process.status() in (psutil.STATUS_STOPPED, psutil.STATUS_ZOMBIE):
+        return False
+    if sys.platform == "win32" and windows:
+        import ctypes
+        user32 = ctypes.windll.user32
+        return not any(user32.IsHungAppWindow(hwnd) for hwnd in windows)
+    return True
+
+
+def memory_growth_rate(samples):
+    """Least-squares slope of RSS over time, in bytes per second"""
+    if len(samples) < 2:
+        return 0.0
+    count = len(samples)
+    mean_t = sum(s.time for s in samples) / count
+    mean_rss = sum(s.rss for s in samples) / count
+    variance = sum((s.time - mean_t) ** 2 for s in samples)
+    if variance == 0:
+        return 0.0
+    return sum((s.time - mean_t) * (s.rss - mean_rss) for s in samples) / variance
+
+
+def assess_risk(samples, rss_low=2048 * MB, rss_high=6144 * MB, growth_high=512 * MB / 3600,
+                hung_samples=3, min_trend_samples=8, zero_cpu_evidence=False):
+    """Score crash risk from 0 to 1 and decide whether the game looks hung.
+
+    Risk rises with absolute memory use between rss_low and rss_high, with sustained
+    memory growth up to growth_high bytes/s, and with recent unresponsive samples.
+    The game counts as hung when the last hung_samples samples were all unresponsive.
+    Zero CPU alone never counts (an idle or paused game legitimately sits at 0%); with
+    zero_cpu_evidence it only confirms a hang when the latest sample is unresponsive too.
+    """
+    if not samples:
+        return RiskAssessment(0.0, False)
+
+    latest = samples[-1]
+    rss_risk = min(1.0, max(0.0, (latest.rss - rss_low) / (rss_high - rss_low)))
+
+    growth_risk = 0.0
+    if len(samples) >= min_trend_samples:
+        growth_risk = min(1.0, max(0.0, memory_growth_rate(samples) / growth_high))
+
+    recent = samples[-hung_samples:]
+    stall_risk = sum(1 for s in recent if not s.responding) / len(recent)
+    hung = len(recent) == hung_samples and (
+        all(not s.responding for s in recent)
+        or (zero_cpu_evidence and not latest.responding and all(s.cpu == 0 for s in recent)))
+
+    return RiskAssessment(max(rss_risk, growth_risk, stall_risk), hung)
+
+
+def adapted_interval_factor(risk, max_reduction=0.75):
+    """Fraction of the scheduled interval to wait at a given risk level"""
+    return 1.0 - min(1.0, max(0.0, risk)) * max_reduction
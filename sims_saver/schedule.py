@@ -0,0 +1,301 @@
+# sims_saver/schedule.py
+
+import bisect
+import re
+import time
+from datetime import datetime, timedelta
+
+from sims_saver.suspend import MISSED_SKIP, MISSED_FIRE_ONCE
+
+DAY_SECONDS = 86400
+WEEK_SECONDS = 7 * DAY_SECONDS
+
+DAY_NAMES = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+DAY_GROUPS = {
+    "daily": set(range(7)),
+    "weekdays": set(range(5)),
+    "weekends": {5, 6},
+}
+UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600}
+
+RULE_PATTERN = re.compile(
+    r"^every\s+(?P<amount>\d+)\s*(?P<unit>[smh])"
+    r"(?:\s+(?P<start>\d{1,2}:\d{2})-(?P<end>\d{1,2}:\d{2}))?"
+    r"(?:\s+(?P<days>[a-z,]+))?$")
+
+
+class ScheduleRule:
+    """Fire every `period` seconds inside a daily time window on the given weekdays"""
+
+    __slots__ = ("period", "start", "end", "days", "text")
+
+    def __init__(self, period, start=0, end=DAY_SECONDS, days=None, text=""):
+        if period < 1:
+            raise ValueError("period must be at least one second")
+        self.period = period
+        self.start = start  # seconds after local midnight
+        self.end = end      # may be <= start for windows that cross midnight
+        self.days = set(range(7)) if days is None else set(days)
+        self.text = text
+
+    @classmethod
+    def parse(cls, text):
+        """Parse a rule such as 'every 5m 19:00-23:00' or 'every 10m weekends'"""
+        match = RULE_PATTERN.match(text.strip().lower())
+        if not match:
+            raise ValueError(f"Invalid schedule rule: {text!r}")
+
+        period = int(match.group("amount")) * UNIT_SECONDS[match.group("unit")]
+        start, end = 0, DAY_SECONDS
+        if match.group("start"):
+            start = parse_clock(match.group("start"))
+            end = parse_clock(match.group("end"))
+
+        days = None
+        if match.group("days"):
+            days = set()
+            for part in match.group("days").split(","):
+                if part in DAY_GROUPS:
+                    days |= DAY_GROUPS[part]
+                elif part[:3] in DAY_NAMES:
+                    days.add(DAY_NAMES.index(part[:3]))
+                else:
+                    raise ValueError(f"Invalid day {part!r} in schedule rule {text!r}")
+
+        return cls(period, start, end, days, text.strip())
+
+    def windows(self):
+        """Yield (start, end) week offsets covered by this rule"""
+        length = (self.end - self.start) % DAY_SECONDS or DAY_SECONDS
+        for day in sorted(self.days):
+            start = day * DAY_SECONDS + self.start
+            end = start + length
+            if end <= WEEK_SECONDS:
+                yield start, end
+            else:
+                # Sunday windows that run past midnight continue on Monday
+                yield start, WEEK_SECONDS
+                yield 0, end - WEEK_SECONDS
+
+
+def parse_clock(text):
+    """Convert 'HH:MM' to seconds after midnight"""
+    hours, minutes = (int(part) for part in text.split(":"))
+    if hours > 24 or minutes > 59 or (hours == 24 and minutes):
+        raise ValueError(f"Invalid time of day: {text!r}")
+    return hours * 3600 + minutes * 60
+
+
+class Schedule:
+    """Ordered schedule rules compiled into a sorted table of weekly segments.
+
+    The first rule covering an instant decides its period. Segment boundaries are local
+    wall-clock offsets from Monday 00:00, so windows follow DST changes, while periods
+    are added in real elapsed seconds. Looking up the segment for an instant is a bisect.
+    """
+
+    __slots__ = ("rules", "starts", "periods")
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.starts, self.periods = compile_segments(self.rules)
+
+    @classmethod
+    def every(cls, seconds):
+        """Schedule that fires at a fixed period around the clock"""
+        return cls([ScheduleRule(seconds, text=f"every {seconds}s")])
+
+    @classmethod
+    def parse(cls, lines):
+        """Build a schedule from rule strings, first match wins"""
+        return cls(ScheduleRule.parse(line) for line in lines)
+
+    def describe(self):
+        return "; ".join(rule.text for rule in self.rules)
+
+    def has_fire_windows(self):
+        return any(period is not None for period in self.periods)
+
+    def _segment_at(self, t):
+        """Return (period, start, end) of the segment containing epoch time t"""
+        monday = week_start(t)
+        offset = (datetime.fromtimestamp(t) - monday).total_seconds()
+        index = bisect.bisect_right(self.starts, offset) - 1
+        start = self.starts[index]
+        end = self.starts[index + 1] if index + 1 < len(self.starts) else WEEK_SECONDS
+        return self.periods[index], wall_to_epoch(monday, start), wall_to_epoch(monday, end)
+
+    def next_window_start(self, t):
+        """Return the first instant at or after t inside a firing segment, or None"""
+        if not self.has_fire_windows():
+            return None
+        # Two passes over the table are enough to wrap around the week
+        for _ in range(2 * len(self.starts) + 1):
+            period, start, end = self._segment_at(t)
+            if period is not None:
+                return max(t, start)
+            t = end
+        return None
+
+    def first_fire(self, now):
+        """Return when to fire when nothing has fired yet"""
+        return self.next_window_start(now)
+
+    def next_fire(self, last_fire):
+        """Return the exact next fire time after a fire at last_fire, or None if never"""
+        period, _, end = self._segment_at(last_fire)
+        if period is None:
+            return self.next_window_start(last_fire)
+
+        candidate = last_fire + period
+        for _ in range(2 * len(self.starts) + 1):
+            if candidate < end:
+                return candidate
+            next_period, next_start, next_end = self._segment_at(end)
+            if next_period is None:
+                return self.next_window_start(end)
+            # When the rule changes, use whichever period brings the next fire sooner
+            candidate = max(next_start, min(candidate, last_fire + next_period))
+            end = next_end
+        return candidate
+
+
+def compile_segments(rules):
+    """Flatten ordered rules into (segment starts, segment periods) over one week"""
+    boundaries = {0}
+    for rule in rules:
+        for start, end in rule.windows():
+            boundaries.add(start)
+            boundaries.add(end % WEEK_SECONDS)
+    boundaries = sorted(boundaries)
+
+    starts, periods = [], []
+    for index, start in enumerate(boundaries):
+        end = boundaries[index + 1] if index + 1 < len(boundaries) else WEEK_SECONDS
+        middle = (start + end) / 2
+        period = None
+        for rule in rules:
+            if any(w_start <= middle < w_end for w_start, w_end in rule.windows()):
+                period = rule.period
+                break
+        # Merge neighbouring segments that fire at the same period
+        if periods and periods[-1] == period:
+            continue
+        starts.append(start)
+        periods.append(period)
+    return starts, periods
+
+
+def week_start(t):
+    """Return local Monday 00:00 (naive datetime) of the week containing epoch time t"""
+    local = datetime.fromtimestamp(t)
+    return datetime(local.year, local.month, local.day) - timedelta(days=local.weekday())
+
+
+def wall_to_epoch(monday, offset):
+    """Convert a wall-clock offset from local Monday 00:00 to epoch seconds"""
+    return (monday + timedelta(seconds=offset)).timestamp()
+
+
+class ScheduleRunner:
+    """Computes how long to sleep until the next fire.
+
+    The last fire is remembered on the monotonic clock and mapped back to wall time on
+    every query, so a wall-clock jump shifts the past fire along with it instead of
+    causing an early or late press. Both clocks are injectable for virtual-clock tests.
+    """
+
+    # Counting missed fires stops here; a long suspend on a seconds-level schedule is simply "many"
+    MAX_MISSED_COUNT = 10000
+
+    __slots__ = ("schedule", "clock", "monotonic", "last_fire_mono", "pending_fire_mono", "interval_factor",
+                 "min_interval")
+
+    def __init__(self, schedule, clock=time.time, monotonic=time.monotonic):
+        self.schedule = schedule
+        self.clock = clock
+        self.monotonic = monotonic
+        self.last_fire_mono = None
+        self.pending_fire_mono = None  # one-off fire that takes precedence over the schedule
+        # Callers may shorten the scheduled gap to interval_factor of its length, but not below min_interval
+        self.interval_factor = 1.0
+        self.min_interval = 0.0
+
+    def mark_fired(self):
+        """Record a fire now; a pending fire_once press leaves the schedule grid where it was"""
+        now_mono = self.monotonic()
+        if self.pending_fire_mono is not None and self.last_fire_mono is not None:
+            self.last_fire_mono = self.latest_grid_fire(now_mono)
+        else:
+            self.last_fire_mono = now_mono
+        self.pending_fire_mono = None
+
+    def restart(self):
+        """Start counting from now, e.g. when the game has just started"""
+        self.last_fire_mono = self.monotonic()
+        self.pending_fire_mono = None
+
+    def latest_grid_fire(self, now_mono):
+        """Return (monotonic) the last scheduled fire at or before now_mono, counting from last_fire_mono"""
+        now = self.clock()
+        previous = now - (now_mono - self.last_fire_mono)
+        fire = self.schedule.next_fire(previous)
+        for _ in range(self.MAX_MISSED_COUNT):
+            if fire is None or fire > now:
+                break
+            previous, fire = fire, self.schedule.next_fire(fire)
+        return now_mono - (now - previous)
+
+    def handle_suspend(self, suspended, policy, grace=30.0):
+        """Account for `suspended` seconds during which the monotonic clock stood still.
+
+        Applies the missed-fire policy (see sims_saver.suspend) and returns how many
+        scheduled fires fell inside the suspend.
+        """
+        if self.last_fire_mono is None:
+            return 0  # nothing fired yet; the first fire is computed from the wall clock
+        self.last_fire_mono -= suspended
+        now_mono, now = self.monotonic(), self.clock()
+        previous = now - (now_mono - self.last_fire_mono)
+
+        missed = 0
+        fire = self.schedule.next_fire(previous)
+        while fire is not None and fire <= now:
+            missed += 1
+            if missed >= self.MAX_MISSED_COUNT:
+                previous = now
+                break
+            previous = fire
+            fire = self.schedule.next_fire(fire)
+        if not missed:
+            return 0  # a short nap; the shifted last fire already gives the right next fire
+
+        if policy == MISSED_SKIP:
+            self.last_fire_mono = now_mono
+        else:
+            # Continue on the grid as if the last missed fire had happened
+            self.last_fire_mono = now_mono - (now - previous)
+            if policy == MISSED_FIRE_ONCE:
+                self.pending_fire_mono = now_mono + grace
+        return missed
+
+    def next_fire_time(self):
+        """Return the next fire as epoch seconds, or None if the schedule never fires"""
+        now = self.clock()
+        if self.last_fire_mono is None:
+            return self.schedule.first_fire(now)
+        last_fire = now - (self.monotonic() - self.last_fire_mono)
+        next_fire = self.schedule.next_fire(last_fire)
+        if next_fire is not None and self.interval_factor < 1.0:
+            shortened = max(self.min_interval, (next_fire - last_fire) * self.interval_factor)
+            next_fire = min(next_fire, last_fire + shortened)
+        return next_fire
+
+    def seconds_until_next(self):
+        """Return seconds until the next fire (0 when due), or None if it never fires"""
+        if self.pending_fire_mono is not None:
+            return max(0.0, self.pending_fire_mono - self.monotonic())
+        next_fire = self.next_fire_time()
+        if next_fire is None:
+            return None
+        return max(0.0, next_fire - self.clock())
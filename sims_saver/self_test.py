@@ -0,0 +1,189 @@
+# sims_saver/self_test.py
+
+import multiprocessing
+import time
+from collections import Counter
+
+from pynput import keyboard
+
+from sims_saver.key_delivery import GlobalKeyDelivery, get_key_combo
+
+# (hold ms, gap ms) pairs tried by the sweep, gentlest first
+SWEEP_TIMINGS = [(0, 0), (10, 0), (10, 10), (30, 20), (50, 50), (100, 50)]
+
+
+def burn_cpu(stop_time):
+    """Synthetic load: spin one core until stop_time"""
+    while time.time() < stop_time:
+        pass
+
+
+class KeyRecorder:
+    """pynput Listener that timestamps every key event it sees"""
+
+    def __init__(self):
+        self.events = []  # (perf_counter time, "press" or "release", canonical key)
+        self.listener = keyboard.Listener(on_press=self.on_press, on_release=self.on_release)
+
+    def canonical(self, key):
+        return self.listener.canonical(key)
+
+    def on_press(self, key):
+        self.events.append((time.perf_counter(), "press", self.canonical(key)))
+
+    def on_release(self, key):
+        self.events.append((time.perf_counter(), "release", self.canonical(key)))
+
+    def start(self):
+        self.listener.start()
+        self.listener.wait()
+
+    def stop(self):
+        self.listener.stop()
+
+
+def expected_sequence(recorder, key):
+    """Return the key events one chord should produce, in order"""
+    modifiers, main_key = get_key_combo(key)
+    modifier_keys = [recorder.canonical(GlobalKeyDelivery.PYNPUT_KEYS[name]) for name in modifiers]
+    main = GlobalKeyDelivery.PYNPUT_KEYS.get(main_key) or keyboard.KeyCode.from_char(main_key)
+    main = recorder.canonical(main)
+    return ([("press", k) for k in modifier_keys] + [("press", main), ("release", main)]
+            + [("release", k) for k in reversed(modifier_keys)])
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def analyze(events, send_times, expected, settle=1.0):
+    """Match recorded events to chords in order and score delivery.
+
+    Key events carry no chord identity and delivery can lag by more than the chord
+    spacing under load, so the nth main-key press belongs to the nth chord still
+    waiting for one, as long as it arrives within `settle` of that chord's send. A
+    chord with no such press is dropped; presses left over are duplicates (a drop and a
+    duplicate in the same run can cancel out, so either makes the run unclean). The key
+    events are then read as consecutive chords: a chunk with the expected events in
+    the wrong order is reordered. A modifier is stuck when it has more presses than
+    releases at the end.
+    """
+    main_press = expected[len(expected) // 2 - 1]
+    # Anything before the first chord was sent is the user's typing, not ours
+    first_send = send_times[0] if send_times else float("inf")
+    press_times = [t for t, kind, key in events if (kind, key) == main_press and t >= first_send]
+
+    latencies, dropped, duplicated = [], 0, 0
+    next_press = 0
+    for send_time in send_times:
+        # Presses from before this chord was sent that no chord took are extra copies
+        while next_press < len(press_times) and press_times[next_press] < send_time:
+            duplicated += 1
+            next_press += 1
+        if next_press < len(press_times) and press_times[next_press] - send_time <= settle:
+            latencies.append(press_times[next_press] - send_time)
+            next_press += 1
+        else:
+            dropped += 1
+    duplicated += len(press_times) - next_press
+
+    expected_keys = {key for _, key in expected}
+    stream = [(kind, key) for t, kind, key in events if key in expected_keys and t >= first_send]
+    reordered = 0
+    position = 0
+    while position + len(expected) <= len(stream):
+        chunk = stream[position:position + len(expected)]
+        if chunk == expected or Counter(chunk) == Counter(expected):
+            reordered += chunk != expected
+            position += len(expected)
+        else:
+            position += 1  # a dropped or doubled event; slide until the chords line up again
+
+    modifiers = {key for kind, key in expected if kind == "press" and (kind, key) != main_press}
+    balance = {}
+    for _, kind, key in events:
+        if key in modifiers:
+            balance[key] = balance.get(key, 0) + (1 if kind == "press" else -1)
+    latencies.sort()
+    return {
+        "sent": len(send_times),
+        "dropped": dropped,
+        "duplicated": duplicated,
+        "reordered": reordered,
+        "stuck_modifiers": [str(key) for key, count in balance.items() if count > 0],
+        "latency_p50_ms": ms(percentile(latencies, 0.50)),
+        "latency_p90_ms": ms(percentile(latencies, 0.90)),
+        "latency_p99_ms": ms(percentile(latencies, 0.99)),
+        "latency_max_ms": ms(latencies[-1] if latencies else None),
+    }
+
+
+def ms(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+def run_self_test(key, count=50, hold_ms=0, gap_ms=0, spacing=0.1, load_processes=0):
+    """Fire `count` chords with the real injector while a Listener records what arrives"""
+    recorder = KeyRecorder()
+    expected = expected_sequence(recorder, key)
+    delivery = GlobalKeyDelivery(hold=hold_ms / 1000, gap=gap_ms / 1000)
+
+    load = []
+    if load_processes:
+        stop_time = time.time() + count * (spacing + (hold_ms + gap_ms) / 1000) + 5
+        load = [multiprocessing.Process(target=burn_cpu, args=(stop_time,), daemon=True)
+                for _ in range(load_processes)]
+        for process in load:
+            process.start()
+
+    recorder.start()
+    send_times = []
+    try:
+        for _ in range(count):
+            send_times.append(time.perf_counter())
+            delivery.deliver(key)
+            time.sleep(spacing)
+        time.sleep(1.0)  # let stragglers arrive
+    finally:
+        recorder.stop()
+        for process in load:
+            process.terminate()
+
+    result = analyze(recorder.events, send_times, expected)
+    result.update(key=key, hold_ms=hold_ms, gap_ms=gap_ms, load_processes=load_processes)
+    return result
+
+
+def sweep_timings(key, count=30, load_processes=0, timings=SWEEP_TIMINGS):
+    """Try hold/gap pairs from gentlest up; return (results, first clean pair or None)"""
+    results = []
+    for hold_ms, gap_ms in timings:
+        result = run_self_test(key, count, hold_ms, gap_ms, load_processes=load_processes)
+        results.append(result)
+        if is_clean(result):
+            return results, (hold_ms, gap_ms)
+    return results, None
+
+
+def is_clean(result):
+    return not (result["dropped"] or result["duplicated"] or result["reordered"] or result["stuck_modifiers"])
+
+
+def format_result(result):
+    def fmt(value):
+        return "-" if value is None else f"{value:.1f}"
+    return (f"{result['key']} hold {result['hold_ms']} ms, gap {result['gap_ms']} ms, "
+            f"load {result['load_processes']}: sent {result['sent']}, dropped {result['dropped']}, "
+            f"duplicated {result['duplicated']}, reordered {result['reordered']}, "
+            f"stuck modifiers {', '.join(result['stuck_modifiers']) or 'none'}; latency ms "
+            f"p50 {fmt(result['latency_p50_ms'])} p90 {fmt(result['latency_p90_ms'])} "
+            f"p99 {fmt(result['latency_p99_ms'])} max {fmt(result['latency_max_ms'])}")
+
+
+def countdown(seconds=3):
+    print("Keys are sent to the focused window. Focus a harmless window such as an empty text editor.")
+    for remaining in range(seconds, 0, -1):
+        print(f"Starting in {remaining}...")
+        time.sleep(1)
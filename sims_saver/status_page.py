@@ -0,0 +1,312 @@
+# sims_saver/status_page.py
+"""Fixed-layout status record shared with overlays and monitors through a memory-mapped file.
+
+Only the standard library is used here, so readers can copy this module on its own.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+MAGIC = b"SSST"
+LAYOUT_VERSION = 2
+
+# magic, layout version, seq (odd while a write is in progress), writer pid
+HEADER = struct.Struct("<4sI Q I")
+# state, last result, last error, game pid, next fire (monotonic, wall), last press (wall),
+# updated (wall), presses, failures, deferred, skipped, confirmed
+RECORD = struct.Struct("<B B H I d d d d Q Q Q Q Q")
+PAGE_SIZE = HEADER.size + RECORD.size
+
+STATE_STOPPED = 0
+STATE_WAITING_FOR_GAME = 1
+STATE_ARMED = 2
+STATE_PRESSING = 3
+STATE_DEFERRING = 4
+STATE_ERROR = 5
+STATE_NAMES = ["stopped", "waiting_for_game", "armed", "pressing", "deferring", "error"]
+
+RESULT_NONE = 0
+RESULT_PRESSED = 1
+RESULT_FAILED = 2
+RESULT_SKIPPED = 3
+RESULT_NAMES = ["none", "pressed", "failed", "skipped"]
+
+ERROR_NONE = 0
+ERROR_PRESS_FAILED = 1
+ERROR_GAME_NOT_RESPONDING = 2
+ERROR_LOOP_EXCEPTION = 3
+ERROR_NAMES = ["none", "press_failed", "game_not_responding", "loop_exception"]
+
+# The engine's status keys, mapped to the coarse state external readers see
+STATUS_KEY_STATES = {
+    "status_running": STATE_ARMED,
+    "status_running_waiting": STATE_ARMED,
+    "status_test_mode_waiting": STATE_ARMED,
+    "status_key_pressed_success": STATE_ARMED,
+    "status_key_press_failed": STATE_ARMED,
+    "status_game_not_responding": STATE_ARMED,
+    "status_resumed_from_sleep": STATE_ARMED,
+    "status_profile_activated": STATE_WAITING_FOR_GAME,
+    "status_waiting_for_process": STATE_WAITING_FOR_GAME,
+    "status_game_detected_pressing": STATE_PRESSING,
+    "status_test_mode_pressing": STATE_PRESSING,
+    "status_game_busy_deferring": STATE_DEFERRING,
+    "status_error_occurred": STATE_ERROR,
+}
+
+# A running engine refreshes the page at least this often, even when nothing changed
+HEARTBEAT_SECONDS = 10.0
+# Readers treat a page that isn't stopped but hasn't been refreshed for this long as stale
+STALE_AFTER_SECONDS = 90.0
+# Past two missed heartbeats, readers also check that the writer process still exists
+PID_CHECK_AFTER_SECONDS = 2 * HEARTBEAT_SECONDS
+
+
+def default_status_path():
+    """Return the default status page location in the app's per-user data folder.
+
+    Same folder as sims_saver.app_dirs.user_data_dir(), worked out here so this module
+    has no package imports.
+    """
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA")
+        base = Path(base) if base else Path.home() / "AppData" / "Local"
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share")
+    return base / "SimsSaver" / "status.bin"
+
+
+def pid_alive(pid):
+    """True if a process with this pid exists"""
+    if pid <= 0:
+        return False
+    if sys.platform == "win32":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            return bool(kernel32.GetExitCodeProcess(handle, ctypes.byref(code))) and code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by someone else
+    return True
+
+
+class StatusRecord:
+    """Mutable staging copy of the record; the writer publishes it as a whole.
+
+    `writer_pid` and `stale` are filled in by the reader and are not part of the record.
+    """
+
+    FIELDS = ("state", "last_result", "last_error", "pid", "next_fire_mono", "next_fire_wall",
+              "last_press_wall", "updated_wall", "presses", "failures", "deferred", "skipped", "confirmed")
+    __slots__ = FIELDS + ("writer_pid", "stale")
+
+    def __init__(self, *values):
+        values = values or (STATE_STOPPED, RESULT_NONE, ERROR_NONE, 0, 0.0, 0.0, 0.0, 0.0, 0, 0, 0, 0, 0)
+        for name, value in zip(self.FIELDS, values):
+            setattr(self, name, value)
+        self.writer_pid = 0
+        self.stale = False
+
+    def values(self):
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def as_dict(self):
+        """Readable form, with time-to-next-fire worked out on this machine's monotonic clock"""
+        result = dict(zip(self.FIELDS, self.values()))
+        result["writer_pid"] = self.writer_pid
+        result["stale"] = self.stale
+        result["state"] = name_of(STATE_NAMES, self.state)
+        result["last_result"] = name_of(RESULT_NAMES, self.last_result)
+        result["last_error"] = name_of(ERROR_NAMES, self.last_error)
+        result["seconds_until_next"] = (max(0.0, self.next_fire_mono - time.monotonic())
+                                        if self.next_fire_mono else None)
+        return result
+
+
+def name_of(names, code):
+    return names[code] if code < len(names) else str(code)
+
+
+class StatusPageWriter:
+    """Single writer that publishes StatusRecords with a seqlock.
+
+    The sequence number is made odd before the record is written and even afterwards;
+    readers retry when they see an odd number or a change across their copy.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or default_status_path())
+        self.seq = 0
+        self.pid = os.getpid()
+        self.last_record = None
+        self._file = None
+        self._map = None
+
+    def open(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = os.fdopen(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644), "r+b")
+            if os.fstat(self._file.fileno()).st_size != PAGE_SIZE:
+                # Resizing a file that readers still map fails on Windows, so only do it once
+                self._file.truncate(PAGE_SIZE)
+            self._map = mmap.mmap(self._file.fileno(), PAGE_SIZE)
+        except (OSError, ValueError) as e:
+            print(f"Error opening status page {self.path}: {e}")
+            self.close()
+            return False
+        self.seq = 0
+        HEADER.pack_into(self._map, 0, MAGIC, LAYOUT_VERSION, self.seq, self.pid)
+        self.write(StatusRecord())
+        return True
+
+    def close(self):
+        """Publish STOPPED, so readers don't keep seeing the last state after exit"""
+        if self._map is not None and self.last_record is not None:
+            record = StatusRecord(*self.last_record.values())
+            record.state = STATE_STOPPED
+            record.next_fire_mono = record.next_fire_wall = 0.0
+            self.write(record)
+        page, self._map = self._map, None
+        if page is not None:
+            page.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write(self, record):
+        """Publish a record; a few microseconds and no syscalls"""
+        if self._map is None:
+            return
+        record.updated_wall = time.time()
+        self.last_record = record
+        page = self._map
+        self.seq += 1
+        HEADER.pack_into(page, 0, MAGIC, LAYOUT_VERSION, self.seq, self.pid)
+        RECORD.pack_into(page, HEADER.size, *record.values())
+        self.seq += 1
+        HEADER.pack_into(page, 0, MAGIC, LAYOUT_VERSION, self.seq, self.pid)
+
+
+class StatusPageReader:
+    """Polls a status page; after the first open every read is a plain memory copy"""
+
+    RETRIES = 100
+
+    def __init__(self, path=None):
+        self.path = Path(path or default_status_path())
+        self._map = None
+
+    def open(self):
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), PAGE_SIZE, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def read(self):
+        """Return a consistent StatusRecord, or None if the page isn't readable yet.
+
+        A record whose writer has exited or stopped refreshing it without publishing
+        STOPPED (a crash, a kill, a power cut) comes back with `stale` set.
+        """
+        if self._map is None:
+            try:
+                self.open()
+            except (OSError, ValueError):
+                return None
+        page = self._map
+        for _ in range(self.RETRIES):
+            magic, version, seq, writer_pid = HEADER.unpack_from(page, 0)
+            if magic != MAGIC or version != LAYOUT_VERSION:
+                return None
+            if seq & 1:
+                continue
+            values = RECORD.unpack_from(page, HEADER.size)
+            if HEADER.unpack_from(page, 0)[2] == seq:
+                record = StatusRecord(*values)
+                record.writer_pid = writer_pid
+                if record.state != STATE_STOPPED:
+                    # The heartbeat alone shows a live writer; only an overdue page costs a pid check
+                    age = time.time() - record.updated_wall
+                    record.stale = age > STALE_AFTER_SECONDS or (
+                        age > PID_CHECK_AFTER_SECONDS and not pid_alive(writer_pid))
+                return record
+        return None
+
+
+def read_status(path=None):
+    """One-shot read of the status page"""
+    reader = StatusPageReader(path)
+    try:
+        return reader.read()
+    finally:
+        reader.close()
+
+
+def format_status(record):
+    status = record.as_dict()
+    if record.stale:
+        age = max(0.0, time.time() - record.updated_wall)
+        lines = [f"State: not running (last seen {status['state']} {age:.0f} s ago)"]
+    else:
+        lines = [f"State: {status['state']}"]
+    if status["seconds_until_next"] is not None and record.state != STATE_STOPPED and not record.stale:
+        lines.append(f"Next save in: {status['seconds_until_next']:.0f} s")
+    lines.append(f"Last result: {status['last_result']}")
+    if record.last_error:
+        lines.append(f"Last error: {status['last_error']}")
+    lines.append(f"Presses: {record.presses} (failed {record.failures}, deferred {record.deferred}, "
+                 f"skipped {record.skipped}, confirmed {record.confirmed})")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the Sims Saver status page")
+    parser.add_argument("--path", help="status page file (default: status.bin in the per-user data folder)")
+    parser.add_argument("--json", action="store_true", help="print the record as JSON")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="keep printing every SECONDS")
+    args = parser.parse_args()
+
+    reader = StatusPageReader(args.path)
+    try:
+        while True:
+            record = reader.read()
+            if record is None:
+                print("No status available; is Sims Saver running?")
+            elif args.json:
+                print(json.dumps(record.as_dict()))
+            else:
+                print(format_status(record))
+            if not args.watch:
+                return 0 if record is not None and not record.stale else 1
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,60 @@
+# sims_saver/suspend.py
+
+import sys
+import time
+
+# What to do with fires that fell inside a suspend
+MISSED_SKIP = "skip"            # drop them; the next fire is a full period after resume
+MISSED_FIRE_ONCE = "fire_once"  # fire once after a grace delay, then continue on the grid
+MISSED_REALIGN = "realign"      # drop them and continue on the original grid
+MISSED_FIRE_POLICIES = [MISSED_SKIP, MISSED_FIRE_ONCE, MISSED_REALIGN]
+
+
+def default_clocks():
+    """Return (awake clock, boot clock): the first stops while suspended, the second keeps counting"""
+    if sys.platform.startswith("linux") and hasattr(time, "CLOCK_BOOTTIME"):
+        return time.monotonic, lambda: time.clock_gettime(time.CLOCK_BOOTTIME)
+    if sys.platform == "darwin" and hasattr(time, "CLOCK_UPTIME_RAW"):
+        return (lambda: time.clock_gettime(time.CLOCK_UPTIME_RAW),
+                lambda: time.clock_gettime(time.CLOCK_MONOTONIC))
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.GetTickCount64.restype = ctypes.c_ulonglong
+            unbiased = ctypes.c_ulonglong()
+
+            def awake_clock():
+                # Interrupt time in 100 ns units, excluding time spent asleep
+                kernel32.QueryUnbiasedInterruptTime(ctypes.byref(unbiased))
+                return unbiased.value / 1e7
+
+            return awake_clock, lambda: kernel32.GetTickCount64() / 1000.0
+        except Exception as e:
+            print(f"Error setting up suspend clocks: {e}")
+    # No boot clock: a forward wall-clock jump is indistinguishable from a suspend here
+    return time.monotonic, time.time
+
+
+class SuspendDetector:
+    """Notices system suspends by comparing a clock that stops while asleep with one that doesn't"""
+
+    # Gaps shorter than this are scheduling noise, not a suspend
+    MIN_GAP = 5.0
+
+    def __init__(self, awake_clock=None, boot_clock=None):
+        default_awake, default_boot = default_clocks()
+        self.awake_clock = awake_clock or default_awake
+        self.boot_clock = boot_clock or default_boot
+        self.reset()
+
+    def reset(self):
+        self.last_awake = self.awake_clock()
+        self.last_boot = self.boot_clock()
+
+    def check(self):
+        """Return seconds spent suspended since the last check, or 0.0"""
+        awake, boot = self.awake_clock(), self.boot_clock()
+        gap = (boot - self.last_boot) - (awake - self.last_awake)
+        self.last_awake, self.last_boot = awake, boot
+        return gap if gap >= self.MIN_GAP else 0.0
@@ -0,0 +1,57 @@
+import os
+import threading
+
+from sims_saver.backup import BackupStage, read_manifest
+from sims_saver.post_save import PostSaveTrigger
+
+
+def make_stage(tmp_path, **options):
+    save_dir = tmp_path / "saves"
+    save_dir.mkdir(exist_ok=True)
+    stage = BackupStage(save_dir, tmp_path / "store", chunk_size=1024, **options)
+    stage.SETTLE_SECONDS = 0.01
+    return stage
+
+
+def run(stage):
+    stage.run(PostSaveTrigger(0.0, None, None), threading.Event())
+
+
+def test_backup_dedups_chunks_and_restores(tmp_path):
+    stage = make_stage(tmp_path)
+    slot = stage.save_dir / "Slot_00000001.save"
+    original = os.urandom(10 * 1024 + 100)
+    slot.write_bytes(original)
+    run(stage)
+    chunk_count = len(list(stage.chunk_dir.glob("*/*.z")))
+    assert chunk_count == 11
+
+    # Only the chunk that changed is stored again
+    changed = original[:5000] + b"x" + original[5001:]
+    slot.write_bytes(changed)
+    os.utime(slot, ns=(0, os.stat(slot).st_mtime_ns + 1000))
+    run(stage)
+    assert len(list(stage.chunk_dir.glob("*/*.z"))) == chunk_count + 1
+
+    manifests = stage.manifests(slot.name)
+    assert len(manifests) == 2
+    restored = tmp_path / "restored.save"
+    stage.restore(manifests[0], restored)
+    assert restored.read_bytes() == original
+    stage.restore(manifests[1], restored)
+    assert restored.read_bytes() == changed
+
+
+def test_retention_keeps_newest_versions_and_collects_chunks(tmp_path):
+    now = [1000000.0]
+    stage = make_stage(tmp_path, keep_versions=2, clock=lambda: now[0])
+    slot = stage.save_dir / "Slot_00000001.save"
+    for version in range(4):
+        slot.write_bytes(bytes([version]) * 2048)
+        os.utime(slot, ns=(0, (version + 1) * 10 ** 9))
+        now[0] += 60
+        run(stage)
+    manifests = stage.manifests(slot.name)
+    assert len(manifests) == 2
+    referenced = {digest for path in manifests for digest in read_manifest(path)["chunks"]}
+    assert {path.stem for path in stage.chunk_dir.glob("*/*.z")} == referenced
@@ -0,0 +1,71 @@
+import sys
+import time
+
+from sims_saver.diagnostics import StallWatchdog, collapse_stack
+
+
+class FakeRoot:
+    """Stands in for Tk: the pending after() callback only runs when the test calls it"""
+
+    def __init__(self):
+        self.pending = None
+
+    def after(self, delay_ms, callback):
+        self.pending = callback
+        return "after#1"
+
+    def after_cancel(self, after_id):
+        self.pending = None
+
+
+def blocking_call(seconds):
+    time.sleep(seconds)
+
+
+def test_stall_stack_is_captured_and_reported_once(capsys):
+    root = FakeRoot()
+    watchdog = StallWatchdog(root, threshold=0.05, heartbeat_interval=0.01)
+    watchdog.start()
+    try:
+        blocking_call(0.3)  # the main thread can't beat while this runs
+        assert watchdog.stall_count == 1
+        assert "blocking_call" in watchdog.stall_stack
+        root.pending()
+    finally:
+        watchdog.stop()
+    assert watchdog.stall_stack is None
+    assert watchdog.max_latency >= 0.2
+    assert "blocking_call" in capsys.readouterr().out
+
+
+class ClearProbe:
+    """stall_stack descriptor that records how overdue the heartbeat looks whenever it is set"""
+
+    def __init__(self):
+        self.overdue_when_set = []
+
+    def __get__(self, instance, owner):
+        return instance.__dict__.get("stall_stack") if instance is not None else self
+
+    def __set__(self, instance, value):
+        self.overdue_when_set.append(time.monotonic() - instance.last_beat)
+        instance.__dict__["stall_stack"] = value
+
+
+def test_beat_marks_the_loop_alive_before_clearing_the_stack():
+    probe = ClearProbe()
+
+    class ProbedWatchdog(StallWatchdog):
+        stall_stack = probe
+
+    watchdog = ProbedWatchdog(FakeRoot(), threshold=0.05, heartbeat_interval=0.01)
+    watchdog.stall_stack = "captured stack"
+    watchdog.last_beat = time.monotonic() - 1.0
+    watchdog._beat()
+    # A watcher looking between the clear and the update would have seen a 1 s stall
+    assert probe.overdue_when_set[-1] < 0.05
+
+
+def test_collapse_stack_runs_outer_to_inner():
+    stack = collapse_stack(sys._getframe())
+    assert stack.split(";")[-1].startswith("test_collapse_stack_runs_outer_to_inner@")
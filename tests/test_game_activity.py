@@ -0,0 +1,126 @@
+from collections import namedtuple
+
+import pytest
+
+from sims_saver import game_activity
+from sims_saver.game_activity import (ACTIVITY_IDLE, ACTIVITY_LOADING, ACTIVITY_SAVING, ACTIVITY_UNKNOWN,
+                                      GameActivityMonitor, classify_activity)
+
+MB = 1024 * 1024
+IoCounters = namedtuple("IoCounters", ["read_bytes", "write_bytes"])
+
+
+class VirtualClock:
+    """Stands in for the time module inside game_activity"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = VirtualClock()
+    monkeypatch.setattr(game_activity, "time", clock)
+    return clock
+
+
+class FakeGame:
+    """Disk I/O as (start, end, read rate, write rate) bursts on the virtual clock"""
+
+    def __init__(self, clock, bursts=(), cpu=20.0):
+        self.clock = clock
+        self.bursts = list(bursts)
+        self.cpu = cpu
+
+    def io_counters(self):
+        read = write = 0.0
+        for start, end, read_rate, write_rate in self.bursts:
+            elapsed = min(max(0.0, self.clock.now - start), end - start)
+            read += elapsed * read_rate
+            write += elapsed * write_rate
+        return IoCounters(int(read), int(write))
+
+    def cpu_percent(self, interval=None):
+        return self.cpu
+
+
+def attached(clock, game):
+    monitor = GameActivityMonitor()
+    monitor.attach(game)
+    return monitor
+
+
+@pytest.mark.parametrize("read_rate, write_rate, cpu, state", [
+    (0, 0, 5.0, ACTIVITY_IDLE),
+    (0, 4 * MB, 5.0, ACTIVITY_SAVING),
+    (10 * MB, 0, 5.0, ACTIVITY_LOADING),
+    (3 * MB, 0, 100.0, ACTIVITY_LOADING),    # moderate reads on a pegged core
+    (3 * MB, 0, 20.0, ACTIVITY_IDLE),        # the same reads while playing
+    (10 * MB, 4 * MB, 100.0, ACTIVITY_SAVING),
+])
+def test_classify_activity(read_rate, write_rate, cpu, state):
+    assert classify_activity(read_rate, write_rate, cpu, 8 * MB, 2 * MB, 90.0) == state
+
+
+def test_rates_need_a_baseline(clock):
+    monitor = GameActivityMonitor()
+    assert monitor.sample() == ACTIVITY_UNKNOWN
+    monitor.attach(FakeGame(clock, [(1000.0, 2000.0, 0, 50 * MB)]))
+    assert monitor.state == ACTIVITY_UNKNOWN
+    clock.sleep(1)
+    assert monitor.sample() == ACTIVITY_SAVING
+
+
+def test_samples_closer_than_the_minimum_spacing_reuse_the_state(clock):
+    game = FakeGame(clock)
+    monitor = attached(clock, game)
+    clock.sleep(1)
+    assert monitor.sample() == ACTIVITY_IDLE
+    game.bursts.append((clock.now, clock.now + 10, 0, 50 * MB))
+    clock.sleep(0.1)
+    assert monitor.sample() == ACTIVITY_IDLE
+    clock.sleep(0.5)
+    assert monitor.sample() == ACTIVITY_SAVING
+
+
+def test_quiet_game_is_pressed_right_away(clock):
+    monitor = attached(clock, FakeGame(clock))
+    clock.sleep(15)
+    start = clock.now
+    assert monitor.wait_until_quiet(30, lambda: True) is None
+    assert clock.now - start < 1
+
+
+def test_burst_that_just_started_is_not_averaged_away(clock):
+    # 13 s of quiet since the last (risk) sample, then a loading screen streams at 50 MB/s
+    game = FakeGame(clock, [(1013.0, 1020.0, 50 * MB, 0)])
+    monitor = attached(clock, game)
+    clock.sleep(15)
+    deferrals = []
+    assert monitor.wait_until_quiet(30, lambda: True, on_defer=lambda: deferrals.append(clock.now)) == ACTIVITY_LOADING
+    assert len(deferrals) == 1
+    # The press waits for the burst to end, not for the whole 30 s
+    assert 1020.0 <= clock.now < 1021.0
+    assert monitor.deferred_presses == 1
+
+
+def test_busy_game_is_pressed_after_max_delay(clock):
+    monitor = attached(clock, FakeGame(clock, [(1000.0, 5000.0, 0, 50 * MB)]))
+    clock.sleep(1)
+    start = clock.now
+    assert monitor.wait_until_quiet(30, lambda: True) == ACTIVITY_SAVING
+    assert clock.now - start == pytest.approx(30.25)
+
+
+def test_stop_ends_the_wait(clock):
+    monitor = attached(clock, FakeGame(clock, [(1000.0, 5000.0, 0, 50 * MB)]))
+    clock.sleep(1)
+    stop_at = clock.now + 5
+    monitor.wait_until_quiet(30, lambda: clock.now < stop_at)
+    assert clock.now < stop_at + 1
@@ -0,0 +1,66 @@
+import json
+
+from sims_saver.game_catalog import DEFAULT_PROFILE_ID, GameCatalog, GameProfile
+
+# Two games shipping the same executable name, told apart by install path and launcher
+CATALOG = GameCatalog(1, [
+    GameProfile("space-game", "Space Game", ["Game.exe"], path_fragments=["Space Game"],
+                launchers=["steam.exe"], key="f5"),
+    GameProfile("farm-game", "Farm Game", ["game.exe", "farm.exe"], path_fragments=["farm game"],
+                launchers=["EADesktop.exe"], key="f9"),
+    GameProfile("solo-game", "Solo Game", ["solo.exe"]),
+])
+
+
+def identify(name, exe_path=None, parent_name=None):
+    profile = CATALOG.identify(name, exe_path, parent_name)
+    return profile.id if profile else None
+
+
+def test_unique_name_needs_no_tie_break():
+    assert identify("farm.exe") == "farm-game"
+    assert identify("SOLO.EXE", "D:/Anything/solo.exe") == "solo-game"
+
+
+def test_unknown_name():
+    assert identify("notepad.exe") is None
+    assert identify("notepad.exe", "C:\\Windows\\notepad.exe", "explorer.exe") is None
+
+
+def test_path_fragment_picks_between_same_named_games():
+    assert identify("game.exe", "C:\\Program Files\\Steam\\steamapps\\common\\Space Game\\Game.exe") == "space-game"
+    assert identify("Game.exe", "/home/me/Games/Farm Game/game.exe") == "farm-game"
+
+
+def test_path_matching_no_fragment_rules_the_name_out():
+    assert identify("game.exe", "C:\\Games\\Something Else\\game.exe") is None
+
+
+def test_launcher_breaks_a_tie_when_the_path_is_unknown():
+    # No path (access denied): both profiles fit, so the parent decides
+    assert identify("game.exe", None, "eadesktop.exe") == "farm-game"
+    assert identify("game.exe", None, "Steam.exe") == "space-game"
+
+
+def test_without_path_or_known_launcher_the_first_profile_wins():
+    assert identify("game.exe") == "space-game"
+    assert identify("game.exe", None, "explorer.exe") == "space-game"
+
+
+def test_bundled_catalog_loads():
+    catalog = GameCatalog.load()
+    assert catalog.version >= 1
+    assert catalog.get(DEFAULT_PROFILE_ID) is not None
+    profile = catalog.identify("TS4_x64.exe", "C:\\Program Files\\EA Games\\The Sims 4\\Game\\Bin\\TS4_x64.exe",
+                               "EADesktop.exe")
+    assert profile.id == DEFAULT_PROFILE_ID
+
+
+def test_unreadable_catalog_is_empty(tmp_path, capsys):
+    assert GameCatalog.load(tmp_path / "missing.json").profiles == []
+    broken = tmp_path / "broken.json"
+    broken.write_text(json.dumps({"version": 2, "games": [{"id": "no-title"}]}))
+    catalog = GameCatalog.load(broken)
+    assert catalog.profiles == [] and catalog.index == {}
+    assert catalog.identify("game.exe") is None
+    assert "Error loading game catalog" in capsys.readouterr().out
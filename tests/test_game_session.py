@@ -0,0 +1,107 @@
+import psutil
+import pytest
+
+# The engine presses keys through pynput, which needs a display (or Xvfb) to import on Linux
+pytest.importorskip("pynput.keyboard", exc_type=ImportError)
+
+from sims_saver.engine import AutoSaveEngine, EngineConfig  # noqa: E402
+from sims_saver.journal import EVENT_GAME_DETECTED, EVENT_GAME_EXITED  # noqa: E402
+from sims_saver.schedule import Schedule  # noqa: E402
+from sims_saver.suspend import MISSED_SKIP  # noqa: E402
+
+
+class FakeGame:
+    def __init__(self, pid):
+        self.pid = pid
+        self.running = True
+
+    def is_running(self):
+        return self.running
+
+    def status(self):
+        return psutil.STATUS_RUNNING
+
+    def create_time(self):
+        return 1600000000.0 + self.pid
+
+    def io_counters(self):
+        raise NotImplementedError
+
+    def cpu_percent(self, interval=None):
+        return 20.0
+
+    def memory_info(self):
+        return self
+
+    rss = 0
+
+
+class ListJournal:
+    def __init__(self):
+        self.events = []
+
+    def record(self, event, pid=None, create_time=None, detail=None):
+        self.events.append((event, pid))
+
+
+class FakeOwner:
+    def __init__(self):
+        self.status_key = None
+        self.deactivations = 0
+
+    def set_status(self, key):
+        self.status_key = key
+
+    def deactivate_profile(self):
+        self.deactivations += 1
+
+
+def tracking(*games):
+    engine = AutoSaveEngine(FakeOwner(), None, ListJournal())
+    engine.game_processes = list(games)
+    engine.game_process = games[0]
+    engine.update_game_session()
+    engine.game_activity.attach(games[0])
+    engine.is_running = True
+    return engine
+
+
+def test_exit_is_journaled_on_the_next_wake():
+    game = FakeGame(100)
+    engine = tracking(game)
+    engine.wait(0)
+    assert not engine.waiting_for_game
+    game.running = False
+    engine.wait(0)
+    assert engine.journal.events == [(EVENT_GAME_DETECTED, 100), (EVENT_GAME_EXITED, 100)]
+    assert engine.waiting_for_game
+    assert engine.game_process is None
+    assert engine.game_activity.process is None
+    assert engine.owner.status_key == "status_waiting_for_process"
+    assert engine.owner.deactivations == 1
+
+
+def test_surviving_instance_takes_over():
+    first, second = FakeGame(100), FakeGame(200)
+    engine = tracking(first, second)
+    first.running = False
+    engine.wait(0)
+    assert engine.game_process is second
+    assert not engine.waiting_for_game
+    assert engine.journal.events[-2:] == [(EVENT_GAME_EXITED, 100), (EVENT_GAME_DETECTED, 200)]
+    assert engine.owner.deactivations == 0
+
+
+def test_cycle_runs_under_the_config_that_fired_it():
+    fired = EngineConfig(
+        test_mode=False, selected_key="escape", monitored_process_names=("no-such-game.exe",), max_defer_seconds=0,
+        schedule=Schedule.every(300), targeted_key_delivery=False, adaptive_interval=False,
+        adaptive_min_seconds=60, backup_enabled=False, missed_fire_policy=MISSED_SKIP,
+        resume_grace_seconds=30, key_hold_ms=0, key_gap_ms=0, auto_profile=False)
+    # Test Mode was switched on after the loop decided to fire
+    engine = AutoSaveEngine(FakeOwner(), fired._replace(test_mode=True), ListJournal())
+    engine.is_running = True
+    engine.run_cycle(fired)
+    assert engine.waiting_for_game
+    assert engine.owner.status_key == "status_waiting_for_process"
+    assert engine.status.presses == 0
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from sims_saver import journal as journal_module
+from sims_saver.journal import (SaveJournal, EVENT_GAME_DETECTED, EVENT_GAME_EXITED, EVENT_KEY_FIRED,
+                                EVENT_PRESS_FAILED, EVENT_SAVE_CONFIRMED, INSERT_EVENT)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return SaveJournal(tmp_path / "data" / "journal.sqlite3")
+
+
+def insert(journal, *events):
+    """Insert (ts, event, pid, create_time) rows directly"""
+    conn = journal._connect()
+    with conn:
+        conn.executemany(INSERT_EVENT, [(ts, event, pid, create_time, None) for ts, event, pid, create_time in events])
+    conn.close()
+
+
+def test_sessions_and_counts(journal):
+    insert(journal,
+           (100.0, EVENT_GAME_DETECTED, 1, 50.0),
+           (400.0, EVENT_KEY_FIRED, 1, 50.0),
+           (410.0, EVENT_SAVE_CONFIRMED, 1, 50.0),
+           # The helper restarted and re-detected the same game instance
+           (500.0, EVENT_GAME_DETECTED, 1, 50.0),
+           (700.0, EVENT_PRESS_FAILED, 1, 50.0),
+           (1900.0, EVENT_GAME_EXITED, 1, 50.0),
+           # A second game that is still running at the last event
+           (2000.0, EVENT_GAME_DETECTED, 2, 1990.0),
+           (2300.0, EVENT_KEY_FIRED, 2, 1990.0),
+           (2600.0, EVENT_KEY_FIRED, 2, 1990.0))
+    stats = journal.get_stats(until=3000.0)
+    assert stats["sessions"] == 2
+    assert sorted(stats["session_lengths"]) == [600.0, 1800.0]
+    assert stats["key_fired"] == 3
+    assert stats["press_failed"] == 1
+    assert stats["save_confirmed"] == 1
+    assert stats["failure_rate"] == pytest.approx(0.25)
+    assert stats["saves_per_hour"] == pytest.approx(3 / (2400 / 3600))
+    assert stats["longest_session_seconds"] == 1800.0
+
+
+def test_window_limits_events(journal):
+    insert(journal,
+           (100.0, EVENT_GAME_DETECTED, 1, 50.0),
+           (200.0, EVENT_KEY_FIRED, 1, 50.0),
+           (5000.0, EVENT_KEY_FIRED, 1, 50.0))
+    assert journal.get_stats(since=1000.0, until=6000.0)["key_fired"] == 1
+    assert journal.get_stats(since=0.0, until=1000.0)["key_fired"] == 1
+
+
+def test_test_mode_falls_back_to_journal_span(journal):
+    insert(journal, (0.0, EVENT_KEY_FIRED, None, None), (3600.0, EVENT_KEY_FIRED, None, None))
+    stats = journal.get_stats(until=4000.0)
+    assert stats["sessions"] == 0
+    assert stats["saves_per_hour"] == pytest.approx(2.0)
+
+
+def test_empty_journal(journal):
+    stats = journal.get_stats()
+    assert stats["sessions"] == 0
+    assert stats["saves_per_hour"] == 0.0
+
+
+def test_record_is_written_by_the_background_writer(journal):
+    journal.start()
+    journal.record(EVENT_KEY_FIRED, 1, 2.0, "escape")
+    journal.close()
+    assert journal.get_stats()["key_fired"] == 1
+
+
+def test_default_path_is_outside_the_package():
+    package_dir = os.path.dirname(os.path.abspath(journal_module.__file__))
+    assert not str(journal_module.default_journal_path()).startswith(package_dir)
@@ -0,0 +1,184 @@
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def x_server():
+    """DISPLAY of a private Xvfb server, so no events reach a real desktop"""
+    if not sys.platform.startswith("linux"):
+        pytest.skip("X11 delivery is Linux only")
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        pytest.skip("needs Xvfb")
+    read_fd, write_fd = os.pipe()
+    server = subprocess.Popen([xvfb, "-displayfd", str(write_fd), "-screen", "0", "640x480x24", "-nolisten", "tcp"],
+                              pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        number = f.readline().strip()
+    if not number:
+        server.kill()
+        server.wait()
+        pytest.skip("Xvfb did not start")
+    previous = os.environ.get("DISPLAY")
+    os.environ["DISPLAY"] = f":{number}"
+    yield os.environ["DISPLAY"]
+    if previous is None:
+        del os.environ["DISPLAY"]
+    else:
+        os.environ["DISPLAY"] = previous
+    server.terminate()
+    server.wait()
+
+
+@pytest.fixture(scope="module")
+def key_delivery(request):
+    """sims_saver.key_delivery; pynput needs a display to import on Linux, so start Xvfb first"""
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        request.getfixturevalue("x_server")
+    return pytest.importorskip("sims_saver.key_delivery", exc_type=ImportError)
+
+
+class RecordingFallback:
+    def __init__(self, result=True):
+        self.result = result
+        self.calls = []
+
+    def deliver(self, key, pids=()):
+        self.calls.append((key, list(pids)))
+        return self.result
+
+
+def fake_delivery(key_delivery, windows, stale=(), fallback=None):
+    """WindowKeyDelivery over a dict of pid -> window names; posting to a stale window raises"""
+
+    class FakeWindowDelivery(key_delivery.WindowKeyDelivery):
+        def __init__(self, fallback):
+            super().__init__(fallback)
+            self.lookups = 0
+            self.posted = []
+
+        def find_windows(self, pids):
+            self.lookups += 1
+            return {pid: list(windows[pid]) for pid in pids if pid in windows}
+
+        def post_key(self, window, modifiers, key):
+            if window in stale:
+                raise OSError(f"Window {window} no longer exists")
+            self.posted.append((window, modifiers, key))
+
+    return FakeWindowDelivery(fallback or RecordingFallback())
+
+
+def test_posts_to_every_window_and_caches_the_handles(key_delivery):
+    delivery = fake_delivery(key_delivery, {1: ["a"], 2: ["b", "c"]})
+    assert delivery.deliver("ctrl+s", [1, 2])
+    assert delivery.deliver("ctrl+s", [1, 2])
+    assert [window for window, _, _ in delivery.posted] == ["a", "b", "c"] * 2
+    assert delivery.posted[0] == ("a", ("ctrl",), "s")
+    assert delivery.lookups == 1
+    assert delivery.fallback.calls == []
+
+
+def test_failed_post_falls_back_for_that_pid_only(key_delivery):
+    delivery = fake_delivery(key_delivery, {1: ["a"], 2: ["gone"]}, stale={"gone"})
+    assert delivery.deliver("f5", [1, 2])
+    assert delivery.posted == [("a", (), "f5")]
+    assert delivery.fallback.calls == [("f5", [2])]
+    # The stale handle is looked up again next fire; the good one stays cached
+    assert 2 not in delivery.window_cache
+    assert delivery.window_cache[1] == ["a"]
+
+
+def test_pid_that_got_the_key_on_another_window_is_not_sent_it_again(key_delivery):
+    delivery = fake_delivery(key_delivery, {1: ["gone", "a"]}, stale={"gone"})
+    assert delivery.deliver("escape", [1])
+    assert delivery.posted == [("a", (), "escape")]
+    assert delivery.fallback.calls == []
+    assert 1 not in delivery.window_cache
+
+
+def test_press_counts_as_delivered_when_only_the_fallback_fails(key_delivery):
+    delivery = fake_delivery(key_delivery, {1: ["a"], 2: ["gone"]}, stale={"gone"},
+                             fallback=RecordingFallback(result=False))
+    assert delivery.deliver("escape", [1, 2])
+    delivery = fake_delivery(key_delivery, {2: ["gone"]}, stale={"gone"}, fallback=RecordingFallback(result=False))
+    assert not delivery.deliver("escape", [2])
+
+
+def test_pid_without_a_window_falls_back_while_others_are_targeted(key_delivery):
+    delivery = fake_delivery(key_delivery, {1: ["a"]})
+    assert delivery.deliver("f5", [1, 2])
+    assert delivery.posted == [("a", (), "f5")]
+    assert delivery.fallback.calls == [("f5", [2])]
+
+
+def test_no_window_yet_uses_the_fallback(key_delivery):
+    delivery = fake_delivery(key_delivery, {})
+    assert delivery.deliver("escape", [1])
+    assert delivery.fallback.calls == [("escape", [1])]
+    # A game still loading is looked up again on the next fire
+    delivery.deliver("escape", [1])
+    assert delivery.lookups == 2
+
+
+def read_key_events(client, count, timeout=5.0):
+    """(type, window id, keycode, state) for the next count key events the client receives"""
+    from Xlib import X
+    events = []
+    deadline = time.monotonic() + timeout
+    while len(events) < count and time.monotonic() < deadline:
+        if not client.pending_events():
+            time.sleep(0.01)
+            continue
+        event = client.next_event()
+        if event.type in (X.KeyPress, X.KeyRelease):
+            events.append((event.type, event.window.id, event.detail, event.state))
+    return events
+
+
+def test_x11_delivery_reaches_each_game_window_under_xvfb(x_server, key_delivery):
+    from Xlib import X, XK, Xatom, display
+    client = display.Display(x_server)
+    screen = client.screen()
+    pid_atom = client.intern_atom("_NET_WM_PID")
+
+    def game_window(pid):
+        window = screen.root.create_window(0, 0, 100, 100, 0, screen.root_depth,
+                                           event_mask=X.KeyPressMask | X.KeyReleaseMask)
+        window.change_property(pid_atom, Xatom.CARDINAL, 32, [pid])
+        return window
+
+    first, second, closed = game_window(1001), game_window(1002), game_window(1003)
+    # Xvfb runs no window manager, so publish the client list ourselves
+    screen.root.change_property(client.intern_atom("_NET_CLIENT_LIST"), Xatom.WINDOW, 32,
+                                [first.id, second.id, closed.id])
+    client.sync()
+
+    fallback = RecordingFallback()
+    delivery = key_delivery.X11KeyDelivery(fallback)
+    try:
+        assert delivery.deliver("ctrl+s", [1001, 1002, 1003])
+        keycode = client.keysym_to_keycode(XK.string_to_keysym("s"))
+        events = read_key_events(client, 6)
+        assert sorted(events) == sorted(
+            (event_type, window.id, keycode, X.ControlMask)
+            for window in (first, second, closed) for event_type in (X.KeyPress, X.KeyRelease))
+        assert fallback.calls == []
+
+        # The game recreated one window: the stale handle fails and only its PID falls back
+        closed.destroy()
+        client.sync()
+        assert delivery.deliver("f5", [1001, 1002, 1003])
+        events = read_key_events(client, 4)
+        assert {window_id for _, window_id, _, _ in events} == {first.id, second.id}
+        assert fallback.calls == [("f5", [1003])]
+        assert 1003 not in delivery.window_cache
+    finally:
+        delivery.display.close()
+        client.close()
@@ -0,0 +1,134 @@
+import os
+import time
+
+import psutil
+import pytest
+
+from sims_saver.process_source import ProcFsProcessSource, PsutilProcessSource
+
+# Well above any real pid_max so psutil's own cache never confuses fake and real PIDs
+FIRST_PID = 5000000
+
+
+def write_process(root, pid, name, argv0=None):
+    """Write the /proc/<pid> files both backends read"""
+    path = os.path.join(root, str(pid))
+    os.makedirs(path, exist_ok=True)
+    comm = name[:ProcFsProcessSource.COMM_MAX_LENGTH]
+    with open(os.path.join(path, "comm"), "w") as f:
+        f.write(comm + "\n")
+    with open(os.path.join(path, "cmdline"), "wb") as f:
+        f.write((argv0 or name).encode() + b"\0--flag\0")
+    # pid (comm) state ppid ... starttime is field 22
+    fields = ["S", "1", str(pid), str(pid), "0", "-1", "0"] + ["0"] * 12 + ["1000"] + ["0"] * 32
+    with open(os.path.join(path, "stat"), "w") as f:
+        f.write(f"{pid} ({comm}) {' '.join(fields)}\n")
+    return path
+
+
+def build_proc_tree(root, count, games=()):
+    """Fake /proc with `count` ordinary processes followed by the given game names"""
+    with open(os.path.join(root, "stat"), "w") as f:
+        f.write("cpu  1 1 1 1 1 1 1 1 1 1\nbtime 1700000000\n")
+    pids = {}
+    for index in range(count):
+        write_process(root, FIRST_PID + index, f"worker-{index % 50}")
+    for offset, name in enumerate(games):
+        pid = FIRST_PID + count + offset
+        write_process(root, pid, name, argv0=f"C:\\Games\\{name}")
+        pids[pid] = name
+    return pids
+
+
+def found_pids(source, names):
+    return {proc.pid for proc in source.find_all(names)}
+
+
+@pytest.fixture
+def proc_root(tmp_path, monkeypatch):
+    # Point psutil at the fake tree too, so the handles both backends return resolve
+    monkeypatch.setattr(psutil, "PROCFS_PATH", str(tmp_path))
+    # process_iter keeps handles between calls and no longer checks them for PID reuse
+    psutil.process_iter.cache_clear()
+    yield str(tmp_path)
+    psutil.process_iter.cache_clear()
+
+
+def test_finds_games_with_truncated_comm(proc_root):
+    games = build_proc_tree(proc_root, 20, ["TS4_x64.exe", "The Sims 4 Launcher.exe"])
+    source = ProcFsProcessSource(proc_root)
+    assert found_pids(source, ["ts4_x64.exe"]) == {pid for pid, name in games.items() if name == "TS4_x64.exe"}
+    assert found_pids(source, ["the sims 4 launcher.exe"]) == {
+        pid for pid, name in games.items() if name.startswith("The Sims")}
+
+
+def test_rename_under_same_pid_is_noticed(proc_root):
+    build_proc_tree(proc_root, 5)
+    path = write_process(proc_root, FIRST_PID + 99, "sh")
+    source = ProcFsProcessSource(proc_root)
+    assert found_pids(source, ["tail"]) == set()
+    # exec keeps the PID and its /proc directory inode but changes comm
+    inode = os.stat(path).st_ino
+    write_process(proc_root, FIRST_PID + 99, "tail")
+    assert os.stat(path).st_ino == inode
+    assert found_pids(source, ["tail"]) == {FIRST_PID + 99}
+
+
+def test_unchanged_truncated_comm_does_not_reread_cmdline(proc_root, monkeypatch):
+    build_proc_tree(proc_root, 3, ["TS4_x64.exe"])
+    source = ProcFsProcessSource(proc_root)
+    source.scan()
+    calls = []
+    original = source.full_name
+    monkeypatch.setattr(source, "full_name", lambda path, comm: calls.append(path) or original(path, comm))
+    assert "ts4_x64.exe" in [name for _, name in source.scan()]
+    assert calls == []
+
+
+def test_other_users_processes_are_rejected_once(proc_root, monkeypatch):
+    build_proc_tree(proc_root, 10)
+    source = ProcFsProcessSource(proc_root, uid=os.getuid() + 1)
+    assert source.scan() == []
+    monkeypatch.setattr(source, "is_owned", lambda path: pytest.fail("ownership re-checked"))
+    monkeypatch.setattr(source, "read_comm", lambda path: pytest.fail("comm read for another user"))
+    assert source.scan() == []
+
+
+def test_vanished_pids_leave_the_caches(proc_root):
+    games = build_proc_tree(proc_root, 3, ["TS4_x64.exe"])
+    source = ProcFsProcessSource(proc_root)
+    assert found_pids(source, ["ts4_x64.exe"]) == set(games)
+    pid = next(iter(games))
+    for filename in os.listdir(os.path.join(proc_root, str(pid))):
+        os.remove(os.path.join(proc_root, str(pid), filename))
+    os.rmdir(os.path.join(proc_root, str(pid)))
+    source.scan()
+    assert pid not in source.known_pids
+    assert pid not in source.handles
+
+
+def best_time(function, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@pytest.mark.parametrize("count", [500, 2000])
+def test_benchmark_against_psutil(proc_root, count):
+    """Both backends agree on a fake /proc tree; run with -s to see the timings"""
+    games = build_proc_tree(proc_root, count, ["TS4_x64.exe"])
+    names = ["ts4_x64.exe"]
+    procfs = ProcFsProcessSource(proc_root)
+    portable = PsutilProcessSource()
+
+    # Both backends hand out real psutil handles, so compare PIDs only
+    assert {proc.pid for proc in portable.iter_matches(names)} == set(games)
+    assert found_pids(procfs, names) == set(games)
+
+    procfs_time = best_time(lambda: procfs.scan())
+    psutil_time = best_time(lambda: list(portable.iter_matches(names)))
+    print(f"\n{count} processes: /proc scan {procfs_time * 1000:.2f} ms, "
+          f"psutil {psutil_time * 1000:.2f} ms ({psutil_time / procfs_time:.1f}x)")
@@ -0,0 +1,92 @@
+import shutil
+
+from sims_saver.process_trace import (FLUSH_EVERY_FRAMES, ReplayProcessSource, TraceWriter, benchmark,
+                                      expected_games)
+
+LAUNCHER = {100: ("EADesktop.exe", 10.0, 1)}
+
+
+def frames_with_game(count, game_from):
+    """Snapshots where the game starts under the launcher at frame game_from"""
+    for index in range(count):
+        snapshot = dict(LAUNCHER)
+        snapshot[200 + index % 3] = ("worker", 20.0 + index % 3, 1)
+        if index >= game_from:
+            snapshot[300] = ("TS4_x64.exe", 30.0, 100)
+        yield snapshot
+
+
+def write_trace(path, snapshots, close=True):
+    writer = TraceWriter(path)
+    writer.open()
+    for snapshot in snapshots:
+        writer.write_frame(snapshot)
+    if close:
+        writer.close()
+    return writer
+
+
+def replay(path):
+    source = ReplayProcessSource(path)
+    states = []
+    while source.step():
+        states.append(dict(source.processes))
+    return states
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "seat.trace"
+    snapshots = list(frames_with_game(6, game_from=3))
+    write_trace(path, snapshots)
+    assert replay(path) == snapshots
+
+
+def test_rename_under_the_same_pid_is_recorded(tmp_path):
+    path = tmp_path / "exec.trace"
+    # Wine's loader exec()s into the game: same PID and start time, new name
+    write_trace(path, [{300: ("sh", 30.0, 100)}, {300: ("TS4_x64.exe", 30.0, 100)}])
+    source = ReplayProcessSource(path)
+    source.step()
+    assert expected_games(source, ["ts4_x64.exe"]) == set()
+    source.step()
+    assert expected_games(source, ["ts4_x64.exe"]) == {300}
+
+
+def test_reparenting_is_recorded(tmp_path):
+    path = tmp_path / "orphan.trace"
+    game = ("TS4_x64.exe", 30.0, 100)
+    # The launcher exits and the game is reparented to init
+    write_trace(path, [{**LAUNCHER, 300: game}, {300: ("TS4_x64.exe", 30.0, 1)}])
+    source = ReplayProcessSource(path)
+    source.step()
+    assert source.children(100) == [(300, "ts4_x64.exe")]
+    source.step()
+    assert source.processes == {300: ("TS4_x64.exe", 30.0, 1)}
+    assert source.children(100) == []
+    assert source.children(1) == [(300, "ts4_x64.exe")]
+
+
+def test_unclosed_capture_replays_up_to_the_last_flush(tmp_path):
+    path = tmp_path / "killed.trace"
+    snapshots = list(frames_with_game(FLUSH_EVERY_FRAMES * 2 + 3, game_from=5))
+    writer = write_trace(path, snapshots, close=False)
+    # Copy the file as a killed process would have left it
+    copy = tmp_path / "copy.trace"
+    shutil.copy(path, copy)
+    writer.close()
+
+    states = replay(copy)
+    assert len(states) == FLUSH_EVERY_FRAMES * 2
+    assert states == snapshots[:len(states)]
+    assert benchmark(copy, ["ts4_x64.exe"])["frames"] == len(states)
+
+
+def test_capture_cut_off_mid_frame(tmp_path):
+    path = tmp_path / "full.trace"
+    snapshots = list(frames_with_game(5, game_from=2))
+    write_trace(path, snapshots)
+    truncated = tmp_path / "truncated.trace"
+    data = path.read_bytes()
+    truncated.write_bytes(data[:len(data) - 12])
+    states = replay(truncated)
+    assert states == snapshots[:len(states)]
@@ -0,0 +1,129 @@
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+
+from sims_saver.process_source import ProcessSource
+from sims_saver.process_tree import GameProcessTracker
+
+
+class FakeProcess:
+    def __init__(self, table, pid, name, ppid):
+        self.table = table
+        self.pid = pid
+        self._name = name
+        self._ppid = ppid
+
+    def is_running(self):
+        return self.pid in self.table.processes
+
+    def status(self):
+        return psutil.STATUS_RUNNING
+
+    def name(self):
+        return self._name
+
+    def ppid(self):
+        return self._ppid
+
+
+class FakeSource(ProcessSource):
+    """Process table held in a dict, counting how often the whole table is walked"""
+
+    def __init__(self):
+        self.processes = {}
+        self.table_walks = 0
+
+    def add(self, pid, name, ppid=0):
+        self.processes[pid] = FakeProcess(self, pid, name, ppid)
+
+    def remove(self, pid):
+        self.processes.pop(pid)
+
+    def find_all(self, process_names):
+        self.table_walks += 1
+        return [proc for proc in self.processes.values()
+                if any(name in proc.name().lower() for name in process_names)]
+
+    def children_of(self, pids):
+        self.table_walks += 1
+        result, pending = [], list(pids)
+        while pending:
+            parent = pending.pop()
+            for proc in self.processes.values():
+                if proc.ppid() == parent:
+                    result.append((proc.pid, proc.name().lower()))
+                    pending.append(proc.pid)
+        return result
+
+    def get_handle(self, pid):
+        return self.processes.get(pid)
+
+
+NAMES = ["ts4_x64.exe"]
+
+
+def test_game_started_by_launcher_is_found_without_a_full_scan():
+    source = FakeSource()
+    source.add(10, "EADesktop.exe")
+    source.add(11, "Steam.exe")
+    tracker = GameProcessTracker(source)
+    assert tracker.find_all(NAMES) == []
+    assert len(tracker.launchers) == 2
+
+    source.add(20, "TS4_x64.exe", ppid=10)
+    walks = source.table_walks
+    assert [proc.pid for proc in tracker.find_all(NAMES)] == [20]
+    # Both launchers were checked with a single children lookup
+    assert source.table_walks == walks + 1
+
+
+def test_pinned_game_costs_no_table_walks():
+    source = FakeSource()
+    source.add(20, "TS4_x64.exe")
+    tracker = GameProcessTracker(source)
+    assert [proc.pid for proc in tracker.find_all(NAMES)] == [20]
+    walks = source.table_walks
+    for _ in range(20):
+        tracker.find_all(NAMES)
+    assert source.table_walks == walks
+
+
+def test_helpers_are_ignored_by_name_and_lineage():
+    source = FakeSource()
+    source.add(10, "EADesktop.exe")
+    source.add(20, "TS4_x64.exe", ppid=10)
+    source.add(21, "TS4_x64.exe", ppid=20)  # child of the game sharing its name
+    source.add(22, "TS4_x64_CrashReporter.exe", ppid=10)
+    tracker = GameProcessTracker(source)
+    assert [proc.pid for proc in tracker.find_all(NAMES)] == [20]
+
+
+def test_game_started_outside_a_launcher_is_found_by_the_periodic_full_scan():
+    source = FakeSource()
+    tracker = GameProcessTracker(source)
+    tracker.find_all(NAMES)
+    source.add(30, "TS4_x64.exe")
+    results = [tracker.find_all(NAMES) for _ in range(GameProcessTracker.FULL_SCAN_EVERY)]
+    assert [proc.pid for proc in results[-1]] == [30]
+
+
+def test_psutil_children_of_finds_grandchildren():
+    script = "import subprocess, sys, time; subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); time.sleep(30)"
+    child = subprocess.Popen([sys.executable, "-c", script])
+    try:
+        for _ in range(100):
+            found = ProcessSource().children_of([os.getpid()])
+            if len(found) >= 2:
+                break
+            time.sleep(0.05)
+        pids = [pid for pid, _ in found]
+        assert child.pid in pids
+        assert len([pid for pid in pids if psutil.Process(pid).ppid() == child.pid]) == 1
+    finally:
+        for proc in psutil.Process(child.pid).children(recursive=True):
+            proc.kill()
+        child.kill()
+        child.wait()
@@ -0,0 +1,144 @@
+import psutil
+import pytest
+
+from sims_saver.game_activity import GameActivityMonitor
+from sims_saver.risk import MB, RiskMonitor, RiskSample, assess_risk, adapted_interval_factor
+
+
+def series(rows, start=0.0, step=15.0):
+    """Build samples from (rss MB, cpu percent, responding) rows taken every `step` seconds"""
+    return [RiskSample(start + i * step, rss * MB, cpu, responding) for i, (rss, cpu, responding) in enumerate(rows)]
+
+
+# A paused game at the main menu: flat memory, no CPU, window responding
+IDLE_AT_MENU = series([(1800, 0.0, True)] * 12)
+# Window reported 'Not Responding' for the last three samples
+HUNG_WINDOW = series([(2500, 40.0, True)] * 5 + [(2500, 0.0, False)] * 3)
+# One unresponsive blip during a long autosave, then recovered
+BLIP = series([(2500, 30.0, True), (2500, 0.0, False), (2500, 35.0, True)])
+# A long session leaking about 1 GB an hour
+LEAKING = series([(3000 + i * 64, 50.0, True) for i in range(16)], step=225.0)
+
+
+def test_no_samples_is_no_risk():
+    assessment = assess_risk([])
+    assert assessment.risk == 0.0
+    assert not assessment.hung
+
+
+def test_idle_game_at_zero_cpu_is_not_hung():
+    assert not assess_risk(IDLE_AT_MENU).hung
+    assert not assess_risk(IDLE_AT_MENU, zero_cpu_evidence=True).hung
+
+
+def test_unresponsive_samples_are_hung():
+    assessment = assess_risk(HUNG_WINDOW)
+    assert assessment.hung
+    assert assessment.risk == 1.0
+
+
+def test_single_unresponsive_sample_is_not_hung():
+    assert not assess_risk(BLIP).hung
+    assert not assess_risk(BLIP, zero_cpu_evidence=True).hung
+
+
+def test_zero_cpu_only_supports_an_unresponsive_latest_sample():
+    rows = [(2500, 0.0, True), (2500, 0.0, True), (2500, 0.0, False)]
+    assert not assess_risk(series(rows)).hung
+    assert assess_risk(series(rows), zero_cpu_evidence=True).hung
+    # Still using CPU: zero CPU can't be the evidence
+    rows = [(2500, 0.0, True), (2500, 20.0, True), (2500, 0.0, False)]
+    assert not assess_risk(series(rows), zero_cpu_evidence=True).hung
+
+
+def test_unknown_cpu_is_not_zero_cpu():
+    rows = [(2500, None, True), (2500, None, True), (2500, None, False)]
+    assert not assess_risk(series(rows), zero_cpu_evidence=True).hung
+
+
+def test_memory_growth_raises_risk():
+    assert assess_risk(LEAKING).risk > 0.9
+    assert assess_risk(IDLE_AT_MENU).risk == 0.0
+
+
+def test_growth_needs_enough_samples():
+    assert assess_risk(LEAKING[:3]).risk == assess_risk(LEAKING[2:3]).risk
+
+
+@pytest.mark.parametrize("risk, factor", [(0.0, 1.0), (1.0, 0.25), (0.5, 0.625), (2.0, 0.25), (-1.0, 1.0)])
+def test_adapted_interval_factor(risk, factor):
+    assert adapted_interval_factor(risk) == pytest.approx(factor)
+
+
+class FakeGame:
+    pid = 7
+
+    def __init__(self, rss):
+        self.rss = rss
+
+    def memory_info(self):
+        return self
+
+    def status(self):
+        return psutil.STATUS_RUNNING
+
+
+class FakeProcess:
+    def __init__(self, cpu_readings):
+        self.cpu_readings = list(cpu_readings)
+
+    def io_counters(self):
+        raise NotImplementedError
+
+    def cpu_percent(self, interval=None):
+        return self.cpu_readings.pop(0)
+
+
+def test_attach_discards_first_cpu_reading_of_a_new_handle():
+    monitor = GameActivityMonitor()
+    monitor.attach(FakeProcess([0.0, 25.0]))
+    assert monitor.cpu is None
+    monitor.attach(FakeProcess([0.0, 25.0]))
+    assert monitor.cpu is None
+
+
+def test_monitor_reassesses_only_after_a_new_sample(monkeypatch):
+    monitor = RiskMonitor()
+    monitor.samples.extend(HUNG_WINDOW)
+    calls = []
+    monkeypatch.setattr("sims_saver.risk.assess_risk",
+                        lambda samples, zero_cpu_evidence=False: calls.append(len(samples)) or assess_risk(samples))
+    assert monitor.assess().hung
+    assert monitor.assess().hung
+    assert calls == [8]
+    monitor.add_sample(FakeGame(rss=1800 * MB), 120.0, 30.0)
+    assert not monitor.assess().hung
+    assert calls == [8, 9]
+
+
+def test_monitor_uses_zero_cpu_as_evidence_whatever_the_settings():
+    monitor = RiskMonitor()
+    monitor.samples.extend(series([(2500, 30.0, True), (2500, 0.0, True), (2500, 0.0, True), (2500, 0.0, False)]))
+    assert monitor.assess().hung
+
+
+def test_monitor_looks_up_the_game_windows_itself_and_caches_them(monkeypatch):
+    lookups, closed = [], set()
+
+    def find_windows(pid):
+        lookups.append(pid)
+        return [pid * 10 + len(lookups)]
+
+    monitor = RiskMonitor(find_windows=find_windows, window_exists=lambda window: window not in closed)
+    hung = []
+    monkeypatch.setattr("sims_saver.risk.is_responding", lambda process, windows: hung.append(list(windows)) or True)
+    game = FakeGame(rss=1800 * MB)
+    for now in (0.0, 15.0, 30.0):
+        monitor.add_sample(game, now, 30.0)
+    assert lookups == [7]
+    assert hung == [[71], [71], [71]]
+    # The game recreated its window: the stale handle triggers a fresh lookup
+    closed.add(71)
+    monitor.add_sample(game, 45.0, 30.0)
+    assert lookups == [7, 7]
+    assert hung[-1] == [72]
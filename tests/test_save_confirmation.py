@@ -0,0 +1,139 @@
+from collections import namedtuple
+
+import pytest
+
+# The engine presses keys through pynput, which needs a display (or Xvfb) to import on Linux
+pytest.importorskip("pynput.keyboard", exc_type=ImportError)
+
+from sims_saver import engine as engine_module, game_activity  # noqa: E402
+from sims_saver.engine import AutoSaveEngine, EngineConfig  # noqa: E402
+from sims_saver.journal import EVENT_SAVE_CONFIRMED  # noqa: E402
+from sims_saver.schedule import Schedule  # noqa: E402
+from sims_saver.suspend import MISSED_SKIP  # noqa: E402
+
+MB = 1024 * 1024
+IoCounters = namedtuple("IoCounters", ["read_bytes", "write_bytes"])
+
+
+class VirtualTime:
+    def __init__(self):
+        self.wall = 1700000000.0
+        self.mono = 1000.0
+
+    def time(self):
+        return self.wall
+
+    def monotonic(self):
+        return self.mono
+
+    def sleep(self, seconds):
+        self.wall += seconds
+        self.mono += seconds
+
+
+class FakeGame:
+    """Writes a save at 20 MB/s from save_at for five seconds"""
+
+    pid = 4242
+
+    def __init__(self, clock, save_at=None):
+        self.clock = clock
+        self.save_at = save_at
+
+    def io_counters(self):
+        written = 0.0
+        if self.save_at is not None:
+            written = min(max(0.0, self.clock.mono - self.save_at), 5.0) * 20 * MB
+        return IoCounters(0, int(written))
+
+    def cpu_percent(self, interval=None):
+        return 20.0
+
+
+class ListJournal:
+    def __init__(self):
+        self.events = []
+
+    def record(self, event, pid=None, create_time=None, detail=None):
+        self.events.append(event)
+
+
+class RecordingPipeline:
+    def __init__(self):
+        self.triggers = []
+
+    def submit(self, trigger):
+        self.triggers.append(trigger)
+
+
+class FakeOwner:
+    def set_status(self, key):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = VirtualTime()
+    for module in (engine_module, game_activity):
+        monkeypatch.setattr(module, "time", clock)
+    return clock
+
+
+def make_engine(clock, game, backup_enabled=True):
+    config = EngineConfig(
+        test_mode=False, selected_key="escape", monitored_process_names=("ts4_x64.exe",), max_defer_seconds=0,
+        schedule=Schedule.every(300), targeted_key_delivery=False, adaptive_interval=False,
+        adaptive_min_seconds=60, backup_enabled=backup_enabled, missed_fire_policy=MISSED_SKIP,
+        resume_grace_seconds=30, key_hold_ms=0, key_gap_ms=0, auto_profile=False)
+    engine = AutoSaveEngine(FakeOwner(), config, ListJournal(), RecordingPipeline())
+    engine.journal_game_key = (game.pid, 1600000000.0)
+    engine.game_activity.attach(game)
+    return engine
+
+
+def pressed(engine, clock):
+    """What run_cycle does after a successful press"""
+    engine.save_confirmation_deadline = clock.mono + engine.SAVE_CONFIRM_WINDOW
+
+
+def poll(engine, clock, seconds):
+    """Check once a second, as wait() does while a confirmation is pending"""
+    for _ in range(int(seconds)):
+        clock.sleep(1)
+        if not engine.save_confirmation_deadline:
+            return
+        engine.check_save_confirmation()
+
+
+def test_write_burst_after_a_press_confirms_the_save_once(clock):
+    game = FakeGame(clock)
+    engine = make_engine(clock, game)
+    pressed(engine, clock)
+    game.save_at = clock.mono + 3
+    poll(engine, clock, 30)
+    assert engine.journal.events == [EVENT_SAVE_CONFIRMED]
+    assert engine.status.confirmed == 1
+    assert engine.save_confirmation_deadline == 0.0
+    trigger, = engine.post_save.triggers
+    assert (trigger.pid, trigger.create_time) == (game.pid, 1600000000.0)
+
+
+def test_no_burst_within_the_window_is_not_a_save(clock):
+    game = FakeGame(clock)
+    engine = make_engine(clock, game)
+    pressed(engine, clock)
+    game.save_at = clock.mono + engine.SAVE_CONFIRM_WINDOW + 5
+    poll(engine, clock, engine.SAVE_CONFIRM_WINDOW + 30)
+    assert engine.journal.events == []
+    assert engine.status.confirmed == 0
+    assert engine.save_confirmation_deadline == 0.0
+
+
+def test_confirmed_save_without_backups_triggers_nothing(clock):
+    game = FakeGame(clock)
+    engine = make_engine(clock, game, backup_enabled=False)
+    pressed(engine, clock)
+    game.save_at = clock.mono
+    poll(engine, clock, 10)
+    assert engine.journal.events == [EVENT_SAVE_CONFIRMED]
+    assert engine.post_save.triggers == []
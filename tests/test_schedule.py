@@ -0,0 +1,171 @@
+import time
+from datetime import datetime
+
+import pytest
+
+from sims_saver.schedule import Schedule, ScheduleRule, ScheduleRunner
+
+
+@pytest.fixture(autouse=True)
+def copenhagen(monkeypatch):
+    """Run every test in a zone with DST; 2026 springs forward Mar 29 and falls back Oct 25"""
+    if not hasattr(time, "tzset"):
+        pytest.skip("needs time.tzset")
+    monkeypatch.setenv("TZ", "Europe/Copenhagen")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def at(day, clock, month=10, year=2026):
+    """Epoch seconds for a local wall-clock time; Oct 19 2026 is a Monday"""
+    hour, minute = (int(part) for part in clock.split(":"))
+    return datetime(year, month, day, hour, minute).timestamp()
+
+
+def local(t):
+    return datetime.fromtimestamp(t).strftime("%a %d %H:%M")
+
+
+def fires(schedule, start, count):
+    """The next `count` fires after a fire at start"""
+    result, last = [], start
+    for _ in range(count):
+        last = schedule.next_fire(last)
+        result.append(local(last))
+    return result
+
+
+class VirtualClock:
+    def __init__(self, wall):
+        self.wall = wall
+        self.mono = 0.0
+
+    def advance(self, seconds):
+        self.wall += seconds
+        self.mono += seconds
+
+
+def test_fixed_period():
+    schedule = Schedule.every(300)
+    assert schedule.next_fire(at(19, "12:00")) == at(19, "12:05")
+    assert schedule.first_fire(at(19, "12:00")) == at(19, "12:00")
+
+
+def test_evening_window_with_fallback_rule():
+    schedule = Schedule.parse(["every 5m 19:00-23:00", "every 20m"])
+    # The window opens before the 20 min period is up
+    assert fires(schedule, at(19, "18:30"), 4) == ["Mon 19 18:50", "Mon 19 19:00", "Mon 19 19:05", "Mon 19 19:10"]
+    # Leaving the window, the shorter remaining gap wins
+    assert fires(schedule, at(19, "22:58"), 2) == ["Mon 19 23:03", "Mon 19 23:23"]
+
+
+def test_weekend_only():
+    schedule = Schedule.parse(["every 10m weekends"])
+    assert local(schedule.first_fire(at(21, "09:00"))) == "Sat 24 00:00"
+    assert local(schedule.next_fire(at(23, "23:55"))) == "Sat 24 00:00"
+    assert local(schedule.next_fire(at(25, "23:55"))) == "Sat 31 00:00"
+    assert local(schedule.next_fire(at(24, "10:00"))) == "Sat 24 10:10"
+
+
+def test_window_crossing_midnight():
+    schedule = Schedule.parse(["every 5m 22:00-02:00"])
+    assert local(schedule.next_fire(at(19, "23:58"))) == "Tue 20 00:03"
+    assert local(schedule.next_fire(at(20, "01:58"))) == "Tue 20 22:00"
+    assert local(schedule.first_fire(at(20, "12:00"))) == "Tue 20 22:00"
+
+
+def test_sunday_window_continues_into_monday():
+    schedule = Schedule.parse(["every 5m 22:00-02:00 sun"])
+    assert local(schedule.next_fire(at(18, "23:58"))) == "Mon 19 00:03"
+    assert local(schedule.next_fire(at(19, "01:58"))) == "Sun 25 22:00"
+
+
+def test_first_matching_rule_wins():
+    schedule = Schedule.parse(["every 1h sat", "every 5m 19:00-23:00"])
+    assert local(schedule.next_fire(at(24, "19:00"))) == "Sat 24 20:00"
+    assert local(schedule.next_fire(at(23, "19:00"))) == "Fri 23 19:05"
+
+
+def test_schedule_that_never_fires():
+    schedule = Schedule([])
+    assert not schedule.has_fire_windows()
+    assert schedule.first_fire(at(19, "12:00")) is None
+    assert schedule.next_fire(at(19, "12:00")) is None
+
+
+@pytest.mark.parametrize("text", ["every 0m", "every 5x", "often", "every 5m 25:00-26:00", "every 5m funday"])
+def test_invalid_rules(text):
+    with pytest.raises(ValueError):
+        ScheduleRule.parse(text)
+
+
+def test_periods_are_real_seconds_across_fall_back():
+    schedule = Schedule.every(3600)
+    before = at(25, "01:30")
+    assert schedule.next_fire(before) == before + 3600
+    # 02:30 happens twice; the fire after the first one is the second one, an hour later
+    first_half_past_two = before + 3600
+    assert schedule.next_fire(first_half_past_two) == first_half_past_two + 3600
+    assert local(first_half_past_two + 3600) == "Sun 25 02:30"
+
+
+def test_window_follows_wall_clock_across_spring_forward():
+    schedule = Schedule.parse(["every 30m 01:00-05:00"])
+    start = at(29, "01:00", month=3)
+    assert fires(schedule, start, 6) == ["Sun 29 01:30", "Sun 29 03:00", "Sun 29 03:30", "Sun 29 04:00",
+                                         "Sun 29 04:30", "Mon 30 01:00"]
+
+
+def test_window_boundaries_after_fall_back():
+    schedule = Schedule.parse(["every 5m 19:00-23:00"])
+    # The day after the change, 19:00 is still 19:00 local time
+    assert local(schedule.first_fire(at(26, "12:00"))) == "Mon 26 19:00"
+    assert local(schedule.first_fire(at(25, "12:00"))) == "Sun 25 19:00"
+
+
+def test_runner_sleeps_exactly_until_the_next_fire():
+    clock = VirtualClock(at(19, "18:30"))
+    runner = ScheduleRunner(Schedule.parse(["every 5m 19:00-23:00", "every 20m"]),
+                            clock=lambda: clock.wall, monotonic=lambda: clock.mono)
+    assert runner.seconds_until_next() == 0
+    runner.mark_fired()
+    assert runner.seconds_until_next() == 1200
+    clock.advance(1200)
+    runner.mark_fired()
+    assert runner.seconds_until_next() == 600  # 18:50 -> the window opens at 19:00
+
+
+def test_runner_ignores_wall_clock_jumps():
+    clock = VirtualClock(at(19, "12:00"))
+    runner = ScheduleRunner(Schedule.every(600), clock=lambda: clock.wall, monotonic=lambda: clock.mono)
+    runner.mark_fired()
+    clock.advance(100)
+    clock.wall += 7200  # NTP correction or the user changing the clock
+    assert runner.seconds_until_next() == pytest.approx(500)
+    clock.wall -= 3 * 7200
+    assert runner.seconds_until_next() == pytest.approx(500)
+
+
+def test_rule_change_reschedules_from_the_last_fire():
+    clock = VirtualClock(at(19, "12:00"))
+    runner = ScheduleRunner(Schedule.every(1200), clock=lambda: clock.wall, monotonic=lambda: clock.mono)
+    runner.mark_fired()
+    clock.advance(120)
+    runner.schedule = Schedule.every(300)
+    assert runner.seconds_until_next() == pytest.approx(180)
+    runner.schedule = Schedule.every(60)
+    assert runner.seconds_until_next() == 0
+    runner.schedule = Schedule.parse(["every 5m 19:00-23:00"])
+    assert runner.seconds_until_next() == pytest.approx(at(19, "19:00") - clock.wall)
+
+
+def test_interval_factor_shortens_but_respects_minimum():
+    clock = VirtualClock(at(19, "12:00"))
+    runner = ScheduleRunner(Schedule.every(1200), clock=lambda: clock.wall, monotonic=lambda: clock.mono)
+    runner.mark_fired()
+    runner.interval_factor = 0.25
+    assert runner.seconds_until_next() == pytest.approx(300)
+    runner.min_interval = 600
+    assert runner.seconds_until_next() == pytest.approx(600)
@@ -0,0 +1,84 @@
+import pytest
+
+# pynput needs a display (or Xvfb) to import on Linux
+pytest.importorskip("pynput.keyboard", exc_type=ImportError)
+
+from sims_saver.self_test import analyze, is_clean  # noqa: E402
+
+CTRL_S = [("press", "ctrl"), ("press", "s"), ("release", "s"), ("release", "ctrl")]
+ESCAPE = [("press", "esc"), ("release", "esc")]
+
+
+def deliver(send_times, expected, latency, skip=(), twice=()):
+    """Events for chords delivered `latency` seconds after they were sent"""
+    events = []
+    for index, send_time in enumerate(send_times):
+        if index in skip:
+            continue
+        for copy in range(2 if index in twice else 1):
+            for offset, (kind, key) in enumerate(expected):
+                events.append((send_time + latency(index) + copy * 0.01 + offset * 0.001, kind, key))
+    return sorted(events)
+
+
+SENDS = [index * 0.1 for index in range(20)]
+
+
+def test_clean_delivery():
+    result = analyze(deliver(SENDS, CTRL_S, lambda index: 0.005), SENDS, CTRL_S)
+    assert is_clean(result)
+    assert result["latency_max_ms"] == pytest.approx(6.0)
+
+
+def test_delivery_slower_than_the_chord_spacing_is_latency():
+    # Under load every chord lands 350 ms late, i.e. after the next three were sent
+    result = analyze(deliver(SENDS, CTRL_S, lambda index: 0.35), SENDS, CTRL_S)
+    assert is_clean(result)
+    assert result["latency_p50_ms"] == pytest.approx(351.0)
+
+
+def test_growing_backlog_is_latency():
+    result = analyze(deliver(SENDS, ESCAPE, lambda index: 0.05 * index), SENDS, ESCAPE)
+    assert is_clean(result)
+    assert result["latency_max_ms"] == pytest.approx(950.0)
+
+
+def test_dropped_chords():
+    result = analyze(deliver(SENDS, ESCAPE, lambda index: 0.005, skip={4, 9}), SENDS, ESCAPE)
+    assert result["dropped"] == 2
+    assert result["duplicated"] == 0
+
+
+def test_duplicated_chords():
+    result = analyze(deliver(SENDS, ESCAPE, lambda index: 0.005, twice={3, 12}), SENDS, ESCAPE)
+    assert result["dropped"] == 0
+    assert result["duplicated"] == 2
+
+
+def test_late_press_beyond_settle_is_dropped():
+    result = analyze(deliver(SENDS[:1], ESCAPE, lambda index: 2.0), SENDS[:1], ESCAPE, settle=1.0)
+    assert result["dropped"] == 1
+
+
+def test_reordered_chord():
+    events = deliver(SENDS, CTRL_S, lambda index: 0.005)
+    # Chord 3's ctrl release overtakes its s release
+    chord = [event for event in events if SENDS[3] <= event[0] < SENDS[4]]
+    (t2, _, _), (t3, _, _) = chord[2], chord[3]
+    events[events.index(chord[2])] = (t2, "release", "ctrl")
+    events[events.index(chord[3])] = (t3, "release", "s")
+    result = analyze(events, SENDS, CTRL_S)
+    assert result["reordered"] == 1
+    assert result["dropped"] == 0
+
+
+def test_stuck_modifier():
+    events = deliver(SENDS, CTRL_S, lambda index: 0.005)
+    events.remove(next(event for event in reversed(events) if event[1:] == ("release", "ctrl")))
+    result = analyze(events, SENDS, CTRL_S)
+    assert result["stuck_modifiers"] == ["ctrl"]
+
+
+def test_typing_before_the_test_is_ignored():
+    events = [(-0.5, "press", "esc"), (-0.49, "release", "esc")] + deliver(SENDS, ESCAPE, lambda index: 0.005)
+    assert is_clean(analyze(events, SENDS, ESCAPE))
@@ -0,0 +1,205 @@
+import gc
+import time
+import tracemalloc
+from collections import namedtuple
+
+import psutil
+import pytest
+
+# The engine presses keys through pynput, which needs a display (or Xvfb) to import on Linux
+pytest.importorskip("pynput.keyboard", exc_type=ImportError)
+
+from sims_saver import engine as engine_module, game_activity, status_page  # noqa: E402
+from sims_saver.engine import AutoSaveEngine, EngineConfig  # noqa: E402
+from sims_saver.process_source import ProcessSource  # noqa: E402
+from sims_saver.process_tree import GameProcessTracker  # noqa: E402
+from sims_saver.schedule import Schedule  # noqa: E402
+from sims_saver.status_page import StatusPageWriter  # noqa: E402
+from sims_saver.suspend import MISSED_SKIP, SuspendDetector  # noqa: E402
+
+HOUR = 3600
+WARM_UP_HOURS = 2
+SOAK_HOURS = 24
+
+
+class VirtualTime:
+    """Stands in for the time module; sleeping advances the clocks instead of blocking"""
+
+    def __init__(self):
+        self.wall = time.time()
+        self.mono = 1000.0
+
+    def time(self):
+        return self.wall
+
+    def monotonic(self):
+        return self.mono
+
+    def sleep(self, seconds):
+        self.wall += seconds
+        self.mono += seconds
+
+
+def engine_allocations():
+    """Bytes currently allocated by sims_saver code, leaving out the test's own bookkeeping"""
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(True, "*sims_saver*")])
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+class VirtualEvent:
+    """wake_event replacement that advances virtual time and records memory every hour"""
+
+    def __init__(self, clock, engine, hours):
+        self.clock = clock
+        self.engine = engine
+        self.end = clock.mono + hours * HOUR
+        self.next_hour = clock.mono + HOUR
+        self.readings = []
+
+    def wait(self, timeout):
+        self.clock.sleep(timeout)
+        if self.clock.mono >= self.next_hour:
+            self.next_hour += HOUR
+            gc.collect()
+            self.readings.append((engine_allocations(), len(gc.get_objects()), psutil.Process().memory_info().rss))
+        if self.clock.mono >= self.end:
+            self.engine.is_running = False
+        return False
+
+    def set(self):
+        pass
+
+    def clear(self):
+        pass
+
+
+IoCounters = namedtuple("IoCounters", ["read_bytes", "write_bytes"])
+MemoryInfo = namedtuple("MemoryInfo", ["rss"])
+
+
+class FakeGame:
+    """Game process that writes a save file for a few seconds after each key press"""
+
+    pid = 4242
+    SAVE_SECONDS = 5
+    SAVE_RATE = 20 * 1024 * 1024
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.saved_bytes = 0
+        self.save_started = None
+
+    def start_save(self):
+        if self.save_started is not None:
+            self.saved_bytes += self.SAVE_SECONDS * self.SAVE_RATE
+        self.save_started = self.clock.mono
+
+    def io_counters(self):
+        written = self.saved_bytes
+        if self.save_started is not None:
+            written += min(self.clock.mono - self.save_started, self.SAVE_SECONDS) * self.SAVE_RATE
+        return IoCounters(0, int(written))
+
+    def cpu_percent(self, interval=None):
+        return 20.0
+
+    def memory_info(self):
+        return MemoryInfo(1800 * 1024 * 1024)
+
+    def is_running(self):
+        return True
+
+    def status(self):
+        return psutil.STATUS_RUNNING
+
+    def name(self):
+        return "TS4_x64.exe"
+
+    def ppid(self):
+        return 1
+
+    def create_time(self):
+        return 1700000000.0
+
+
+class GameSource(ProcessSource):
+    def __init__(self, game):
+        self.game = game
+
+    def find_all(self, process_names):
+        return [self.game]
+
+
+class CountingJournal:
+    def __init__(self):
+        self.records = 0
+
+    def record(self, *args):
+        self.records += 1
+
+
+class FakeDelivery:
+    def __init__(self, game):
+        self.game = game
+        self.hold = self.gap = 0.0
+        self.presses = 0
+
+    def deliver(self, key, pids=()):
+        self.presses += 1
+        self.game.start_save()
+        return True
+
+
+class FakeOwner:
+    def __init__(self):
+        self.status_key = None
+
+    def set_status(self, key):
+        self.status_key = key
+
+    def activate_profile(self, profile):
+        pass
+
+    def deactivate_profile(self):
+        pass
+
+
+def test_memory_stays_flat_over_a_simulated_day(tmp_path, monkeypatch):
+    clock = VirtualTime()
+    for module in (engine_module, game_activity, status_page):
+        monkeypatch.setattr(module, "time", clock)
+
+    game = FakeGame(clock)
+    config = EngineConfig(
+        test_mode=False, selected_key="escape", monitored_process_names=("ts4_x64.exe",),
+        max_defer_seconds=0, schedule=Schedule.every(300), targeted_key_delivery=False, adaptive_interval=True,
+        adaptive_min_seconds=60, backup_enabled=False, missed_fire_policy=MISSED_SKIP, resume_grace_seconds=30,
+        key_hold_ms=0, key_gap_ms=0, auto_profile=False)
+    page = StatusPageWriter(tmp_path / "status.page")
+    page.open()
+    journal = CountingJournal()
+    engine = AutoSaveEngine(FakeOwner(), config, journal, status_page=page)
+    engine.global_delivery = FakeDelivery(game)
+    engine.process_tracker = GameProcessTracker(GameSource(game))
+    engine.suspend_detector = SuspendDetector(clock.monotonic, clock.monotonic)
+    event = engine.wake_event = VirtualEvent(clock, engine, WARM_UP_HOURS + SOAK_HOURS)
+
+    tracemalloc.start()
+    try:
+        engine.is_running = True
+        engine.auto_save_loop()
+    finally:
+        tracemalloc.stop()
+        page.close()
+
+    # One press every five minutes, each confirmed by the game's save burst (the last may be cut off)
+    presses = engine.global_delivery.presses
+    assert presses == pytest.approx((WARM_UP_HOURS + SOAK_HOURS) * 12, abs=2)
+    assert engine.status.confirmed >= presses - 1
+    assert journal.records >= 2 * presses
+
+    traced, objects, rss = zip(*event.readings[WARM_UP_HOURS - 1:])
+    # Hourly readings after the warm-up: the ring buffers are full and nothing else may grow
+    assert max(traced) - min(traced) < 4 * 1024
+    assert max(objects) - min(objects) < 50
+    assert rss[-1] - rss[0] < 2 * 1024 * 1024
@@ -0,0 +1,100 @@
+import subprocess
+import sys
+
+import pytest
+
+from sims_saver import status_page
+from sims_saver.status_page import (StatusPageReader, StatusPageWriter, StatusRecord, format_status, read_status,
+                                    PID_CHECK_AFTER_SECONDS, STATE_ARMED, STATE_STOPPED, STALE_AFTER_SECONDS)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "data" / "status.bin"
+
+
+def armed_record():
+    record = StatusRecord()
+    record.state = STATE_ARMED
+    record.presses = 3
+    return record
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_round_trip(path):
+    writer = StatusPageWriter(path)
+    assert writer.open()
+    writer.write(armed_record())
+    record = read_status(path)
+    assert record.state == STATE_ARMED
+    assert record.presses == 3
+    assert record.writer_pid == writer.pid
+    assert not record.stale
+    writer.close()
+
+
+def test_close_publishes_stopped(path):
+    writer = StatusPageWriter(path)
+    writer.open()
+    writer.write(armed_record())
+    writer.close()
+    record = read_status(path)
+    assert record.state == STATE_STOPPED
+    assert record.presses == 3
+    assert not record.stale
+    assert format_status(record).startswith("State: stopped")
+
+
+def test_dead_writer_is_stale_once_its_heartbeat_is_overdue(path, monkeypatch):
+    writer = StatusPageWriter(path)
+    writer.pid = dead_pid()
+    writer.open()
+    writer.write(armed_record())
+    assert not read_status(path).stale
+    now = status_page.time.time()
+    monkeypatch.setattr(status_page.time, "time", lambda: now + PID_CHECK_AFTER_SECONDS + 1)
+    record = read_status(path)
+    assert record.stale
+    assert format_status(record).startswith("State: not running (last seen armed")
+    writer.close()
+
+
+def test_fresh_page_is_read_without_a_pid_check(path, monkeypatch):
+    writer = StatusPageWriter(path)
+    writer.open()
+    writer.write(armed_record())
+    checks = []
+    monkeypatch.setattr(status_page, "pid_alive", lambda pid: checks.append(pid) or True)
+    reader = StatusPageReader(path)
+    for _ in range(10):
+        assert not reader.read().stale
+    assert checks == []
+    reader.close()
+    writer.close()
+
+
+def test_page_that_stopped_refreshing_is_stale(path, monkeypatch):
+    writer = StatusPageWriter(path)
+    writer.open()
+    writer.write(armed_record())
+    reader = StatusPageReader(path)
+    assert not reader.read().stale
+    now = status_page.time.time()
+    monkeypatch.setattr(status_page.time, "time", lambda: now + STALE_AFTER_SECONDS + 1)
+    assert reader.read().stale
+    reader.close()
+    writer.close()
+
+
+def test_missing_page_reads_as_none(path):
+    assert read_status(path) is None
+
+
+def test_default_path_is_outside_the_package():
+    package_dir = status_page.os.path.dirname(status_page.os.path.abspath(status_page.__file__))
+    assert not str(status_page.default_status_path()).startswith(package_dir)
@@ -0,0 +1,118 @@
+import pytest
+
+from sims_saver.schedule import Schedule, ScheduleRunner
+from sims_saver.suspend import MISSED_FIRE_ONCE, MISSED_REALIGN, MISSED_SKIP, SuspendDetector
+
+
+class VirtualClocks:
+    """Wall, awake and boot clocks for one machine; sleep() stops only the awake clock"""
+
+    def __init__(self, wall=1700000000.0):
+        self.wall = wall
+        self.awake = 1000.0
+        self.boot = 1000.0
+
+    def advance(self, seconds):
+        self.wall += seconds
+        self.awake += seconds
+        self.boot += seconds
+
+    def sleep(self, seconds):
+        self.wall += seconds
+        self.boot += seconds
+
+
+@pytest.fixture
+def clocks():
+    return VirtualClocks()
+
+
+def make_runner(clocks, period=600):
+    runner = ScheduleRunner(Schedule.every(period), clock=lambda: clocks.wall, monotonic=lambda: clocks.awake)
+    runner.restart()
+    return runner
+
+
+def run_until_fire(runner, clocks, limit=100000):
+    """Advance virtual time to the next fire, fire, and return how long that took"""
+    waited = 0.0
+    while True:
+        remaining = runner.seconds_until_next()
+        if remaining == 0:
+            runner.mark_fired()
+            return waited
+        step = min(remaining, limit - waited)
+        assert step > 0, "runner never fired"
+        clocks.advance(step)
+        waited += step
+
+
+def suspend(runner, clocks, detector, seconds, policy, grace=30.0):
+    clocks.sleep(seconds)
+    suspended = detector.check()
+    assert suspended == pytest.approx(seconds)
+    return runner.handle_suspend(suspended, policy, grace)
+
+
+def test_detector_ignores_short_gaps(clocks):
+    detector = SuspendDetector(lambda: clocks.awake, lambda: clocks.boot)
+    clocks.advance(100)
+    clocks.sleep(2)
+    assert detector.check() == 0.0
+    clocks.sleep(SuspendDetector.MIN_GAP + 1)
+    assert detector.check() == pytest.approx(SuspendDetector.MIN_GAP + 1)
+
+
+@pytest.mark.parametrize("policy, first_wait, second_wait", [
+    # Sleep from 130 s to 1330 s after the last fire: the fires at 600 and 1200 were missed
+    (MISSED_SKIP, 600, 600),           # a full period from waking
+    (MISSED_REALIGN, 470, 600),        # straight back onto the original grid (1800)
+    (MISSED_FIRE_ONCE, 30, 440),       # grace press at 1360, then the grid fire at 1800
+])
+def test_missed_fire_policies(clocks, policy, first_wait, second_wait):
+    detector = SuspendDetector(lambda: clocks.awake, lambda: clocks.boot)
+    runner = make_runner(clocks)
+    clocks.advance(130)
+    detector.check()
+    assert suspend(runner, clocks, detector, 1200, policy) == 2
+    assert run_until_fire(runner, clocks) == pytest.approx(first_wait)
+    assert run_until_fire(runner, clocks) == pytest.approx(second_wait)
+
+
+def test_fire_once_grace_press_keeps_the_grid(clocks):
+    """The reported case: 600 s period, the grid fire comes 470 s after the grace press"""
+    detector = SuspendDetector(lambda: clocks.awake, lambda: clocks.boot)
+    runner = make_runner(clocks)
+    clocks.advance(500)
+    detector.check()
+    assert suspend(runner, clocks, detector, 200, MISSED_FIRE_ONCE) == 1
+    # Woke at 700; grace press at 730, grid fires at 1200 and 1800
+    assert run_until_fire(runner, clocks) == pytest.approx(30)
+    assert run_until_fire(runner, clocks) == pytest.approx(470)
+    assert run_until_fire(runner, clocks) == pytest.approx(600)
+
+
+def test_fire_once_with_grid_fires_inside_the_grace(clocks):
+    detector = SuspendDetector(lambda: clocks.awake, lambda: clocks.boot)
+    runner = make_runner(clocks, period=20)
+    clocks.advance(5)
+    detector.check()
+    suspend(runner, clocks, detector, 100, MISSED_FIRE_ONCE, grace=30)
+    # Woke at 105; the grace press at 135 replaces the grid fires at 120; next is 140
+    assert run_until_fire(runner, clocks) == pytest.approx(30)
+    assert run_until_fire(runner, clocks) == pytest.approx(5)
+
+
+def test_short_suspend_without_missed_fires_keeps_the_schedule(clocks):
+    detector = SuspendDetector(lambda: clocks.awake, lambda: clocks.boot)
+    runner = make_runner(clocks)
+    clocks.advance(100)
+    detector.check()
+    assert suspend(runner, clocks, detector, 60, MISSED_FIRE_ONCE) == 0
+    assert run_until_fire(runner, clocks) == pytest.approx(440)
+
+
+def test_suspend_before_first_fire_is_ignored(clocks):
+    runner = ScheduleRunner(Schedule.every(600), clock=lambda: clocks.wall, monotonic=lambda: clocks.awake)
+    assert runner.handle_suspend(5000, MISSED_FIRE_ONCE) == 0
+    assert runner.pending_fire_mono is None